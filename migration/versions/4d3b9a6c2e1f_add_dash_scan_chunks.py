@@ -0,0 +1,31 @@
+"""add dash scan chunks
+
+Revision ID: 4d3b9a6c2e1f
+Revises: 591a97d42d42
+Create Date: 2014-02-20 10:12:31.402117
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '4d3b9a6c2e1f'
+down_revision = '591a97d42d42'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('dash_ScanChunkTable',
+                    sa.Column('id', sa.Integer, primary_key=True),
+                    sa.Column('device_id', sa.Integer, sa.ForeignKey('dash_DeviceTable.id')),
+                    sa.Column('idx', sa.Integer),
+                    sa.Column('start', sa.Float(53)),
+                    sa.Column('end', sa.Float(53)),
+                    sa.Column('npts', sa.Integer),
+                    sa.Column('blob', sa.BLOB))
+    op.create_index('dash_ScanChunkTable_start', 'dash_ScanChunkTable', ['start'])
+
+
+def downgrade():
+    op.drop_index('dash_ScanChunkTable_start', 'dash_ScanChunkTable')
+    op.drop_table('dash_ScanChunkTable')
@@ -0,0 +1,156 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from numpy import array, asarray, floor, zeros, full, arange, argsort, bincount, \
+    where, inf, abs as nabs, ceil, clip
+#============= local library imports  ==========================
+
+
+class GridIndex(object):
+    """
+        uniform grid over a set of 2D points.
+
+        cells are stored densely as an (ncx, ncy, depth) array of point indices (-1 = empty)
+        so a batch of queries gathers its candidates from the surrounding cells in one
+        vectorized step.
+
+        move updates a single point in place. the grid is only rebuilt if the point
+        leaves the grid or its new cell is full
+    """
+
+    def __init__(self, xs, ys, cell):
+        self.cell = float(cell)
+        self.xs = array(xs, dtype=float)
+        self.ys = array(ys, dtype=float)
+        self.nrebuilds = 0
+        self._build()
+
+    def __len__(self):
+        return len(self.xs)
+
+    def move(self, i, x, y):
+        """
+            set the position of point i
+        """
+        self.xs[i] = x
+        self.ys[i] = y
+        if not len(self._cells):
+            self._build()
+            return
+
+        ox, oy = self._pcells[i]
+        slot = (self._cells[ox, oy] == i).nonzero()[0]
+        self._cells[ox, oy, slot] = -1
+
+        cx, cy = self._cell_of(x, y)
+        ncx, ncy, _ = self._cells.shape
+        if 0 <= cx < ncx and 0 <= cy < ncy:
+            free = (self._cells[cx, cy] == -1).nonzero()[0]
+            if len(free):
+                self._cells[cx, cy, free[0]] = i
+                self._pcells[i] = cx, cy
+                return
+
+        self._build()
+
+    def nearest(self, qx, qy, tol):
+        """
+            for each query point return the index of the closest point with |dx|<tol and |dy|<tol,
+            -1 if there is none. ties go to the lowest index
+        """
+        qx = asarray(qx, dtype=float)
+        qy = asarray(qy, dtype=float)
+        scalar = qx.ndim == 0
+        qx, qy = qx.ravel(), qy.ravel()
+
+        idx = full(len(qx), -1, dtype=int)
+        if len(self._cells) and len(qx):
+            cand = self._candidates(qx, qy, tol)
+
+            valid = cand >= 0
+            ci = where(valid, cand, 0)
+            dx = self.xs[ci] - qx[:, None]
+            dy = self.ys[ci] - qy[:, None]
+            valid &= (nabs(dx) < tol) & (nabs(dy) < tol)
+
+            d = where(valid, dx ** 2 + dy ** 2, inf)
+            dmin = d.min(axis=1)
+            best = where(valid & (d == dmin[:, None]), cand, len(self.xs)).min(axis=1)
+            idx = where(dmin < inf, best, -1)
+
+        if scalar:
+            return int(idx[0])
+        return idx
+
+    def _candidates(self, qx, qy, tol):
+        r = int(ceil(tol / self.cell))
+        ncx, ncy, depth = self._cells.shape
+        offsets = arange(-r, r + 1)
+
+        cx, cy = self._cell_of(qx, qy)
+        gx = cx[:, None, None] + offsets[None, :, None]
+        gy = cy[:, None, None] + offsets[None, None, :]
+        outside = (gx < 0) | (gx >= ncx) | (gy < 0) | (gy >= ncy)
+        gx = clip(gx, 0, ncx - 1)
+        gy = clip(gy, 0, ncy - 1)
+
+        cand = self._cells[gx, gy]
+        cand[outside] = -1
+        return cand.reshape(len(qx), -1)
+
+    def _cell_of(self, x, y):
+        cx = floor(asarray(x) / self.cell).astype(int) - self._x0
+        cy = floor(asarray(y) / self.cell).astype(int) - self._y0
+        return cx, cy
+
+    def _build(self):
+        self.nrebuilds += 1
+        n = len(self.xs)
+        if not n:
+            self._x0 = self._y0 = 0
+            self._cells = zeros((0, 0, 0), dtype=int)
+            self._pcells = zeros((0, 2), dtype=int)
+            return
+
+        ax = floor(self.xs / self.cell).astype(int)
+        ay = floor(self.ys / self.cell).astype(int)
+        # leave a margin so small corrections don't force a rebuild
+        self._x0, self._y0 = ax.min() - 1, ay.min() - 1
+        ax -= self._x0
+        ay -= self._y0
+        ncx, ncy = ax.max() + 2, ay.max() + 2
+
+        lin = ax * ncy + ay
+        counts = bincount(lin, minlength=ncx * ncy)
+        # spare slot per cell for points moving in
+        depth = counts.max() + 1
+
+        order = argsort(lin, kind='mergesort')
+        slin = lin[order]
+        starts = counts.cumsum() - counts
+        slots = arange(n) - starts[slin]
+
+        cells = full((ncx * ncy, depth), -1, dtype=int)
+        cells[slin, slots] = order
+        self._cells = cells.reshape(ncx, ncy, depth)
+
+        self._pcells = zeros((n, 2), dtype=int)
+        self._pcells[:, 0] = ax
+        self._pcells[:, 1] = ay
+
+#============= EOF =============================================
@@ -0,0 +1,116 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from numpy import dtype, frombuffer, empty, zeros, cumsum
+#============= local library imports  ==========================
+
+"""
+    encode/decode the packed (x,y) float32 pairs stored in meas_SignalTable.data,
+    peak center points etc.
+
+    decoding is zero-copy. the returned x,y arrays are (possibly non-native endian) views
+    into the blob. use .astype(float) if native float64 arrays are required
+"""
+
+
+def signal_dtype(endianness='>'):
+    return dtype([('x', '{}f4'.format(endianness)), ('y', '{}f4'.format(endianness))])
+
+
+def unpack_signal(blob, endianness='>', reverse=False):
+    """
+        blob: string of packed xy pairs
+        reverse: the pairs are stored as y,x (MassSpec)
+
+        returns xs, ys
+
+        raises ValueError if blob is empty or not a multiple of 8 bytes
+    """
+    if not blob or len(blob) % 8:
+        raise ValueError('invalid signal blob. length={}'.format(len(blob) if blob else 0))
+
+    data = frombuffer(blob, dtype=signal_dtype(endianness))
+    if reverse:
+        return data['y'], data['x']
+    else:
+        return data['x'], data['y']
+
+
+def pack_signal(xs, ys, endianness='>'):
+    """
+        inverse of unpack_signal
+    """
+    data = empty(len(xs), dtype=signal_dtype(endianness))
+    data['x'] = xs
+    data['y'] = ys
+    return data.tostring()
+
+
+class SignalBatch(object):
+    """
+        many signal blobs decoded into one contiguous structured array
+
+        data[offsets[i]:offsets[i+1]] are the points of blob i.
+        errors is a list of the indices of blobs that could not be decoded. they are
+        treated as empty
+    """
+
+    def __init__(self, data, offsets, errors, reverse):
+        self.data = data
+        self.offsets = offsets
+        self.errors = errors
+        self._reverse = reverse
+
+    def get(self, i):
+        """
+            return xs, ys of blob i
+        """
+        d = self.data[self.offsets[i]:self.offsets[i + 1]]
+        if self._reverse:
+            return d['y'], d['x']
+        else:
+            return d['x'], d['y']
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+def unpack_signals(blobs, endianness='>', reverse=False):
+    """
+        decode a list of blobs in one pass. returns a SignalBatch
+    """
+    n = len(blobs)
+    counts = zeros(n, dtype=int)
+    errors = []
+    good = []
+    for i, b in enumerate(blobs):
+        if not b or len(b) % 8:
+            errors.append(i)
+        else:
+            counts[i] = len(b) // 8
+            good.append(b)
+
+    offsets = zeros(n + 1, dtype=int)
+    offsets[1:] = cumsum(counts)
+
+    data = frombuffer(''.join(good), dtype=signal_dtype(endianness)) if good else \
+        empty(0, dtype=signal_dtype(endianness))
+
+    return SignalBatch(data, offsets, errors, reverse)
+
+#============= EOF =============================================
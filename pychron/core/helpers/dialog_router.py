@@ -0,0 +1,44 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from threading import local
+#============= local library imports  ==========================
+
+_local = local()
+
+
+def set_dialog_handler(handler):
+    """
+        handler(func, args, kw) opens the dialogs requested from the current thread,
+        e.g. by running func in another thread. None to open them directly
+    """
+    _local.handler = handler
+
+
+def open_dialog(func, *args, **kw):
+    """
+        call func(*args, **kw), a function opening a modal dialog, through the current
+        thread's dialog handler if it has one
+    """
+    handler = getattr(_local, 'handler', None)
+    if handler is not None:
+        return handler(func, args, kw)
+
+    return func(*args, **kw)
+
+#============= EOF =============================================
@@ -0,0 +1,91 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from numpy import empty, asarray
+#============= local library imports  ==========================
+
+
+class SampleBuffer(object):
+    """
+        preallocated x,y storage. capacity is doubled when full so appending n points
+        is O(n) instead of the O(n**2) of repeated hstacks.
+
+        xs and ys are views of the filled portion of the buffer. a view is never
+        modified by subsequent appends
+    """
+
+    def __init__(self, size=256, xs=None, ys=None):
+        self._size = max(1, int(size))
+        self.clear()
+        if xs is not None:
+            self.extend(xs, ys)
+
+    def clear(self):
+        # allocate new storage so outstanding views are not overwritten
+        self._xs = empty(self._size)
+        self._ys = empty(self._size)
+        self._n = 0
+
+    def append(self, x, y):
+        n = self._n
+        if n == len(self._xs):
+            self._grow(n + 1)
+
+        self._xs[n] = x
+        self._ys[n] = y
+        self._n = n + 1
+
+    def extend(self, xs, ys):
+        xs, ys = asarray(xs, dtype=float), asarray(ys, dtype=float)
+        n = self._n
+        m = n + len(xs)
+        if m > len(self._xs):
+            self._grow(m)
+
+        self._xs[n:m] = xs
+        self._ys[n:m] = ys
+        self._n = m
+
+    @property
+    def xs(self):
+        return self._xs[:self._n]
+
+    @property
+    def ys(self):
+        return self._ys[:self._n]
+
+    @property
+    def capacity(self):
+        return len(self._xs)
+
+    def _grow(self, minsize):
+        size = len(self._xs)
+        while size < minsize:
+            size *= 2
+
+        n = self._n
+        for attr in ('_xs', '_ys'):
+            a = getattr(self, attr)
+            b = empty(size)
+            b[:n] = a[:n]
+            setattr(self, attr, b)
+
+    def __len__(self):
+        return self._n
+
+#============= EOF =============================================
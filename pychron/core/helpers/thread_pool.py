@@ -18,8 +18,9 @@
 #============= standard library imports ========================
 #============= local library imports  ==========================
 
+import sys
 from Queue import Queue
-from threading import Thread
+from threading import Thread, Condition
 
 class Worker(Thread):
     """Thread executing tasks from a given tasks queue"""
@@ -56,4 +57,72 @@ class ThreadPool(object):
     def map(self, func, iterable):
         for ai in iterable:
             self.add_task(func, *ai)
+
+
+def first_accepted(func, args, accept, nthreads=4):
+    """
+        evaluate func(*a) for each a in args on nthreads threads. the results are passed to
+        accept, in the calling thread, in the order of args. return the first result accept
+        returns True for, None if there is none.
+
+        evaluation runs at most nthreads items ahead of the result being checked and
+        no new evaluations are started once a result is accepted
+    """
+    args = list(args)
+    if nthreads <= 1 or len(args) < 2:
+        for a in args:
+            r = func(*a)
+            if accept(r):
+                return r
+        return
+
+    cond = Condition()
+    state = {'next': 0, 'consumed': 0, 'stop': False}
+    results = {}
+
+    def worker():
+        while 1:
+            with cond:
+                while not state['stop'] and state['next'] - state['consumed'] >= nthreads:
+                    cond.wait()
+
+                i = state['next']
+                if state['stop'] or i >= len(args):
+                    return
+                state['next'] = i + 1
+
+            try:
+                r = func(*args[i]), None
+            except Exception:
+                r = None, sys.exc_info()
+
+            with cond:
+                results[i] = r
+                cond.notify_all()
+
+    for _ in range(min(nthreads, len(args))):
+        t = Thread(target=worker)
+        t.daemon = True
+        t.start()
+
+    try:
+        for i in xrange(len(args)):
+            with cond:
+                while i not in results:
+                    cond.wait()
+
+                r, exc_info = results.pop(i)
+                state['consumed'] = i + 1
+                cond.notify_all()
+
+            if exc_info:
+                raise exc_info[0], exc_info[1], exc_info[2]
+
+            if accept(r):
+                return r
+    finally:
+        with cond:
+            state['stop'] = True
+            cond.notify_all()
+
 #============= EOF =============================================
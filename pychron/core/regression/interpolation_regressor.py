@@ -18,7 +18,8 @@
 from traits.api import Str
 from pychron.core.regression.base_regressor import BaseRegressor
 #============= standard library imports ========================
-from numpy import where, polyval, polyfit, asarray
+from numpy import where, polyval, polyfit, asarray, searchsorted, diff, nan, isnan, \
+    zeros, flatnonzero
 #============= local library imports  ==========================
 
 class InterpolationRegressor(BaseRegressor):
@@ -34,12 +35,57 @@ class InterpolationRegressor(BaseRegressor):
 
     def _predict(self, xs, attr):
         kind = self.kind.replace(' ', '_')
-        func = getattr(self, '{}_predictors'.format(kind))
         if not hasattr(xs, '__iter__'):
             xs = (xs,)
 
+        # the array versions need sorted xs. otherwise fall back to the per point search
+        if len(self.xs) < 2 or (diff(self.xs) >= 0).all():
+            func = getattr(self, '{}_predictions'.format(kind), None)
+            if func is not None:
+                vs = func(xs, attr)
+                missing = flatnonzero(isnan(vs)) if kind == 'preceding' else []
+                vs = vs.tolist()
+                # preceding_predictors returns None if there is no preceding point
+                for i in missing:
+                    vs[i] = None
+                return vs
+
+        func = getattr(self, '{}_predictors'.format(kind))
         return [func(xi, attr) for xi in xs]
 
+    def preceding_predictions(self, xs, attr='value'):
+        """
+            array version of preceding_predictors. nan where no point precedes x
+        """
+        xs = asarray(xs, dtype=float)
+        vs = zeros(xs.shape)
+        vs.fill(nan)
+        if len(self.xs):
+            ti = searchsorted(self.xs, xs, side='right') - 1
+            valid = ti >= 0
+            vs[valid] = self._get_values(attr)[ti[valid]]
+        return vs
+
+    def bracketing_average_predictions(self, xs, attr='value'):
+        """
+            array version of bracketing_average_predictors. 0 where x is not bracketed
+        """
+        xs, pb, ab, _, _, valid = self._bracketing_predictions(xs, attr)
+        return where(valid, (pb + ab) / 2.0, 0)
+
+    def bracketing_interpolate_predictions(self, xs, attr='value'):
+        """
+            array version of bracketing_interpolate_predictors. 0 where x is not bracketed
+        """
+        xs, pb, ab, x0, x1, valid = self._bracketing_predictions(xs, attr)
+        f = (xs - x0) / where(valid, x1 - x0, 1)
+        if attr == 'error':
+            v = (((1 - f) * pb) ** 2 + (f * ab) ** 2) ** 0.5
+        else:
+            v = pb + f * (ab - pb)
+
+        return where(valid, v, 0)
+
     def preceding_predictors(self, timestamp, attr='value'):
         xs = self.xs
         ys = self.ys
@@ -85,6 +131,27 @@ class InterpolationRegressor(BaseRegressor):
         except TypeError:
             return 0
 
+    def _bracketing_predictions(self, xs, attr):
+        """
+            for each x the points ti, ti+1 with xs[ti] < x <= xs[ti+1]
+        """
+        xs = asarray(xs, dtype=float)
+        rxs = self.xs
+        n = len(rxs)
+        if n < 2:
+            z = zeros(xs.shape)
+            return xs, z, z, z, z, z.astype(bool)
+
+        ti = searchsorted(rxs, xs, side='left') - 1
+        valid = (ti >= 0) & (ti < n - 1)
+        ti = where(valid, ti, 0)
+
+        vs = self._get_values(attr)
+        return xs, vs[ti], vs[ti + 1], rxs[ti], rxs[ti + 1], valid
+
+    def _get_values(self, attr):
+        return self.ys if attr == 'value' else self.yserr
+
     def _bracketing_predictors(self, tm, attr):
         xs = self.xs
         ys = self.ys
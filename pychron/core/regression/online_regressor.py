@@ -0,0 +1,157 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from numpy import array, dot, sqrt
+from numpy.linalg import solve, inv, LinAlgError
+#============= local library imports  ==========================
+
+MAX_DEGREE = 3
+FITS = ['average', 'linear', 'parabolic', 'cubic']
+
+
+def fit_to_degree(fit):
+    """
+        average=0, linear=1, parabolic=2, cubic=3. None if fit is not a polynomial fit
+    """
+    if fit:
+        fit = fit.lower()
+        if 'average' in fit:
+            return 0
+        elif fit in FITS:
+            return FITS.index(fit)
+
+
+class OnlineRegressor(object):
+    """
+        incremental polynomial (degree 0-3) least squares regressor.
+
+        keeps the sufficient statistics sum(x**k), sum(x**k*y) and sum(y**2)
+        so adding a point is O(1) and evaluating a fit is a (degree+1)x(degree+1) solve.
+
+        used during acquisition. no outlier filtering. the full OLSRegressor
+        is used once the run is finished.
+
+        errors are calculated the same way as OLSRegressor.predict_error_matrix
+        i.e. standard error of fit * sqrt(Xk.(X'X)^-1.Xk')
+    """
+
+    def __init__(self, xs=None, ys=None):
+        self.clear()
+        if xs is not None:
+            self.extend(xs, ys)
+
+    def clear(self):
+        self.n = 0
+        self._sx = [0.0] * (2 * MAX_DEGREE + 1)
+        self._sxy = [0.0] * (MAX_DEGREE + 1)
+        self._syy = 0.0
+        self._xmax = 0.0
+        self._y0 = None
+
+    def add(self, x, y):
+        x, y = float(x), float(y)
+        sx, sxy = self._sx, self._sxy
+
+        # offset y by the first value to limit cancellation in sum(y**2)-b.c
+        if self._y0 is None:
+            self._y0 = y
+        y -= self._y0
+
+        xk = 1.0
+        for k in xrange(2 * MAX_DEGREE + 1):
+            sx[k] += xk
+            if k <= MAX_DEGREE:
+                sxy[k] += xk * y
+            xk *= x
+
+        self._syy += y * y
+        self._xmax = max(self._xmax, abs(x))
+        self.n += 1
+
+    def extend(self, xs, ys):
+        for x, y in zip(xs, ys):
+            self.add(x, y)
+
+    def coefficients(self, degree):
+        """
+            return coefficients [c0, c1,...] where y=c0+c1*x+... or None if not enough points
+        """
+        r = self._solve(degree)
+        if r is not None:
+            return self._unoffset(r[0])
+
+    def predict(self, x, degree):
+        r = self._solve(degree)
+        if r is not None:
+            coeffs = self._unoffset(r[0])
+            return sum((ci * x ** i for i, ci in enumerate(coeffs)))
+
+    def predict_error(self, x, degree, error_calc='SEM'):
+        """
+            error_calc: SEM or SD
+
+            SD of an average (degree 0) is the standard deviation of ys, as MeanRegressor
+        """
+        r = self._solve(degree)
+        if r is None:
+            return
+
+        coeffs, cinv, s = r
+        q = degree + 1
+        if self.n <= q:
+            return
+
+        ssr = max(0, self._syy - dot(coeffs, self._sxy[:q]))
+        sef = (ssr / (self.n - q)) ** 0.5
+
+        xk = array([(x / s) ** i for i in range(q)])
+        var = dot(xk, dot(cinv, xk))
+        if error_calc == 'SEM':
+            return sef * sqrt(var)
+        elif degree == 0:
+            return sef
+        else:
+            return sqrt(sef ** 2 + sef ** 2 * var)
+
+    def _solve(self, degree):
+        """
+            solve the normal equations in scaled x (x/xmax) for better conditioning.
+            returns unscaled coefficients, the scaled (X'X)^-1 and the scale
+        """
+        q = degree + 1
+        if self.n < q:
+            return
+
+        s = self._xmax or 1.0
+        A = array([[self._sx[i + j] / s ** (i + j) for j in range(q)] for i in range(q)])
+        c = array([self._sxy[i] / s ** i for i in range(q)])
+        try:
+            b = solve(A, c)
+            cinv = inv(A)
+        except LinAlgError:
+            return
+
+        coeffs = array([bi / s ** i for i, bi in enumerate(b)])
+        return coeffs, cinv, s
+
+    def _unoffset(self, coeffs):
+        coeffs = coeffs.copy()
+        coeffs[0] += self._y0
+        return coeffs
+
+#============= EOF =============================================
@@ -0,0 +1,128 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from numpy import linspace, pi, exp, zeros, asarray, abs as nabs, searchsorted, \
+    cumsum, repeat, arange, bincount, hstack, log, sqrt, isfinite
+#============= local library imports  ==========================
+
+# kernels are truncated at +/- KSIGMA. exp(-0.5*8**2)~1e-14 of the peak
+KSIGMA = 8
+
+
+def valid_mask(ages, errors):
+    """
+        True for the analyses that contribute to an ideogram. zero, nan or inf
+        ages and errors are skipped
+    """
+    return isfinite(ages) & isfinite(errors) & (nabs(ages) >= 1e-10) & (nabs(errors) >= 1e-10)
+
+
+class CumulativeProbability(object):
+    """
+        sum of gaussian probability density curves (an ideogram) evaluated on
+        n bins between xmi and xma.
+
+        all kernels are calculated in one vectorized pass. each kernel only covers
+        the bins within +/-nsigma of its mean. the per analysis contributions
+        are kept so the curve for a subset of the analyses is the full
+        curve minus the excluded kernels
+    """
+
+    def __init__(self, ages, errors, xmi, xma, n=500, nsigma=KSIGMA):
+        self.ages = ages = asarray(ages, dtype=float)
+        self.errors = errors = asarray(errors, dtype=float)
+        self.xmi, self.xma, self.n = xmi, xma, n
+
+        self.bins = bins = linspace(xmi, xma, n)
+        self.valid = valid = valid_mask(ages, errors)
+
+        #window of bins for each kernel
+        ae = nabs(errors) * nsigma
+        starts = searchsorted(bins, ages - ae)
+        ends = searchsorted(bins, ages + ae, side='right')
+        ends[~valid] = starts[~valid]
+        counts = ends - starts
+
+        offsets = zeros(len(ages) + 1, dtype=int)
+        offsets[1:] = cumsum(counts)
+
+        #flat bin index for every (kernel, bin) pair
+        ntot = offsets[-1]
+        kidx = repeat(arange(len(ages)), counts)
+        idx = arange(ntot) - offsets[kidx] + starts[kidx]
+
+        ds = (ages[kidx] - bins[idx]) ** 2
+        es2 = 2 * errors[kidx] ** 2
+        vals = (es2 * pi) ** -0.5 * exp(-ds / es2)
+
+        self._idx = idx
+        self._vals = vals
+        self._offsets = offsets
+        self.probs = bincount(idx, weights=vals, minlength=n)[:n]
+
+    def kernel(self, i):
+        """
+            return bin indices and values of kernel i
+        """
+        s, e = self._offsets[i], self._offsets[i + 1]
+        return self._idx[s:e], self._vals[s:e]
+
+    def excluding(self, exclude):
+        """
+            return probs with the kernels in exclude removed
+        """
+        probs = self.probs.copy()
+        if len(exclude):
+            o = self._offsets
+            sl = [arange(o[i], o[i + 1]) for i in exclude]
+            if sl:
+                sl = hstack(sl)
+                probs -= bincount(self._idx[sl], weights=self._vals[sl], minlength=self.n)[:self.n]
+            probs[probs < 0] = 0
+
+        return probs
+
+    def matches(self, xmi, xma, n):
+        return self.xmi == xmi and self.xma == xma and self.n == n
+
+
+def asymptotic_limits(ages, errors, xmi, xma, asymptotic_width=1, tol=0.1):
+    """
+        range that includes xmi, xma and has asymptotic_width of "white space" at
+        either end, i.e. the curve is below tol*(peak of a single kernel) in the
+        outer asymptotic_width.
+
+        a gaussian drops below tol of its peak at sqrt(-2 ln(tol)) sigma so the
+        limits are min(age - k*sigma) - asymptotic_width and max(age + k*sigma) + asymptotic_width.
+
+        only the analyses CumulativeProbability draws (see valid_mask) are considered
+    """
+    ages = asarray(ages, dtype=float)
+    errors = asarray(errors, dtype=float)
+    valid = valid_mask(ages, errors)
+    if not valid.any():
+        return xmi, xma
+
+    ages, errors = ages[valid], nabs(errors[valid])
+
+    k = sqrt(-2 * log(tol))
+    x1 = (ages - k * errors).min() - asymptotic_width
+    x2 = (ages + k * errors).max() + asymptotic_width
+    return min(xmi, x1), max(xma, x2)
+
+#============= EOF =============================================
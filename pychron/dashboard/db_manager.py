@@ -15,62 +15,129 @@
 #===============================================================================
 
 #============= enthought library imports =======================
-from datetime import datetime
+from traits.api import Int, Float, Dict, Any
 
 #============= standard library imports ========================
+from datetime import datetime, timedelta
 #============= local library imports  ==========================
+from pychron.dashboard.time_series import ChunkBuffer, get_ncolumns, get_chunk_size, \
+    pack_chunk, unpack_chunk, read_range, downsample
 from pychron.database.adapters.dashboard_adapter import DashboardAdapter
 from pychron.database.isotope_database_manager import BaseIsotopeDatabaseManager
 
 
 class DashboardDBManager(BaseIsotopeDatabaseManager):
+    """
+        device history is kept as an append-only series of chunks. each published scan is
+        appended to an in-memory ChunkBuffer and a chunk is written, once, when it is full,
+        older than max_chunk_age, or its time table is closed.
+
+        a time table partitions the history into rollover_hours long periods
+    """
     _db_klass = DashboardAdapter
 
+    rollover_hours = Int(24)
+    max_chunk_age = Float(600)
+
+    _buffers = Dict
+    _time_table_start = Any
+
     def start(self):
         db = self.db
         with db.session_ctx():
             self.info('Created new dashboard time table')
-            return db.add_time_table(start=datetime.now())
+            self._time_table_start = now = datetime.now()
+            return db.add_time_table(start=now)
 
     def stop(self):
         db = self.db
         with db.session_ctx():
             tt = db.get_last_time_table()
-            tt.end = datetime.now()
+            if tt is not None:
+                for name, (buf, fmt, meta) in self._buffers.iteritems():
+                    self._write_chunk(tt, name, buf, fmt, meta, buf.take())
+                tt.end = datetime.now()
+
+        self._buffers = {}
 
     def publish_device(self, new):
+        self._rollover_time_table()
+
+        try:
+            buf, fmt, meta = self._buffers[new.name]
+        except KeyError:
+            fmt = new.get_scan_fmt()
+            n = get_ncolumns(fmt)
+            buf = ChunkBuffer(n, get_chunk_size(n))
+            meta = new.dump_meta()
+            self._buffers[new.name] = buf, fmt, meta
+
+        cols = buf.append(new.get_scan_row())
+        if cols is None and buf.age > self.max_chunk_age:
+            cols = buf.take()
+
+        if cols is not None:
+            db = self.db
+            with db.session_ctx():
+                tt = db.get_last_time_table()
+                if tt is not None:
+                    self._write_chunk(tt, new.name, buf, fmt, meta, cols)
+                    tt.end = datetime.now()
+
+    def get_device_history(self, name, start=None, end=None, nbins=None):
+        """
+            return (meta, cols). cols is a (ncolumns, n) array, row 0 is the timestamp
+            followed by a row per value. start and end are epoch seconds.
+
+            if nbins the history is downsampled to the min and max of each value in
+            nbins bins
+        """
         db = self.db
         with db.session_ctx():
-            tt = db.get_last_time_table()
-            tt=self._rollover_time_table(tt)
-            if tt is not None:
-                for dev in tt.devices:
-                    if dev.name == new.name:
-                        nb = new.append_scan_blob(dev.scan_blob,
-                                                  dev.scan_fmt)
-                        dev.scan_blob = nb
-                        break
-                else:
-                    dev = db.add_device(tt, new.name)
-
-                    dev.scan_meta = new.dump_meta()
-                    dev.scan_fmt = new.get_scan_fmt()
-                    dev.scan_blob = new.append_scan_blob()
+            chunks = db.get_scan_chunks(name, start, end)
+            meta, n = None, 0
+            cs = []
+            for ci in chunks:
+                dev = ci.device
+                n = get_ncolumns(dev.scan_fmt)
+                meta = dev.scan_meta
+                cs.append(unpack_chunk(ci.blob, n))
+
+        if name in self._buffers:
+            buf, fmt, meta = self._buffers[name]
+            n = buf.ncolumns
+            cs.append(buf.columns.copy())
+
+        cols = read_range(cs, n, start, end)
+        if nbins:
+            cols = downsample(cols, nbins)
+        return meta, cols
+
+    def _write_chunk(self, tt, name, buf, fmt, meta, cols):
+        if cols is None:
+            return
 
-                tt.end = datetime.now()
+        db = self.db
+        dev = db.get_device(tt, name)
+        if dev is None:
+            dev = db.add_device(tt, name)
+            dev.scan_meta = meta
+            dev.scan_fmt = fmt
 
-    def _rollover_time_table(self, tt, n=24):
-        """
-            if the duration of this time table is >N hours create a new time table
+        ts = cols[0]
+        db.add_scan_chunk(dev, buf.nchunks - 1, ts[0], ts[-1], len(ts), pack_chunk(cols))
 
+    def _rollover_time_table(self):
         """
+            if the current time table is older than rollover_hours close it and start a new one
+        """
+        st = self._time_table_start
+        if st is None:
+            return
 
-        if tt.end:
-            delta=tt.end-tt.start
-            if delta.seconds>n*3600:
-                tt= self.start()
-
-        return tt
+        if datetime.now() - st > timedelta(hours=self.rollover_hours):
+            self.stop()
+            self.start()
 
 
 #============= EOF =============================================
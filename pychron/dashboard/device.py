@@ -15,7 +15,6 @@
 #===============================================================================
 
 #============= enthought library imports =======================
-import struct
 from traits.api import HasTraits, Str, Either, Float, Property, Bool, List, Instance, \
     Event
 from traitsui.api import View, Item, ListEditor, InstanceEditor, UItem, VGroup, HGroup
@@ -26,6 +25,7 @@ import time
 import yaml
 from pychron.hardware.core.i_core_device import ICoreDevice
 from pychron.core.helpers.datetime_tools import convert_timestamp
+from pychron.dashboard.time_series import get_row_fmt
 from pychron.loggable import Loggable
 
 
@@ -117,9 +117,13 @@ class DashboardDevice(Loggable):
     def _push_value(self, pv, new):
         if pv.enabled:
             tag = pv.tag
-            self.publish_event = '{} {}'.format(tag, new)
-            pv.last_value = float(new)
+            try:
+                pv.last_value = float(new)
+            except ValueError:
+                # e.g. "timeout"
+                pass
             pv.last_time = time.time()
+            self.publish_event = '{} {}'.format(tag, new)
 
     def dump_meta(self):
         d=[]
@@ -131,28 +135,14 @@ class DashboardDevice(Loggable):
         return yaml.dump(d)
 
     def get_scan_fmt(self):
-        n=len(self.values) *2
-        fmt = '>{}'.format('f' * n)
-        return fmt
-
-    def append_scan_blob(self, blob=None, fmt=None):
-        new_args = [a for v in self.values
-                    for a in (v.last_time, v.last_value)]
-
-        if blob:
-            step = 4 * fmt.count('f')
-            args = zip(*[struct.unpack(fmt, blob[i:i + step]) for i in xrange(0, len(blob), step)])
-            ns=[]
-            for blobv, lastv in zip(args, new_args):
-                blobv=list(blobv)
-                blobv.append(lastv)
-                ns.append(blobv)
-            blob = ''.join([struct.pack(fmt, *v) for v in zip(*ns)])
-        else:
-            fmt = '>{}'.format('f' * len(new_args))
-            blob = struct.pack(fmt, *new_args)
-
-        return blob
+        return get_row_fmt(len(self.values))
+
+    def get_scan_row(self):
+        """
+            time of the latest value followed by the last value of each channel
+        """
+        vs = self.values
+        return [max(v.last_time for v in vs)] + [v.last_value for v in vs]
 
     def traits_view(self):
         hgrp = HGroup(UItem('use'), UItem('name', style='readonly'))
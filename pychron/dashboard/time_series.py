@@ -0,0 +1,145 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import struct
+import time
+
+from numpy import empty, asarray, frombuffer, hstack, unique, searchsorted, Inf
+#============= local library imports  ==========================
+from pychron.graph.lod import minmax_indices
+
+# rows per chunk
+CHUNK_SIZE = 256
+# largest blob a MySQL BLOB column holds
+MAX_CHUNK_BYTES = 65535
+
+COLUMN_DTYPE = '<f8'
+
+
+def get_row_fmt(nvalues):
+    """
+        struct format of one row, a float64 timestamp followed by nvalues float64 values
+    """
+    return '<{}d'.format(nvalues + 1)
+
+
+def get_ncolumns(fmt):
+    return struct.calcsize(fmt) // 8
+
+
+def get_chunk_size(ncolumns, chunk_size=CHUNK_SIZE):
+    return max(1, min(chunk_size, MAX_CHUNK_BYTES // (8 * ncolumns)))
+
+
+def pack_chunk(cols):
+    """
+        cols is a (ncolumns, n) array. each column is stored contiguously
+    """
+    return asarray(cols, dtype=COLUMN_DTYPE).tostring()
+
+
+def unpack_chunk(blob, ncolumns):
+    return frombuffer(blob, dtype=COLUMN_DTYPE).reshape(ncolumns, -1)
+
+
+def read_range(chunks, ncolumns, start=None, end=None):
+    """
+        concatenate chunks, a time ordered sequence of (ncolumns, n) arrays, and return
+        the columns of the rows with start<=time<=end
+    """
+    chunks = [c for c in chunks if c.shape[1]]
+    if not chunks:
+        return empty((ncolumns, 0))
+
+    cols = hstack(chunks)
+    if start is None:
+        start = -Inf
+    if end is None:
+        end = Inf
+
+    ts = cols[0]
+    s = searchsorted(ts, start, side='left')
+    e = searchsorted(ts, end, side='right')
+    return cols[:, s:e]
+
+
+def downsample(cols, nbins):
+    """
+        reduce cols to the rows holding the min or max of any value column in each of
+        nbins time ordered bins
+    """
+    if nbins < 1 or cols.shape[1] <= 2 * nbins:
+        return cols
+
+    idx = unique(hstack([minmax_indices(ci, nbins) for ci in cols[1:]]))
+    return cols[:, idx]
+
+
+class ChunkBuffer(object):
+    """
+        unwritten tail of one device's history.
+
+        rows are stored in a preallocated (ncolumns, chunk_size) array. append returns
+        the chunk once it is full and starts a new one so every chunk is handed off,
+        and written, exactly once
+    """
+
+    def __init__(self, ncolumns, chunk_size=CHUNK_SIZE):
+        self.ncolumns = ncolumns
+        self.chunk_size = chunk_size
+        self.nchunks = 0
+        self._a = empty((ncolumns, chunk_size))
+        self._n = 0
+        self._started = None
+
+    def append(self, row):
+        if not self._n:
+            self._started = time.time()
+
+        self._a[:, self._n] = row
+        self._n += 1
+        if self._n == self.chunk_size:
+            return self.take()
+
+    def take(self):
+        """
+            return the buffered rows as a (ncolumns, n) array and reset. None if empty
+        """
+        if self._n:
+            cols = self._a[:, :self._n].copy()
+            self._n = 0
+            self.nchunks += 1
+            return cols
+
+    @property
+    def columns(self):
+        return self._a[:, :self._n]
+
+    @property
+    def age(self):
+        """
+            seconds since the oldest buffered row was appended
+        """
+        if self._n:
+            return time.time() - self._started
+        return 0
+
+    def __len__(self):
+        return self._n
+
+#============= EOF =============================================
@@ -19,20 +19,47 @@
 #============= standard library imports ========================
 #============= local library imports  ==========================
 from pychron.database.core.database_adapter import DatabaseAdapter
-from pychron.database.orms.isotope.dash import dash_TimeTable, dash_DeviceTable
+from pychron.database.orms.isotope.dash import dash_TimeTable, dash_DeviceTable, dash_ScanChunkTable
 
 
 class DashboardAdapter(DatabaseAdapter):
     def add_time_table(self, start):
         obj=dash_TimeTable(start=start)
         self._add_item(obj)
+        return obj
 
     def add_device(self, time_table, device_name):
         obj=dash_DeviceTable(name=device_name, time_table=time_table)
         return obj
 
+    def add_scan_chunk(self, device, idx, start, end, npts, blob):
+        obj=dash_ScanChunkTable(device=device, idx=idx,
+                                start=start, end=end, npts=npts, blob=blob)
+        self._add_item(obj)
+        return obj
+
     def get_last_time_table(self):
         return self._retrieve_first(dash_TimeTable, order_by=dash_TimeTable.start.desc())
 
+    def get_device(self, time_table, device_name):
+        for dev in time_table.devices:
+            if dev.name == device_name:
+                return dev
+
+    def get_scan_chunks(self, device_name, start=None, end=None):
+        """
+            chunks of device_name overlapping start-end, in time order, across all time tables
+        """
+        filters=[dash_DeviceTable.name == device_name]
+        if start is not None:
+            filters.append(dash_ScanChunkTable.end >= start)
+        if end is not None:
+            filters.append(dash_ScanChunkTable.start <= end)
+
+        return self._retrieve_items(dash_ScanChunkTable,
+                                    joins=(dash_DeviceTable,),
+                                    filters=filters,
+                                    order=dash_ScanChunkTable.start)
+
 #============= EOF =============================================
 
@@ -23,6 +23,7 @@ from cStringIO import StringIO
 import hashlib
 
 from sqlalchemy.sql.expression import and_, func, not_
+from sqlalchemy.orm import joinedload, subqueryload
 from sqlalchemy.orm.exc import NoResultFound
 
 #============= local library imports  ==========================
@@ -100,6 +101,49 @@ class InterpretedAge(HasTraits):
                            Item('mswd', style='readonly', label='MSWD')))
 
 
+def analysis_load_options(unpack=False):
+    """
+        eager loading strategies for the tables used to build a DBAnalysis
+    """
+    ln = joinedload('labnumber')
+    pos = ln.joinedload('irradiation_position')
+    level = pos.joinedload('level')
+
+    sel = joinedload('selected_histories')
+    fits = sel.joinedload('selected_fits').subqueryload('fits')
+
+    isos = subqueryload('isotopes')
+
+    opts = [ln.joinedload('sample').joinedload('project'),
+            ln.joinedload('sample').joinedload('material'),
+            ln.joinedload('selected_flux_history').joinedload('flux'),
+            level.joinedload('irradiation').joinedload('chronology'),
+            level.joinedload('production'),
+
+            joinedload('measurement').joinedload('analysis_type'),
+            joinedload('measurement').joinedload('mass_spectrometer'),
+            joinedload('extraction').joinedload('experiment'),
+            joinedload('extraction').joinedload('extraction_device'),
+            joinedload('extraction').subqueryload('positions'),
+            joinedload('tag_item'),
+
+            sel.joinedload('selected_blanks').subqueryload('blanks'),
+            sel.joinedload('selected_detector_intercalibration').subqueryload(
+                'detector_intercalibrations').joinedload('detector'),
+            sel.joinedload('selected_detector_param').subqueryload('detector_params').joinedload('detector'),
+            sel.joinedload('selected_sensitivity').joinedload('sensitivity'),
+            fits.joinedload('isotope').joinedload('molecular_weight'),
+
+            isos.joinedload('molecular_weight'),
+            isos.joinedload('detector'),
+            isos.subqueryload('results')]
+
+    if unpack:
+        opts.append(isos.joinedload('signal'))
+
+    return opts
+
+
 class IsotopeAdapter(DatabaseAdapter):
     """
         new style adapter
@@ -1413,6 +1457,35 @@ class IsotopeAdapter(DatabaseAdapter):
     # #        return meas_AnalysisTable, 'uuid'
         return self._retrieve_item(meas_AnalysisTable, value, key='uuid')
 
+    def get_analyses_uuid(self, values, unpack=False, chunk_size=500):
+        """
+            bulk version of get_analysis_uuid.
+
+            the relationships walked by DBAnalysis.sync are eager loaded so syncing
+            the returned records does not issue any further queries.
+            many-to-one chains are joined, collections are loaded with one IN query
+            per relationship.
+
+            unpack: also load the raw signal blobs
+
+            returns dict of uuid: meas_AnalysisTable
+        """
+        records = {}
+        if not values:
+            return records
+
+        with self.session_ctx() as sess:
+            opts = analysis_load_options(unpack)
+            #sqlite limits the number of bound parameters. query in chunks
+            for i in xrange(0, len(values), chunk_size):
+                q = sess.query(meas_AnalysisTable)
+                q = q.filter(meas_AnalysisTable.uuid.in_(values[i:i + chunk_size]))
+                q = q.options(*opts)
+                for r in self._query_all(q):
+                    records[r.uuid] = r
+
+        return records
+
     def get_analysis_record(self, value):
         return self._retrieve_item(meas_AnalysisTable, value, key='id')
 
@@ -1423,7 +1496,7 @@ class IsotopeAdapter(DatabaseAdapter):
         return self._retrieve_item(meas_AnalysisTable, value, key=key)
 
     def get_analysis_type(self, value):
-        return self._retrieve_item(gen_AnalysisTypeTable, value)
+        return self._retrieve_cached(gen_AnalysisTypeTable, value)
 
     def get_blank(self, value):
         return self._retrieve_item(proc_BlanksTable, value)
@@ -1438,7 +1511,7 @@ class IsotopeAdapter(DatabaseAdapter):
         return self._retrieve_item(proc_BackgroundsHistoryTable, value, )
 
     def get_detector(self, value):
-        return self._retrieve_item(gen_DetectorTable, value, )
+        return self._retrieve_cached(gen_DetectorTable, value)
 
     def get_detector_intercalibration(self, value):
         return self._retrieve_item(proc_DetectorIntercalibrationTable, value, )
@@ -1459,7 +1532,7 @@ class IsotopeAdapter(DatabaseAdapter):
     #        return self._retrieve_item(meas_ExtractionTable, value, key='hash')
 
     def get_extraction_device(self, value):
-        return self._retrieve_item(gen_ExtractionDeviceTable, value, )
+        return self._retrieve_cached(gen_ExtractionDeviceTable, value)
 
     def get_figure(self, value, **kw):
         return self._retrieve_item(proc_FigureTable, value, **kw)
@@ -1468,7 +1541,7 @@ class IsotopeAdapter(DatabaseAdapter):
         return self._retrieve_item(irrad_ChronologyTable, value, )
 
     def get_load_holder(self, value):
-        return self._retrieve_item(gen_LoadHolderTable, value, )
+        return self._retrieve_cached(gen_LoadHolderTable, value)
 
     def get_irradiation_holder(self, value):
         return self._retrieve_item(irrad_HolderTable, value, )
@@ -1532,16 +1605,16 @@ class IsotopeAdapter(DatabaseAdapter):
     #        return self._retrieve_item(gen_LabTable, labnum, key='labnumber')
 
     def get_mass_spectrometer(self, value):
-        return self._retrieve_item(gen_MassSpectrometerTable, value, )
+        return self._retrieve_cached(gen_MassSpectrometerTable, value)
 
     def get_material(self, value):
-        return self._retrieve_item(gen_MaterialTable, value, )
+        return self._retrieve_cached(gen_MaterialTable, value)
 
     #    def get_measurement(self, value):
     #        return self._retrieve_item(meas_MeasurementTable, value, key='hash')
 
     def get_molecular_weight(self, value):
-        return self._retrieve_item(gen_MolecularWeightTable, value)
+        return self._retrieve_cached(gen_MolecularWeightTable, value)
 
     def get_user(self, value):
         return self._retrieve_item(gen_UserTable, value, )
@@ -0,0 +1,218 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from collections import OrderedDict
+from threading import RLock
+#============= local library imports  ==========================
+from pychron.core.helpers.logger_setup import new_logger
+
+logger = new_logger('AnalysisCache')
+
+# rough size of an analysis object without its raw data
+ANALYSIS_OVERHEAD = 20 * 1024
+ISOTOPE_OVERHEAD = 2 * 1024
+
+META = 'meta'
+RAW = 'raw'
+
+
+def estimate_analysis_size(analysis):
+    """
+        approximate memory footprint in bytes. dominated by the isotope, baseline and
+        sniff xs, ys arrays
+    """
+    n = ANALYSIS_OVERHEAD
+    isotopes = getattr(analysis, 'isotopes', None)
+    if isotopes:
+        for iso in isotopes.itervalues():
+            n += ISOTOPE_OVERHEAD
+            for m in (iso, getattr(iso, 'baseline', None), getattr(iso, 'sniff', None)):
+                if m is not None:
+                    n += m.xs.nbytes + m.ys.nbytes
+    return n
+
+
+class CacheTier(object):
+    """
+        LRU ordered dict of uuid: (analysis, nbytes) bounded by a byte budget and a count
+    """
+
+    def __init__(self, name, max_bytes, max_count):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_count = max_count
+        self.nbytes = 0
+        self._items = OrderedDict()
+
+    def get(self, key):
+        """
+            return analysis and mark as most recently used
+        """
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._items[key] = item
+            return item[0]
+
+    def put(self, key, analysis, nbytes):
+        self.pop(key)
+        self._items[key] = (analysis, nbytes)
+        self.nbytes += nbytes
+
+    def pop(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.nbytes -= item[1]
+            return item[0]
+
+    def evict(self):
+        """
+            remove least recently used items until within budget.
+            return list of (key, nbytes) evicted
+        """
+        evicted = []
+        items = self._items
+        while items and (self.nbytes > self.max_bytes or len(items) > self.max_count):
+            key, (_, nbytes) = items.popitem(last=False)
+            self.nbytes -= nbytes
+            evicted.append((key, nbytes))
+        return evicted
+
+    def clear(self):
+        self._items.clear()
+        self.nbytes = 0
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
+class AnalysisCache(object):
+    """
+        bounded, size aware LRU cache of DBAnalysis objects keyed by uuid.
+
+        two tiers
+            meta: analyses loaded without raw signal data
+            raw: analyses with unpacked raw data (has_raw_data=True)
+
+        a raw analysis also satisfies a metadata request.
+    """
+
+    def __init__(self, meta_bytes=200 * 1024 ** 2, raw_bytes=500 * 1024 ** 2, max_count=500):
+        self._tiers = {META: CacheTier(META, meta_bytes, max_count),
+                       RAW: CacheTier(RAW, raw_bytes, max_count)}
+        self._lock = RLock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.invalidations = 0
+
+    def get(self, uuid, raw=False):
+        """
+            return the cached analysis or None.
+            raw: require an analysis with raw data
+        """
+        with self._lock:
+            a = self._tiers[RAW].get(uuid)
+            if a is None and not raw:
+                a = self._tiers[META].get(uuid)
+
+            if a is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return a
+
+    def put(self, analysis):
+        uuid = analysis.uuid
+        tier = RAW if getattr(analysis, 'has_raw_data', False) else META
+        nbytes = estimate_analysis_size(analysis)
+        with self._lock:
+            for k, t in self._tiers.iteritems():
+                if k != tier:
+                    t.pop(uuid)
+
+            t = self._tiers[tier]
+            t.put(uuid, analysis, nbytes)
+            evicted = t.evict()
+            if evicted:
+                self.evictions += len(evicted)
+                self.evicted_bytes += sum((e[1] for e in evicted))
+
+        if evicted:
+            logger.debug('{} cache over budget. evicted {} analyses. {}'.format(tier, len(evicted),
+                                                                                self.stats_str()))
+
+    def remove(self, uuid):
+        """
+            invalidate an analysis. returns True if it was cached
+        """
+        with self._lock:
+            removed = False
+            for t in self._tiers.itervalues():
+                if t.pop(uuid) is not None:
+                    removed = True
+            if removed:
+                self.invalidations += 1
+            return removed
+
+    def invalidate(self, uuids):
+        for u in uuids:
+            self.remove(u)
+
+    def clear(self):
+        with self._lock:
+            for t in self._tiers.itervalues():
+                t.clear()
+        logger.debug('cache cleared')
+
+    def stats(self):
+        """
+            return a dict of cache statistics
+        """
+        meta, raw = self._tiers[META], self._tiers[RAW]
+        n = self.hits + self.misses
+        return dict(hits=self.hits,
+                    misses=self.misses,
+                    hit_rate=self.hits / float(n) if n else 0,
+                    evictions=self.evictions,
+                    evicted_bytes=self.evicted_bytes,
+                    invalidations=self.invalidations,
+                    meta_count=len(meta),
+                    meta_bytes=meta.nbytes,
+                    raw_count=len(raw),
+                    raw_bytes=raw.nbytes,
+                    bytes=meta.nbytes + raw.nbytes)
+
+    def stats_str(self):
+        s = self.stats()
+        return 'hits={hits} misses={misses} hit_rate={hit_rate:0.2f} evictions={evictions} ' \
+               'meta={meta_count}/{meta_bytes}b raw={raw_count}/{raw_bytes}b'.format(**s)
+
+    def __contains__(self, uuid):
+        return any((uuid in t for t in self._tiers.itervalues()))
+
+    def __len__(self):
+        return sum((len(t) for t in self._tiers.itervalues()))
+
+#============= EOF =============================================
@@ -0,0 +1,222 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import time
+from collections import defaultdict
+
+from sqlalchemy import MetaData, select
+#============= local library imports  ==========================
+
+TABLE_PREFIXES = ('irrad_', 'gen_', 'meas_', 'flux_', 'proc_')
+
+# rows that are not reachable by following foreign keys from an analysis
+# but belong to it. (child table, foreign key column, parent table)
+CHILD_TABLES = (('meas_IsotopeTable', 'analysis_id', 'meas_AnalysisTable'),
+                ('meas_SignalTable', 'isotope_id', 'meas_IsotopeTable'),
+                ('proc_SelectedHistoriesTable', 'analysis_id', 'meas_AnalysisTable'),
+                ('proc_BlanksTable', 'history_id', 'proc_BlanksHistoryTable'),
+                ('proc_FitTable', 'history_id', 'proc_FitHistoryTable'),
+                ('proc_DetectorParamTable', 'history_id', 'proc_DetectorParamHistoryTable'),
+                ('proc_DetectorIntercalibrationTable', 'history_id', 'proc_DetectorIntercalibrationHistoryTable'),
+                ('flux_FluxTable', 'history_id', 'flux_HistoryTable'),
+                ('proc_InterpretedAgeTable', 'history_id', 'proc_InterpretedAgeHistoryTable'))
+
+
+def reflect_metadata(bind):
+    meta = MetaData()
+    meta.reflect(bind=bind,
+                 only=lambda name, m: name.lower().startswith(TABLE_PREFIXES))
+    return meta
+
+
+def dependency_order(tables):
+    """
+        return table names ordered so referenced tables come before the tables
+        referencing them. circular references are broken at the table with the
+        fewest unresolved dependencies
+    """
+    names = set(t.name for t in tables)
+    deps = {}
+    for t in tables:
+        deps[t.name] = set(fk.column.table.name for fk in t.foreign_keys
+                           if fk.column.table.name in names and fk.column.table.name != t.name)
+
+    order = []
+    while deps:
+        ready = sorted(n for n, d in deps.iteritems() if not d)
+        if not ready:
+            ready = [min(deps, key=lambda n: (len(deps[n]), n))]
+
+        for n in ready:
+            del deps[n]
+            order.append(n)
+
+        for d in deps.itervalues():
+            d.difference_update(ready)
+
+    return order
+
+
+class BulkReplicator(object):
+    """
+        copy analyses and every row they depend on from one database to another.
+
+        metadata is reflected once. the closure of rows needed for a set of analyses is collected
+        with one IN query per table per level, the destination is diffed with one IN query per table
+        and missing rows are inserted with executemany in dependency order
+    """
+
+    def __init__(self, src, dest, chunk_size=500):
+        """
+            src, dest: Session
+        """
+        self.src = src
+        self.dest = dest
+        self.chunk_size = chunk_size
+
+        self.nqueries = 0
+        self.nrows = 0
+        self.duration = 0
+
+        self._src_tables = self._table_map(reflect_metadata(src.bind))
+        self._dest_tables = self._table_map(reflect_metadata(dest.bind))
+
+    @property
+    def rows_per_second(self):
+        if self.duration:
+            return self.nrows / self.duration
+        return 0
+
+    def replicate(self, uuids):
+        """
+            copy the analyses identified by uuids. return number of rows inserted
+        """
+        st = time.time()
+        rows = self._collect(uuids)
+        missing = self._diff(rows)
+        n = self._insert(missing)
+
+        self.nrows += n
+        self.duration += time.time() - st
+        return n
+
+    def _collect(self, uuids):
+        """
+            return {table name: {primary key: row}}
+        """
+        rows = defaultdict(dict)
+        fetched = defaultdict(set)
+
+        todo = [('meas_AnalysisTable', 'uuid', uuids)]
+        while todo:
+            tn, col, values = todo.pop()
+            table = self._src_tables.get(tn.lower())
+            if table is None:
+                continue
+
+            key = (table.name, col)
+            values = set(values) - fetched[key]
+            if not values:
+                continue
+            fetched[key].update(values)
+
+            pk = self._primary_key(table)
+            have = rows[table.name]
+            new = []
+            for r in self._select(self.src, table, table.c[col], values):
+                k = r[pk]
+                if k not in have:
+                    have[k] = r
+                    new.append(r)
+
+            if not new:
+                continue
+
+            for fk in table.foreign_keys:
+                vs = set(r[fk.parent.name] for r in new)
+                vs.discard(None)
+                if vs:
+                    todo.append((fk.column.table.name, fk.column.name, vs))
+
+            for child, ccol, parent in CHILD_TABLES:
+                if parent.lower() == table.name.lower():
+                    todo.append((child, ccol, [r[pk] for r in new]))
+
+        return rows
+
+    def _diff(self, rows):
+        """
+            remove the rows that already exist in the destination
+        """
+        missing = {}
+        for tn, trows in rows.iteritems():
+            dtable = self._dest_tables.get(tn.lower())
+            if dtable is None or not trows:
+                continue
+
+            pk = self._primary_key(dtable)
+            res = self._select(self.dest, dtable, dtable.c[pk], trows.keys(), columns=[dtable.c[pk]])
+            existing = set(r[pk] for r in res)
+            ms = [r for k, r in trows.iteritems() if k not in existing]
+            if ms:
+                missing[tn] = ms
+
+        return missing
+
+    def _insert(self, missing):
+        tables = [self._src_tables[tn.lower()] for tn in missing]
+
+        n = 0
+        for tn in dependency_order(tables):
+            dtable = self._dest_tables[tn.lower()]
+            rows = missing[tn]
+
+            #only copy the columns both schemas have
+            cols = [c for c in dtable.columns.keys() if c in rows[0]]
+            rs = [dict((c, r[c]) for c in cols) for r in rows]
+
+            self.dest.execute(dtable.insert(), rs)
+            self.nqueries += 1
+            n += len(rs)
+
+        return n
+
+    def _select(self, sess, table, col, values, columns=None):
+        if columns is None:
+            columns = [table]
+
+        values = list(values)
+        rows = []
+        for i in xrange(0, len(values), self.chunk_size):
+            chunk = values[i:i + self.chunk_size]
+            result = sess.execute(select(columns).where(col.in_(chunk)))
+            self.nqueries += 1
+
+            keys = result.keys()
+            rows.extend(dict(zip(keys, r)) for r in result)
+
+        return rows
+
+    def _primary_key(self, table):
+        return table.primary_key.columns.keys()[0]
+
+    def _table_map(self, meta):
+        return dict((t.name.lower(), t) for t in meta.tables.itervalues()
+                    if len(t.primary_key.columns) == 1)
+
+#============= EOF =============================================
@@ -15,7 +15,7 @@
 #===============================================================================
 
 #=============enthought library imports=======================
-from traits.api import Password, Bool, Str, on_trait_change, Any, Property, cached_property
+from traits.api import Password, Bool, Str, on_trait_change, Any, Property, cached_property, Instance
 #=============standard library imports ========================
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -26,6 +26,7 @@ import os
 
 from pychron.loggable import Loggable
 from pychron.database.core.base_orm import AlembicVersionTable
+from pychron.database.core.lookup_cache import LookupCache
 from sqlalchemy.orm.exc import MultipleResultsFound, NoResultFound
 import weakref
 
@@ -118,6 +119,9 @@ class DatabaseAdapter(Loggable):
 
     path = Str
 
+    # primary keys of rows read with _retrieve_cached
+    _lookup_cache = Instance(LookupCache, ())
+
     def create_all(self, metadata):
         if self.kind == 'sqlite':
             with self.session_ctx() as sess:
@@ -164,6 +168,7 @@ class DatabaseAdapter(Loggable):
                     #                     Session.configure(bind=engine)
 
                     self.session_factory = sessionmaker(bind=engine, autoflush=False)
+                    self._lookup_cache.clear()
                     if test:
                         self.connected = self._test_db_connection()
                     else:
@@ -190,6 +195,17 @@ host= {}\nurl= {}'.format(self.name, self.username, self.host, self.url))
 
         return sess
 
+    def get_lookup_cache_stats(self):
+        """
+            return {tablename: (hits, misses, hit rate)} for the tables read with _retrieve_cached
+        """
+        return self._lookup_cache.stats()
+
+    def report_lookup_cache(self):
+        for name, (hits, misses, rate) in sorted(self.get_lookup_cache_stats().iteritems()):
+            self.debug('lookup cache {:<30s} hits={} misses={} hit rate={:0.1f}%'.format(name, hits, misses,
+                                                                                         rate * 100))
+
     def get_migrate_version(self, **kw):
         with self.session_ctx() as s:
             #q = s.query(MigrateVersionTable)
@@ -307,6 +323,7 @@ host= {}\nurl= {}'.format(self.name, self.username, self.host, self.url))
         #         sess = self._session
         sess = self.get_session()
         if sess:
+            self._lookup_cache.invalidate(type(obj), getattr(obj, 'name', None))
             sess.add(obj)
             try:
                 sess.flush()
@@ -315,6 +332,8 @@ host= {}\nurl= {}'.format(self.name, self.username, self.host, self.url))
                 # traceback.print_exc()
                 self.debug('add_item exception {} {}'.format(obj, traceback.format_exc()))
                 sess.rollback()
+                # keys cached in this session may have been rolled back
+                self._lookup_cache.clear()
 
 
                 #     def _add_item(self, obj, sess=None):
@@ -365,6 +384,7 @@ host= {}\nurl= {}'.format(self.name, self.username, self.host, self.url))
                 item = value
 
             if item:
+                self._lookup_cache.invalidate(type(item))
                 sess.delete(item)
 
     def _retrieve_items(self, table,
@@ -447,6 +467,32 @@ host= {}\nurl= {}'.format(self.name, self.username, self.host, self.url))
         q = q.limit(1)
         return self._query(q, 'one', reraise)
 
+    def _retrieve_cached(self, table, value):
+        """
+            _retrieve_item by name for small, rarely changing tables.
+
+            the primary key of a found row is cached and the row is reloaded
+            with Query.get, which doesn't hit the database if the row is already in the session.
+            a reloaded row that was deleted or renamed invalidates the entry and is looked up by name
+        """
+        if not isinstance(value, (str, unicode)):
+            return self._retrieve_item(table, value)
+
+        cache = self._lookup_cache
+        pk = cache.get(table, value)
+        if pk is not None:
+            with self.session_ctx() as s:
+                obj = s.query(table).get(pk)
+                if obj is not None and obj.name == value:
+                    return obj
+
+            cache.invalidate(table, value)
+
+        obj = self._retrieve_item(table, value)
+        if obj is not None:
+            cache.set(table, value, obj.id)
+        return obj
+
     def _retrieve_item(self, table, value, key='name', last=None,
                        joins=None, filters=None, options=None, verbose=True):
         #         sess = self.get_session()
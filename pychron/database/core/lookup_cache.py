@@ -0,0 +1,82 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from threading import Lock
+#============= local library imports  ==========================
+
+
+class LookupCache(object):
+    """
+        name -> primary key for small, rarely changing tables.
+
+        only primary keys are kept so cached rows are never shared between sessions.
+        the adapter turns a key back into a row with Query.get, which is answered
+        from the session's identity map if the row is already loaded
+    """
+
+    def __init__(self):
+        self._keys = {}
+        self._stats = {}
+        self._lock = Lock()
+
+    def get(self, table, name):
+        """
+            return the cached primary key, None on a miss
+        """
+        with self._lock:
+            pk = self._keys.get((table, name))
+            s = self._get_stats(table)
+            s[0 if pk is not None else 1] += 1
+            return pk
+
+    def set(self, table, name, pk):
+        if pk is not None:
+            with self._lock:
+                self._keys[(table, name)] = pk
+
+    def invalidate(self, table, name=None):
+        with self._lock:
+            if name is None:
+                for k in [k for k in self._keys if k[0] is table]:
+                    del self._keys[k]
+            else:
+                self._keys.pop((table, name), None)
+
+    def clear(self):
+        with self._lock:
+            self._keys = {}
+
+    def stats(self):
+        """
+            return {tablename: (hits, misses, hit rate)}
+        """
+        with self._lock:
+            d = {}
+            for table, (hits, misses) in self._stats.iteritems():
+                n = hits + misses
+                d[table.__tablename__] = hits, misses, hits / float(n) if n else 0
+            return d
+
+    def _get_stats(self, table):
+        try:
+            s = self._stats[table]
+        except KeyError:
+            s = self._stats[table] = [0, 0]
+        return s
+
+#============= EOF =============================================
@@ -19,9 +19,11 @@ from traits.api import String, Property, Event, \
     cached_property, Any, Bool, Int
 from apptools.preferences.preference_binding import bind_preference
 #============= standard library imports ========================
-import weakref
+import sys
+from multiprocessing import cpu_count
 #============= local library imports  ==========================
 from traits.has_traits import provides
+from pychron.database.analysis_cache import AnalysisCache
 from pychron.core.i_datastore import IDatastore
 from pychron.database.adapters.isotope_adapter import IsotopeAdapter
 from pychron.core.helpers.iterfuncs import partition
@@ -30,13 +32,15 @@ from pychron.core.ui.progress_dialog import myProgressDialog
 from pychron.loggable import Loggable
 from pychron.database.orms.isotope.meas import meas_AnalysisTable
 from pychron.experiment.utilities.identifier import make_runid
+from pychron.processing.analyses.analysis_snapshot import make_snapshot, reduce_snapshot, apply_snapshot, \
+    set_snapshot_data, snapshot_pool
 from pychron.processing.analyses.dbanalysis import DBAnalysis
+from pychron.processing.batch_age import calculate_ages
 from pychron.processing.analyses.vcs_analysis import VCSAnalysis
 
 
-ANALYSIS_CACHE = {}
-ANALYSIS_CACHE_COUNT = {}
 CACHE_LIMIT = 500
+ANALYSIS_CACHE = AnalysisCache(max_count=CACHE_LIMIT)
 
 
 @provides(IDatastore)
@@ -168,9 +172,15 @@ class IsotopeDatabaseManager(BaseIsotopeDatabaseManager):
 
     use_vcs=Bool
     use_offline_database=Bool
+    use_process_pool=Bool(False)
+    process_pool_size=Int(0)
     vcs = Any
     offline_bridge=Any
 
+    # reused by every make_analyses call
+    _process_pool = None
+    _process_pool_size = 0
+
     def bind_preferences(self):
         super(IsotopeDatabaseManager, self).bind_preferences()
 
@@ -182,6 +192,10 @@ class IsotopeDatabaseManager(BaseIsotopeDatabaseManager):
         bind_preference(self, 'use_offline_database', '{}.use_offline_database'.format(prefid))
         self._use_offline_database_changed()
 
+        prefid = 'pychron.processing'
+        bind_preference(self, 'use_process_pool', '{}.use_process_pool'.format(prefid))
+        bind_preference(self, 'process_pool_size', '{}.process_pool_size'.format(prefid))
+
     def _use_offline_database_changed(self):
         if self.use_offline_database:
             from pychron.database.offline_bridge import OfflineBridge
@@ -195,6 +209,24 @@ class IsotopeDatabaseManager(BaseIsotopeDatabaseManager):
             if not self.vcs:
                 self.vcs=IsotopeVCSManager()
 
+    def _use_process_pool_changed(self, new):
+        if not new:
+            self.close_process_pool()
+
+    def close_process_pool(self, terminate=False):
+        """
+            shut down the make_analyses process pool.
+            terminate: stop the workers without waiting for outstanding work
+        """
+        pool = self._process_pool
+        if pool is not None:
+            self._process_pool = None
+            if terminate:
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+
     def update_vcs_analysis(self, an, msg):
         if self.use_vcs:
             self.vcs.update_analysis(an, msg)
@@ -237,28 +269,16 @@ class IsotopeDatabaseManager(BaseIsotopeDatabaseManager):
                 db_ans, no_db_ans = map(list, partition(ans, lambda x: isinstance(x, DBAnalysis)))
 
                 if no_db_ans:
-                    #partition into cached and non cached analyses
-                    cached_ans, no_db_ans = partition(no_db_ans,
-                                                      lambda x: x.uuid in ANALYSIS_CACHE)
-                    cached_ans = list(cached_ans)
-                    no_db_ans = list(no_db_ans)
-
-                    #if unpack is true make sure cached analyses have raw data
-                    if unpack:
-                        for ci in cached_ans:
-                            ca=ANALYSIS_CACHE[ci.uuid]
-                            if not ca.has_raw_data:
-                                print ca.record_id, 'no rawasffas'
-                                no_db_ans.append(ci)
-                            else:
-                                db_ans.append(ca)
-                    else:
-                        #add analyses from cache to db_ans
-                        db_ans.extend([ANALYSIS_CACHE[ci.uuid] for ci in cached_ans])
-
-                    #increment value in cache_count
-                    for ci in cached_ans:
-                        self._add_to_cache(ci)
+                    #split into cached and non cached analyses
+                    #if unpack is true cached analyses must have raw data
+                    uncached = []
+                    for ai in no_db_ans:
+                        ca = ANALYSIS_CACHE.get(ai.uuid, raw=unpack)
+                        if ca is None:
+                            uncached.append(ai)
+                        else:
+                            db_ans.append(ca)
+                    no_db_ans = uncached
 
                     #load remaining analyses
                     n = len(no_db_ans)
@@ -281,27 +301,42 @@ class IsotopeDatabaseManager(BaseIsotopeDatabaseManager):
                             elif use_progress:
                                 progress = self._open_progress(n+2)
 
+                        #fetch all the records in a few bulk queries instead of
+                        #lazy loading each relationship per analysis
+                        records = db.get_analyses_uuid([ai.uuid for ai in no_db_ans], unpack=unpack)
+
                         new_ans=[]
-                        for i, ai in enumerate(no_db_ans):
-                            if progress:
-                                if progress.canceled:
-                                    self.debug('canceling make analyses')
-                                    db_ans=[]
-                                    new_ans=[]
-                                    break
-                                elif progress.accepted:
-                                    self.debug('accepting {}/{} analyses'.format(i, n))
-                                    break
-
-                            a = self._construct_analysis(ai, progress, unpack=unpack, **kw)
-                            if a:
-                                if use_cache:
+                        if self.use_process_pool and not self.use_vcs and n > 1:
+                            new_ans = self._construct_analyses_pooled(no_db_ans, records, progress,
+                                                                      unpack=unpack, **kw)
+                            if new_ans is None:
+                                db_ans = []
+                                new_ans = []
+                            elif use_cache:
+                                for a in new_ans:
                                     self._add_to_cache(a)
-                                new_ans.append(a)
-
-                                # if progress:
-                                #     progress.on_trait_change(self._progress_closed,
-                                #                              'closed', remove=True)
+                        else:
+                            for i, ai in enumerate(no_db_ans):
+                                if progress:
+                                    if progress.canceled:
+                                        self.debug('canceling make analyses')
+                                        db_ans=[]
+                                        new_ans=[]
+                                        break
+                                    elif progress.accepted:
+                                        self.debug('accepting {}/{} analyses'.format(i, n))
+                                        break
+
+                                a = self._construct_analysis(ai, progress, unpack=unpack,
+                                                             meas_analysis=records.get(ai.uuid), **kw)
+                                if a:
+                                    if use_cache:
+                                        self._add_to_cache(a)
+                                    new_ans.append(a)
+
+                                    # if progress:
+                                    #     progress.on_trait_change(self._progress_closed,
+                                    #                              'closed', remove=True)
 
                         db_ans.extend(new_ans)
 
@@ -323,6 +358,7 @@ class IsotopeDatabaseManager(BaseIsotopeDatabaseManager):
                 if progress:
                     progress.soft_close()
 
+                self.debug('analysis cache {}'.format(ANALYSIS_CACHE.stats_str()))
                 return db_ans
 
     def get_level(self, level, irradiation=None):
@@ -332,31 +368,113 @@ class IsotopeDatabaseManager(BaseIsotopeDatabaseManager):
         return self.db.get_irradiation_level(irradiation, level)
 
     def remove_from_cache(self, ai):
-        uuid = ai.uuid
-        if uuid in ANALYSIS_CACHE:
+        if ANALYSIS_CACHE.remove(ai.uuid):
             self.debug('remove {} from cache'.format(ai.record_id))
-            ANALYSIS_CACHE.pop(uuid)
-            ANALYSIS_CACHE_COUNT.pop(uuid)
+
+    def clear_cache(self):
+        ANALYSIS_CACHE.clear()
+
+    def get_cache_stats(self):
+        """
+            return dict of analysis cache hits, misses, evictions, bytes
+        """
+        return ANALYSIS_CACHE.stats()
+
     #===============================================================================
     # private
     #===============================================================================
     def _add_to_cache(self, rec):
-        if not rec.uuid in ANALYSIS_CACHE:
-            #self.debug('Adding {} to cache'.format(rec.record_id))
-            ANALYSIS_CACHE[rec.uuid] = weakref.ref(rec)()
-            ANALYSIS_CACHE_COUNT[rec.uuid] = 1
-        else:
-            ANALYSIS_CACHE_COUNT[rec.uuid] += 1
+        ANALYSIS_CACHE.put(rec)
+
+    def _get_process_pool(self, nprocs):
+        if self._process_pool is not None and self._process_pool_size != nprocs:
+            self.close_process_pool()
 
-        #remove items from cached based on frequency of use
-        if len(ANALYSIS_CACHE) > CACHE_LIMIT:
-            s = sorted(ANALYSIS_CACHE_COUNT.iteritems(), key=lambda x: x[1])
-            k, v = s[0]
-            ANALYSIS_CACHE.pop(k)
-            ANALYSIS_CACHE_COUNT.pop(k)
-            self.debug('Cache limit exceeded {}. removing {} n uses={}'.format(CACHE_LIMIT, k, v))
+        if self._process_pool is None:
+            self.debug('starting process pool. nprocs={}'.format(nprocs))
+            self._process_pool = snapshot_pool(nprocs)
+            self._process_pool_size = nprocs
 
-    def _construct_analysis(self, rec, prog, calculate_age=True, unpack=False, load_changes=False):
+        return self._process_pool
+
+    def _construct_analyses_pooled(self, ans, records, prog, calculate_age=True, unpack=False,
+                                   load_changes=False):
+        """
+            sync the analyses' metadata in this process, unpack and regress the
+            raw data in a process pool then calculate the ages in one vectorized batch.
+
+            returns a list of DBAnalysis or None if canceled
+        """
+        n = len(ans)
+        db_ans = []
+        snapshots = []
+        for i, rec in enumerate(ans):
+            if prog:
+                if prog.canceled:
+                    self.debug('canceling make analyses')
+                    return
+                elif prog.accepted:
+                    self.debug('accepting {}/{} analyses'.format(i, n))
+                    break
+
+            meas_analysis = records.get(rec.uuid)
+            if meas_analysis is None:
+                meas_analysis = self.db.get_analysis_uuid(rec.uuid)
+
+            ai = DBAnalysis(group_id=getattr(rec, 'group_id', 0),
+                            graph_id=getattr(rec, 'graph_id', 0))
+            ai.sync(meas_analysis, unpack=False, load_changes=load_changes)
+            if prog:
+                prog.change_message('loading {}'.format(ai.record_id))
+
+            db_ans.append(ai)
+            if unpack:
+                snapshots.append(make_snapshot(ai, meas_analysis))
+
+        if snapshots:
+            nprocs = self.process_pool_size or cpu_count()
+            self.debug('reducing {} analyses with {} processes'.format(len(snapshots), nprocs))
+            if prog:
+                prog.increase_max(len(snapshots))
+
+            pool = self._get_process_pool(nprocs)
+            chunksize = max(1, len(snapshots) / (4 * nprocs))
+            reduced = []
+            try:
+                for ai, snap in zip(db_ans, pool.imap(reduce_snapshot, snapshots, chunksize)):
+                    if prog:
+                        if prog.canceled:
+                            self.debug('canceling make analyses')
+                            # stop the outstanding work. a new pool is started next time
+                            self.close_process_pool(terminate=True)
+                            return
+                        elif prog.accepted:
+                            self.debug('accepting {}/{} analyses'.format(len(reduced), n))
+                            self.close_process_pool(terminate=True)
+                            break
+                        prog.change_message('reduced {}'.format(ai.record_id))
+
+                    apply_snapshot(ai, snap, set_data=False)
+                    reduced.append(snap)
+            except BaseException:
+                exc_info = sys.exc_info()
+                self.close_process_pool(terminate=True)
+                raise exc_info[0], exc_info[1], exc_info[2]
+
+            db_ans = db_ans[:len(reduced)]
+
+        if calculate_age:
+            calculate_ages([ai for ai in db_ans if ai.analysis_type in ('unknown', 'cocktail')])
+
+        #set the raw data after the ages are calculated so the isotopes are not
+        #refit in this process
+        for ai, snap in zip(db_ans, snapshots):
+            set_snapshot_data(ai, snap)
+
+        return db_ans
+
+    def _construct_analysis(self, rec, prog, calculate_age=True, unpack=False, load_changes=False,
+                            meas_analysis=None):
         atype = None
         if isinstance(rec, meas_AnalysisTable):
             rid = make_runid(rec.labnumber.identifier, rec.aliquot, rec.step)
@@ -384,7 +502,8 @@ class IsotopeDatabaseManager(BaseIsotopeDatabaseManager):
             msg = 'loading {}. {}'.format(rid, m)
             prog.change_message(msg)
 
-        meas_analysis = self.db.get_analysis_uuid(rec.uuid)
+        if meas_analysis is None:
+            meas_analysis = self.db.get_analysis_uuid(rec.uuid)
 
         klass=DBAnalysis if not self.use_vcs else VCSAnalysis
         ai = klass(group_id=group_id,
@@ -19,12 +19,13 @@
 import os
 from sqlalchemy import Table
 from sqlalchemy.ext.declarative import declarative_base
-from traits.api import Any
+from traits.api import Any, Bool
 #============= standard library imports ========================
 #============= local library imports  ==========================
 from sqlalchemy.orm.exc import NoResultFound
 from pychron.core.helpers.logger_setup import wrap
 from pychron.database.adapters.isotope_adapter import IsotopeAdapter
+from pychron.database.bulk_replicator import BulkReplicator
 from pychron.database.orms.isotope.util import Base
 from pychron.loggable import Loggable
 from pychron.paths import paths
@@ -58,6 +59,9 @@ class DatabaseBridge(Loggable):
     source=Any
     dest=Any
 
+    #copy the analyses with set based queries instead of row by row
+    bulk = Bool(True)
+
     def add_analyses(self, ans):
         self.debug('adding analyses')
         self.debug('source={}'.format(self.source.url))
@@ -65,6 +69,10 @@ class DatabaseBridge(Loggable):
         self.dest.connect()
 
         db=self.source
+        if self.bulk:
+            self._bulk_add_analyses(ans, db)
+            return
+
         with self.dest.session_ctx() as dest:
             for ai in ans:
                 self._add_analysis(ai, dest, db)
@@ -72,6 +80,18 @@ class DatabaseBridge(Loggable):
                     # if progress:
                     #     progress.change_message('Transfering analysis {}'.format(ai.record_id))
 
+    def _bulk_add_analyses(self, ans, db):
+        uuids = [ai.uuid for ai in ans]
+        with db.session_ctx() as src:
+            with self.dest.session_ctx() as dest:
+                rep = BulkReplicator(src, dest)
+                n = rep.replicate(uuids)
+
+        self.info('transferred {} analyses. {} rows in {:0.2f}s {:0.0f} rows/s queries={}'.format(len(uuids), n,
+                                                                                                rep.duration,
+                                                                                                rep.rows_per_second,
+                                                                                                rep.nqueries))
+
     def _add_analysis(self, ai, dest, db):
         src=db.sess
         ln = ai.labnumber
@@ -18,7 +18,7 @@
 
 #============= standard library imports ========================
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, DateTime, BLOB, String
+from sqlalchemy import Column, DateTime, BLOB, String, Float, Integer
 #============= local library imports  ==========================
 from pychron.database.core.base_orm import BaseMixin, NameMixin
 from util import Base, foreignkey
@@ -35,5 +35,15 @@ class dash_DeviceTable(Base, NameMixin):
     scan_blob=Column(BLOB)
     scan_fmt=Column(String(32))
     scan_meta=Column(BLOB)
+    chunks=relationship('dash_ScanChunkTable', backref='device')
+
+
+class dash_ScanChunkTable(Base, BaseMixin):
+    device_id=foreignkey('dash_DeviceTable')
+    idx=Column(Integer)
+    start=Column(Float(53))
+    end=Column(Float(53))
+    npts=Column(Integer)
+    blob=Column(BLOB)
 #============= EOF =============================================
 
@@ -0,0 +1,161 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import math
+import time
+#============= local library imports  ==========================
+
+try:
+    from time import monotonic
+except ImportError:
+    # python 2. time.time is not monotonic but it is the best clock available
+    # on all platforms
+    monotonic = time.time
+
+# maximum time to sleep before checking for a stop request
+MAX_SLEEP = 0.1
+
+
+class TimingStats(object):
+    """
+        per measurement timing statistics.
+
+        lateness: time between a step's deadline and when it actually started
+        overruns: number of times a step took so long the next deadline was missed
+        dropped: number of scheduled counts skipped because of overruns
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.n = 0
+        self.overruns = 0
+        self.dropped = 0
+        self.max_lateness = 0
+        self._sum_lateness = 0
+        self._sum_lateness2 = 0
+        self._first = None
+        self._last = None
+
+    def record(self, t, lateness):
+        if self._first is None:
+            self._first = t
+        self._last = t
+
+        self.n += 1
+        self._sum_lateness += lateness
+        self._sum_lateness2 += lateness ** 2
+        self.max_lateness = max(self.max_lateness, lateness)
+
+    @property
+    def mean_period(self):
+        if self.n > 1:
+            return (self._last - self._first) / (self.n - 1)
+        return 0
+
+    @property
+    def mean_lateness(self):
+        if self.n:
+            return self._sum_lateness / self.n
+        return 0
+
+    @property
+    def jitter(self):
+        """
+            standard deviation of the lateness
+        """
+        if self.n > 1:
+            m = self.mean_lateness
+            return math.sqrt(max(0, self._sum_lateness2 / self.n - m ** 2))
+        return 0
+
+    def to_dict(self):
+        return dict(period=self.period,
+                    counts=self.n,
+                    mean_period=self.mean_period,
+                    mean_lateness=self.mean_lateness,
+                    max_lateness=self.max_lateness,
+                    jitter=self.jitter,
+                    overruns=self.overruns,
+                    dropped=self.dropped)
+
+    def __str__(self):
+        return 'counts={counts} period={period:0.3f} mean_period={mean_period:0.4f} ' \
+               'max_lateness={max_lateness:0.4f} jitter={jitter:0.4f} ' \
+               'overruns={overruns} dropped={dropped}'.format(**self.to_dict())
+
+
+class AcquisitionScheduler(object):
+    """
+        run step(i) every period seconds on the calling thread.
+
+        deadlines are start + i*period so timing errors do not accumulate.
+        if a step overruns by more than a period the missed counts are dropped
+        instead of being run back to back.
+
+        step should return False to stop the schedule. setting evt also stops it
+    """
+
+    def __init__(self, period, step):
+        self.period = max(0, period)
+        self.step = step
+        self.stats = TimingStats(self.period)
+
+    def run(self, evt):
+        period = self.period
+        stats = self.stats
+
+        deadline = monotonic()
+        i = 1
+        while not evt.is_set():
+            now = self._sleep_until(deadline, evt)
+            if now is None:
+                break
+
+            stats.record(now, now - deadline)
+            if not self.step(i):
+                break
+
+            i += 1
+            deadline += period
+
+            behind = monotonic() - deadline
+            if period and behind > 0:
+                stats.overruns += 1
+                missed = int(behind / period)
+                if missed:
+                    stats.dropped += missed
+                    deadline += missed * period
+
+        return stats
+
+    def _sleep_until(self, deadline, evt):
+        """
+            return the current time or None if evt was set while sleeping
+        """
+        while 1:
+            if evt.is_set():
+                return
+
+            now = monotonic()
+            dt = deadline - now
+            if dt <= 0:
+                return now
+
+            time.sleep(min(dt, MAX_SLEEP))
+
+#============= EOF =============================================
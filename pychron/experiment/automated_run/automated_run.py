@@ -137,6 +137,8 @@ class AutomatedRun(Loggable):
     _integration_seconds = Float(1.0)
 
     min_ms_pumptime = Int(60)
+    #number of counts between isotope/graph updates
+    notification_rate = Int(1)
     overlap_evt = None
 
     #===============================================================================
@@ -1454,6 +1456,7 @@ anaylsis_type={}
         with self.persister.writer_ctx():
             # with dm.open_file(self.current_data_frame):
             m.measure()
+            self.persister.save_timing_stats(grpname, m.timing_stats)
 
         mem_log('post measure')
         return True
@@ -1747,6 +1750,10 @@ anaylsis_type={}
         if self.spec:
             self.spec.state = self.state
 
+    def _notification_rate_changed(self, new):
+        self.multi_collector.notification_rate = new
+        self.peak_hop_collector.notification_rate = new
+
     def _runner_changed(self, new):
         self.debug('Runner runner:{}'.format(new))
         for s in ['measurement', 'extraction', 'post_equilibration', 'post_measurement']:
@@ -20,8 +20,9 @@ from traits.api import Any, List, CInt, Int, Bool, Enum
 # from pyface.timer.do_later import do_after
 #============= standard library imports ========================
 import time
-from threading import Event, Timer
+from threading import Event
 #============= local library imports  ==========================
+from pychron.experiment.automated_run.acquisition_scheduler import AcquisitionScheduler
 from pychron.loggable import Loggable
 # from pychron.core.ui.gui import invoke_in_main_thread
 from pychron.globals import globalv
@@ -50,6 +51,9 @@ class DataCollector(Loggable):
     fit_series_idx = Int
     #total_counts = CInt
 
+    #number of counts between isotope change notifications
+    notification_rate = Int(1)
+
     canceled = False
 
     _truncate_signal = False
@@ -58,15 +62,18 @@ class DataCollector(Loggable):
     _evt = None
     _warned_no_fit = None
     _warned_no_det = None
+    _nsaved = 0
+
+    #AcquisitionScheduler TimingStats of the last measurement
+    timing_stats = None
 
     collection_kind = Enum(('sniff', 'signal', 'baseline'))
 
     def wait(self):
         st = time.time()
         self.debug('wait started')
-        while 1:
-            if self._evt and self._evt.set():
-                break
+        if self._evt:
+            self._evt.wait()
         self.debug('wait complete {:0.1f}s'.format(time.time() - st))
 
     def set_truncated(self):
@@ -82,6 +89,7 @@ class DataCollector(Loggable):
             return
 
         self._truncate_signal = False
+        self.timing_stats = None
         self._warned_no_fit = []
         self._warned_no_det = []
 
@@ -105,7 +113,16 @@ class DataCollector(Loggable):
 
         self._alive = True
 
-        self._measure(evt)
+        if self.arar_age:
+            self.arar_age.set_online_regression(True)
+
+        try:
+            self._measure(evt)
+            self._flush_data()
+        finally:
+            #back to the full fit with outlier filtering, even if the measurement failed
+            if self.arar_age:
+                self.arar_age.set_online_regression(False)
 
         tt = time.time() - st
         self.debug('estimated time: {:0.3f} actual time: :{:0.3f}'.format(et, tt))
@@ -113,34 +130,21 @@ class DataCollector(Loggable):
     def _measure(self, evt):
         self.debug('starting measurment')
         with consumable(func=self._iter_step) as con:
-            self._iter(con, evt, 1)
-            while not evt.is_set():
-                time.sleep(0.25)
-
-        self.debug('measurement finished')
-
-    def _iter(self, con, evt, i, prev=0):
-        if not self._check_iteration(evt, i):
-            if not self._iter_hook(con, i):
-                evt.set()
-                return
-
-            ot = time.time()
-
-            p = self.period_ms * 0.001
-            p -= prev
-            p = max(0, p)
+            scheduler = AcquisitionScheduler(self.period_ms * 0.001,
+                                             lambda i: self._iter(con, evt, i))
+            self.timing_stats = scheduler.run(evt)
+            evt.set()
 
-            #self.debug('period {} {} {}'.format(p,prev, self.period_ms))
-            t = Timer(p, self._iter, args=(con, evt, i + 1,
-                                           time.time() - ot))
+        self.debug('measurement finished. {}'.format(self.timing_stats))
 
-            t.name = 'iter_{}'.format(i + 1)
-            t.start()
+    def _iter(self, con, evt, i):
+        """
+            one scheduled count. return False to stop the measurement
+        """
+        if self._check_iteration(evt, i):
+            return False
 
-        else:
-            #self.debug('no more iter')
-            evt.set()
+        return bool(self._iter_hook(con, i))
 
     def _iter_hook(self, con, i):
         return True
@@ -159,21 +163,28 @@ class DataCollector(Loggable):
     def _save_data(self, x, keys, signals):
         self.data_writer(self.detectors, x, keys, signals)
 
+        self._nsaved += 1
+        notify = self._nsaved % max(1, self.notification_rate) == 0
+
         #update arar_age
         if self.is_baseline and self.for_peak_hop:
-            self._update_baseline_peak_hop(x, keys, signals)
+            self._update_baseline_peak_hop(x, keys, signals, notify)
         else:
-            self._update_isotopes(x, keys, signals)
+            self._update_isotopes(x, keys, signals, notify)
+
+    def _flush_data(self):
+        if self.arar_age:
+            self.arar_age.flush_data()
 
-    def _update_baseline_peak_hop(self, x, keys, signals):
+    def _update_baseline_peak_hop(self, x, keys, signals, notify=True):
         a = self.arar_age
         for iso in self.arar_age.isotopes.itervalues():
             signal=self._get_signal(keys, signals, iso.detector)
             if signal is not None:
-                if not a.append_data(iso.name, iso.detector, x, signal, 'baseline'):
+                if not a.append_data(iso.name, iso.detector, x, signal, 'baseline', notify=notify):
                     self.debug('baselines - failed appending data for {}. not a current isotope {}'.format(iso, a.isotope_keys))
 
-    def _update_isotopes(self, x, keys, signals):
+    def _update_isotopes(self, x, keys, signals, notify=True):
         a = self.arar_age
 
         kind = self.collection_kind
@@ -184,7 +195,7 @@ class DataCollector(Loggable):
                 iso = dn.isotope
                 signal = self._get_signal(keys, signals, dn.name)
                 if signal is not None:
-                    if not a.append_data(iso, dn.name, x, signal, kind):
+                    if not a.append_data(iso, dn.name, x, signal, kind, notify=notify):
                         self.debug('{} - failed appending data for {}. not a current isotope {}'.format(kind, iso, a.isotope_keys))
 
     def _get_signal(self, keys, signals, det):
@@ -305,6 +316,10 @@ class DataCollector(Loggable):
             return 'break'
 
         if self.check_conditions:
+            if self.termination_conditions or self.truncation_conditions or self.action_conditions:
+                #conditions need the current intercepts
+                self._flush_data()
+
             termination_condition = self._check_conditions(self.termination_conditions, i)
             if termination_condition:
                 self.info('termination condition {}. measurement iteration executed {}/{} counts'.format(
@@ -19,13 +19,13 @@ from traits.api import Instance, Bool, Int, Float, Str, \
     Dict, List, Time, Date, Any, Property
 #============= standard library imports ========================
 import os
-import struct
 import time
 import math
 #============= local library imports  ==========================
 from uncertainties import nominal_value, std_dev
 from pychron.core.codetools.file_log import file_log
 from pychron.core.codetools.memory_usage import mem_log
+from pychron.core.helpers.binpack import pack_signal
 from pychron.core.helpers.datetime_tools import get_datetime
 from pychron.core.ui.preference_binding import bind_preference
 from pychron.database.adapters.local_lab_adapter import LocalLabAdapter
@@ -33,6 +33,7 @@ from pychron.experiment.datahub import Datahub
 from pychron.experiment.automated_run.hop_util import parse_hops
 
 from pychron.loggable import Loggable
+from pychron.managers.data_managers.buffered_writer import H5BufferedWriter
 from pychron.managers.data_managers.h5_data_manager import H5DataManager
 from pychron.paths import paths
 from pychron.processing.export.export_spec import ExportSpec
@@ -41,6 +42,31 @@ from pychron.pychron_constants import NULL_STR
 DEBUG = False
 
 
+class WriterCTX(object):
+    """
+        open the current data file for writing. buffered signal data is flushed
+        before the file is closed, including when an exception is raised.
+
+        contexts can be nested (e.g. baselines during a peak hop)
+    """
+
+    def __init__(self, persister):
+        self._persister = persister
+        self._file_ctx = persister.data_manager.open_file(persister._current_data_frame)
+
+    def __enter__(self):
+        self._persister._writer_depth += 1
+        return self._file_ctx.__enter__()
+
+    def __exit__(self, *args):
+        p = self._persister
+        p._writer_depth -= 1
+        try:
+            p.close_data_writers(release=not p._writer_depth)
+        finally:
+            self._file_ctx.__exit__(*args)
+
+
 class AutomatedRunPersister(Loggable):
     # db = Instance(IsotopeAdapter)
     local_lab_db = Instance(LocalLabAdapter)
@@ -89,7 +115,12 @@ class AutomatedRunPersister(Loggable):
 
     cdd_ic_factor = Any
 
+    data_flush_rows = Int(50)
+    data_flush_interval = Float(5)
+
     _db_extraction_id = None
+    _data_writers = List
+    _writer_depth = 0
 
     def __init__(self, *args, **kw):
         super(AutomatedRunPersister, self).__init__(*args, **kw)
@@ -100,12 +131,41 @@ class AutomatedRunPersister(Loggable):
         bind_preference(self, 'filter_outliers', '{}.filter_outliers'.format(prefid))
         bind_preference(self, 'fo_iterations', '{}.fo_iterations'.format(prefid))
         bind_preference(self, 'fo_std_dev', '{}.fo_std_dev'.format(prefid))
+        bind_preference(self, 'data_flush_rows', '{}.data_flush_rows'.format(prefid))
+        bind_preference(self, 'data_flush_interval', '{}.data_flush_interval'.format(prefid))
 
     def get_last_aliquot(self, identifier):
         return self.datahub.get_greatest_aliquot(identifier)
 
     def writer_ctx(self):
-        return self.data_manager.open_file(self._current_data_frame)
+        return WriterCTX(self)
+
+    def close_data_writers(self, release=True):
+        """
+            flush any buffered signal data. called before the data file is closed.
+
+            release: forget the writers. False if an outer writer_ctx is still open
+        """
+        for writer in self._data_writers:
+            writer.close()
+
+        if release:
+            for writer in self._data_writers:
+                self.debug('data writer closed. rows={} flushes={}'.format(writer.nrows, writer.nflushes))
+            self._data_writers = []
+
+    def save_timing_stats(self, grpname, stats):
+        """
+            store the acquisition TimingStats as attributes of group grpname
+        """
+        if stats is None:
+            return
+
+        self.debug('{} timing {}'.format(grpname, stats))
+        grp = self.data_manager.get_group(grpname)
+        if grp is not None:
+            for k, v in stats.to_dict().iteritems():
+                setattr(grp._v_attrs, 'timing_{}'.format(k), v)
 
     def pre_extraction_save(self):
         d = get_datetime()
@@ -311,7 +371,7 @@ class AutomatedRunPersister(Loggable):
 
         dbiso = db.add_isotope(analysis, iso.name, dbdet, kind=kind)
 
-        data = ''.join([struct.pack('>ff', x, y) for x, y in zip(m.xs, m.ys)])
+        data = pack_signal(m.xs, m.ys)
         db.add_signal(dbiso, data)
 
         add_result = kind in ('baseline', 'signal')
@@ -353,8 +413,7 @@ class AutomatedRunPersister(Loggable):
         dm = self.data_manager
         with dm.open_table(cp, 'peak_center') as tab:
             if tab is not None:
-                packed_xy = [struct.pack('<ff', r['time'], r['value']) for r in tab.iterrows()]
-                points = ''.join(packed_xy)
+                points = pack_signal(tab.col('time'), tab.col('value'), endianness='<')
                 center = tab.attrs.center_dac
                 pc = db.add_peak_center(
                     analysis,
@@ -504,7 +563,8 @@ class AutomatedRunPersister(Loggable):
             self.info('saving monitor info')
 
             for ci in self.monitor.checks:
-                data = ''.join([struct.pack('>ff', x, y) for x, y in ci.data])
+                xs, ys = zip(*ci.data) if ci.data else ((), ())
+                data = pack_signal(xs, ys)
                 params = dict(name=ci.name,
                               parameter=ci.parameter, criterion=ci.criterion,
                               comparator=ci.comparator, tripped=ci.tripped,
@@ -593,28 +653,27 @@ class AutomatedRunPersister(Loggable):
             tab.flush()
 
     def get_data_writer(self, grpname):
+        """
+            return a function that buffers one count of signals for all detectors.
+            rows are written to disk by the H5BufferedWriter every data_flush_rows rows,
+            data_flush_interval seconds and when the writer_ctx exits
+        """
+        writer = H5BufferedWriter(self.data_manager,
+                                  flush_rows=self.data_flush_rows,
+                                  flush_interval=self.data_flush_interval)
+        self._data_writers.append(writer)
+
         def write_data(dets, x, keys, signals):
-            dm = self.data_manager
             for det in dets:
                 k = det.name
-                try:
-                    if k in keys:
-                        if grpname == 'baseline':
-                            grp = '/{}'.format(grpname)
-                        else:
-                            grp = '/{}/{}'.format(grpname, det.isotope)
-                        #self.debug('get table {} /{}/{}'.format(k,grpname, det.isotope))
-                        # self.debug('get table {}/{}'.format(grp,k))
-                        t = dm.get_table(k, grp)
-
-                        nrow = t.row
-                        #                        self.debug('x={}'.format(x))
-                        nrow['time'] = x
-                        nrow['value'] = signals[keys.index(k)]
-                        nrow.append()
-                        t.flush()
-                except AttributeError, e:
-                    self.debug('error: {} group:{} det:{} iso:{}'.format(e, grpname, k, det.isotope))
+                if k in keys:
+                    if grpname == 'baseline':
+                        grp = '/{}'.format(grpname)
+                    else:
+                        grp = '/{}/{}'.format(grpname, det.isotope)
+
+                    if not writer.write(k, grp, x, signals[keys.index(k)]):
+                        self.debug('error: no table group:{} det:{} iso:{}'.format(grpname, k, det.isotope))
 
         return write_data
 
@@ -129,6 +129,7 @@ class ExperimentExecutor(Loggable):
     auto_save_delay = Int(30)
     use_auto_save = Bool(True)
     min_ms_pumptime = Int(30)
+    notification_rate = Int(1)
 
     _alive = Bool(False)
     _canceled = False
@@ -195,6 +196,7 @@ class ExperimentExecutor(Loggable):
         bind_preference(self, 'auto_save_delay',
                         '{}.auto_save_delay'.format(prefid))
         bind_preference(self, 'min_ms_pumptime', '{}.min_ms_pumptime'.format(prefid))
+        bind_preference(self, 'notification_rate', '{}.notification_rate'.format(prefid))
 
         #colors
         color_bind_preference(self, 'signal_color',
@@ -689,6 +691,7 @@ class ExperimentExecutor(Loggable):
 
         arun.integration_time = 1.04
         arun.min_ms_pumptime = self.min_ms_pumptime
+        arun.notification_rate = self.notification_rate
 
         arun.experiment_executor = weakref.ref(self)()
 
@@ -16,7 +16,7 @@
 
 #============= enthought library imports =======================
 from traits.api import Str, Int, \
-    Bool, Password, Color
+    Bool, Password, Color, Float
 from traitsui.api import View, Item, Group, VGroup
 from envisage.ui.tasks.preferences_pane import PreferencesPane
 
@@ -50,6 +50,11 @@ class ExperimentPreferences(BasePreferencesHelper):
 
     min_ms_pumptime = Int
 
+    notification_rate = Int(1)
+
+    data_flush_rows = Int(50)
+    data_flush_interval = Float(5)
+
 
 class UserNotifierPreferences(BasePreferencesHelper):
     preferences_path = 'pychron.experiment'
@@ -113,10 +118,19 @@ class ExperimentPreferencesPane(PreferencesPane):
                            label='Post Fit Filtering')
         overlap_grp = Group(Item('min_ms_pumptime', label='Min. Mass Spectrometer Pumptime (s)'),
                             label='Overlap')
+        update_grp = Group(Item('notification_rate', label='Update Rate (counts)',
+                                tooltip='Update the isotopes and graphs every N counts during a measurement. '
+                                        'Every count is still saved'),
+                           label='Measurement')
+        writer_grp = Group(Item('data_flush_rows', label='Flush Rows',
+                                tooltip='Write buffered signal data to disk every N rows'),
+                           Item('data_flush_interval', label='Flush Interval (s)',
+                                tooltip='Write buffered signal data to disk at least every N seconds'),
+                           label='Data Writer')
 
         return View(color_group, notification_grp,
                     editor_grp, irradiation_grp,
-                    filter_grp, overlap_grp)
+                    filter_grp, overlap_grp, update_grp, writer_grp)
 
 
 class UserNotifierPreferencesPane(PreferencesPane):
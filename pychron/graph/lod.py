@@ -0,0 +1,145 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from threading import Lock
+
+from numpy import empty, arange, hstack, unique, searchsorted, Inf
+#============= local library imports  ==========================
+
+
+def minmax_indices(y, nbins):
+    """
+        indices of the min and max of y in each of nbins equal sized chunks plus the
+        first and last points, sorted
+    """
+    n = len(y)
+    if nbins < 1 or n <= 2 * nbins:
+        return arange(n)
+
+    k = n // nbins
+    m = k * nbins
+    chunks = y[:m].reshape(nbins, k)
+    base = arange(nbins) * k
+    idx = [chunks.argmin(axis=1) + base,
+           chunks.argmax(axis=1) + base,
+           [0, n - 1]]
+    if m < n:
+        rest = y[m:]
+        idx.append([m + rest.argmin(), m + rest.argmax()])
+
+    return unique(hstack(idx))
+
+
+def minmax_decimate(x, y, nbins):
+    """
+        reduce x, y to at most ~2*nbins points keeping the min and max of y in each
+        of nbins equal sized chunks. the first and last points are always kept so
+        the envelope of the line is preserved at any zoom level
+    """
+    if nbins < 1 or len(x) <= 2 * nbins:
+        return x, y
+
+    idx = minmax_indices(y, nbins)
+    return x[idx], y[idx]
+
+
+class RingBuffer(object):
+    """
+        fixed capacity x,y storage. the oldest samples are overwritten once full.
+
+        every sample is written twice, at i and i + capacity, so the retained samples
+        are always a contiguous slice of the underlying arrays and no copy is needed
+        to put them back in order.
+
+        if x is monotonic get_range is a binary search, otherwise a mask is used
+    """
+
+    def __init__(self, capacity=50000, xs=None, ys=None):
+        self.capacity = capacity = max(1, int(capacity))
+        self._xs = empty(2 * capacity)
+        self._ys = empty(2 * capacity)
+        self._head = 0
+        self._n = 0
+        self.monotonic = True
+        self._lock = Lock()
+
+        if xs is not None:
+            for xi, yi in zip(xs, ys):
+                self.append(xi, yi)
+
+    def append(self, x, y):
+        with self._lock:
+            c = self.capacity
+            h = self._head
+            if self._n and x < self._xs[h - 1 + (c if h == 0 else 0)]:
+                self.monotonic = False
+
+            self._xs[h] = self._xs[h + c] = x
+            self._ys[h] = self._ys[h + c] = y
+
+            self._head = (h + 1) % c
+            self._n = min(self._n + 1, c)
+
+    @property
+    def xs(self):
+        return self._view(self._xs)
+
+    @property
+    def ys(self):
+        return self._view(self._ys)
+
+    @property
+    def last(self):
+        """
+            most recent x, y
+        """
+        if self._n:
+            i = self._head - 1 + self.capacity
+            return self._xs[i], self._ys[i]
+
+    def get_range(self, lo=-Inf, hi=Inf, pad=1):
+        """
+            return copies of the x,y samples with lo<=x<=hi plus pad samples on either
+            side so a line drawn through them reaches the edges of the range
+        """
+        with self._lock:
+            xs, ys = self.xs, self.ys
+            if self.monotonic:
+                s = searchsorted(xs, lo, side='left')
+                e = searchsorted(xs, hi, side='right')
+                s = max(0, s - pad)
+                e = min(len(xs), e + pad)
+                return xs[s:e].copy(), ys[s:e].copy()
+            else:
+                m = (xs >= lo) & (xs <= hi)
+                return xs[m], ys[m]
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._n = 0
+            self.monotonic = True
+
+    def _view(self, a):
+        s = (self._head - self._n) % self.capacity
+        return a[s:s + self._n]
+
+    def __len__(self):
+        return self._n
+
+#============= EOF =============================================
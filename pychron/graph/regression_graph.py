@@ -19,8 +19,9 @@ from pychron.core.ui import set_toolkit
 
 set_toolkit('qt4')
 #============= enthought library imports =======================
-from traits.api import List, Any, Event, Callable
+from traits.api import List, Any, Event, Callable, Int
 #============= standard library imports ========================
+from threading import Lock
 from numpy import linspace
 
 #============= local library imports  ==========================
@@ -70,6 +71,10 @@ class RegressionGraph(Graph, RegressionContextMenuMixin):
     use_point_inspector = True
     convert_index_func = Callable
 
+    # number of regressions calculated. total and during the last graph update
+    refit_count = Int
+    last_refit_count = Int
+
     def __init__(self, *args, **kw):
         super(RegressionGraph, self).__init__(*args, **kw)
         self._regression_lock = Lock()
@@ -104,6 +109,7 @@ class RegressionGraph(Graph, RegressionContextMenuMixin):
         plot = self.plots[plotid]
         scatter = plot.plots['data{}'.format(series)][0]
         scatter.filter_outliers_dict['filter_outliers'] = fi
+        scatter.regression_dirty = True
         self.redraw()
 
     def get_filter_outliers(self, fi, plotid=0, series=0):
@@ -126,6 +132,7 @@ class RegressionGraph(Graph, RegressionContextMenuMixin):
                     line.regressor = None
 
                 scatter.fit = fi
+                scatter.regression_dirty = True
                 # print 'set ', scatter, fi
                 scatter.index.metadata['selections'] = []
                 scatter.index.metadata['filtered'] = None
@@ -181,6 +188,7 @@ class RegressionGraph(Graph, RegressionContextMenuMixin):
         #     return
 
         #self.regressors = []
+        n = self.refit_count
         regs = []
         for i, plot in enumerate(self.plots):
             ps = plot.plots
@@ -201,6 +209,7 @@ class RegressionGraph(Graph, RegressionContextMenuMixin):
                 except IndexError:
                     break
 
+        self.last_refit_count = self.refit_count - n
         self.regressors = regs
         self.regression_results = regs
 
@@ -223,6 +232,13 @@ class RegressionGraph(Graph, RegressionContextMenuMixin):
         if line and hasattr(line, 'regressor'):
             r = line.regressor
 
+        if r is not None and not getattr(scatter, 'regression_dirty', True) and \
+                        getattr(scatter, 'fit_key', None) == self._fit_key(scatter, fit, err):
+            # data, fit, filtering and exclusions are unchanged. reuse the last fit
+            if line:
+                self._draw_fit(plot, line, r)
+            return r
+
         if fit in [1, 2, 3]:
             r=self._poly_regress(scatter, r, fit)
 
@@ -234,42 +250,85 @@ class RegressionGraph(Graph, RegressionContextMenuMixin):
         else:
             r=self._mean_regress(scatter, r, fit)
 
+        self.refit_count += 1
+        # the key is taken after the fit because _set_excluded updates the selections
+        scatter.fit_key = self._fit_key(scatter, fit, err)
+        scatter.regression_dirty = False
+
         if r:
             r.error_calc_type=err
 
             if line:
-                plow = plot.index_range.low
-                phigh = plot.index_range.high
-                if hasattr(line, 'regression_bounds') and line.regression_bounds:
-                    low, high, first, last=line.regression_bounds
-                    if first:
-                        low=min(low, plow)
-                    elif last:
-                        high=max(high, phigh)
-                else:
-                    low,high=plow, phigh
-
-                fx = linspace(low, high, 100)
-                fy = r.predict(fx)
                 line.regressor = r
+                self._draw_fit(plot, line, r, force=True)
+
+        return r
+
+    def _draw_fit(self, plot, line, r, force=False):
+        """
+            evaluate r and its error envelope across the plot's index range.
+            skipped if r and the range are unchanged since the last draw
+        """
+        plow = plot.index_range.low
+        phigh = plot.index_range.high
+        if hasattr(line, 'regression_bounds') and line.regression_bounds:
+            low, high, first, last=line.regression_bounds
+            if first:
+                low=min(low, plow)
+            elif last:
+                high=max(high, phigh)
+        else:
+            low,high=plow, phigh
 
-                line.index.set_data(fx)
-                line.value.set_data(fy)
+        key = (id(r), low, high)
+        if not force and getattr(line, 'draw_key', None) == key:
+            return
 
-                if hasattr(line, 'error_envelope'):
-                    ci = r.calculate_error_envelope(fx, fy)
-                    # ci = r.calculate_ci(fx, fy)
-                    #                 print ci
-                    if ci is not None:
-                        ly, uy = ci
-                    else:
-                        ly, uy = fy, fy
+        line.draw_key = key
 
-                    line.error_envelope.lower = ly
-                    line.error_envelope.upper = uy
-                    line.error_envelope.invalidate()
+        fx = linspace(low, high, 100)
+        fy = r.predict(fx)
 
-        return r
+        line.index.set_data(fx)
+        line.value.set_data(fy)
+
+        if hasattr(line, 'error_envelope'):
+            ci = r.calculate_error_envelope(fx, fy)
+            # ci = r.calculate_ci(fx, fy)
+            #                 print ci
+            if ci is not None:
+                ly, uy = ci
+            else:
+                ly, uy = fy, fy
+
+            line.error_envelope.lower = ly
+            line.error_envelope.upper = uy
+            line.error_envelope.invalidate()
+
+    def _fit_key(self, scatter, fit, err):
+        """
+            everything a series' regression depends on
+        """
+        fod = scatter.filter_outliers_dict
+        sel = scatter.index.metadata.get('selections') or []
+        return (self._data_version(scatter), fit, err,
+                sorted(fod.items()) if fod else None,
+                getattr(scatter, 'truncate', None),
+                sorted(sel))
+
+    def _data_version(self, scatter):
+        vs = []
+        for name in ('index', 'value', 'yerror', 'xerror'):
+            ds = getattr(scatter, name, None)
+            if ds is not None:
+                if not hasattr(ds, 'data_version'):
+                    ds.data_version = 0
+                    ds.on_trait_change(self._increment_data_version, 'data_changed')
+                vs.append((id(ds), ds.data_version))
+        return vs
+
+    def _increment_data_version(self, obj, name, old, new):
+        obj.data_version += 1
 
     def _set_regressor(self, scatter, r):
 
@@ -397,6 +456,8 @@ class RegressionGraph(Graph, RegressionContextMenuMixin):
         scatter.truncate=truncate
         scatter.index.on_trait_change(self.update_metadata, 'metadata_changed')
         scatter.no_regression=False
+        scatter.regression_dirty = True
+        scatter.fit_key = None
 
         return scatter, si
 
@@ -20,18 +20,32 @@
 from pyface.timer.api import do_after as do_after_timer
 
 #=============standard library imports ========================
-from numpy import hstack, Inf
+import time
+from numpy import Inf
 #=============local library imports  ==========================
 # from pychron.graph.editors.stream_plot_editor import StreamPlotEditor
 from pychron.core.helpers.datetime_tools import current_time_generator as time_generator
+from pychron.graph.lod import RingBuffer, minmax_decimate
 from stacked_graph import StackedGraph
 from graph import Graph
 
 MAX_LIMIT = int(-1 * 60 * 60 * 24)
 
+# number of samples retained per series
+HISTORY = 50000
+
+# plot width used for decimation before the plot has been laid out
+DEFAULT_WIDTH = 1000
+
 
 class StreamGraph(Graph):
     """
+        recorded samples are kept in a RingBuffer per series. only the samples in the
+        visible index range are pushed to the plot, min/max decimated to the plot's
+        pixel width. changing the index range (zooming, panning) re-queries the buffer.
+
+        pushes are throttled to one every redraw_interval seconds per series so
+        the cost of recording is independent of the history length
     """
     # plot_editor_klass = StreamPlotEditor
     global_time_generator = None
@@ -56,6 +70,7 @@ class StreamGraph(Graph):
 
     force_track_x_flag = None
 
+    redraw_interval = 0.25
 
     def clear(self):
         self.scan_delays = []
@@ -69,16 +84,24 @@ class StreamGraph(Graph):
         self.track_y_min = []
         self.force_track_x_flag = False
 
+        self.histories = []
+        self._buffers = {}
+        self._last_push = {}
+        self._pending_flush = set()
+        self._suppress_requery = False
+
         super(StreamGraph, self).clear()
 
     def new_plot(self, **kw):
         '''
+            history: number of samples retained per series
         '''
         sd = kw['scan_delay'] if 'scan_delay' in kw else 0.5
         dl = kw['data_limit'] if 'data_limit' in kw else 500
 
         self.scan_delays.append(sd)
         self.data_limits.append(dl)
+        self.histories.append(kw.pop('history', HISTORY))
         self.cur_min.append(Inf)
         self.cur_max.append(-Inf)
 
@@ -90,10 +113,31 @@ class StreamGraph(Graph):
 
         args = super(StreamGraph, self).new_plot(**kw)
 
-        self.set_x_limits(min_=0, max_=dl * sd + 1, plotid=len(self.plots) - 1)
+        plotid = len(self.plots) - 1
+        self.set_x_limits(min_=0, max_=dl * sd + 1, plotid=plotid)
 
+        self.plots[plotid].index_range.on_trait_change(lambda: self._index_range_changed(plotid),
+                                                       'updated')
         return args
 
+    def get_data(self, plotid=0, series=0, axis=0):
+        '''
+            return the recorded (not decimated) data
+        '''
+        buf = self._buffers.get((plotid, series))
+        if buf is None:
+            return super(StreamGraph, self).get_data(plotid, series, axis)
+
+        return (buf.xs if axis == 0 else buf.ys).copy()
+
+    def flush(self, plotid=None):
+        '''
+            push all recorded data to the plots now
+        '''
+        for pid, series in self._buffers.keys():
+            if plotid is None or pid == plotid:
+                self._push(pid, series)
+
     def update_y_limits(self, plotid=0, **kw):
         ma = -1
         mi = 1e10
@@ -153,24 +197,21 @@ class StreamGraph(Graph):
         if track_x:
             dl = self.data_limits[plotid]
             mi = max(1, x - dl * self.scan_delays[plotid])
-            self.set_x_limits(# max=x,
-                              min_=mi,
-                              plotid=plotid,
-                              #                          pad=1
-            )
+            self._suppress_requery = True
+            try:
+                self.set_x_limits(# max=x,
+                                  min_=mi,
+                                  plotid=plotid,
+                                  #                          pad=1
+                )
+            finally:
+                self._suppress_requery = False
         return x
 
     def record(self, y, x=None, series=0, plotid=0,
                track_x=True, track_y=True, do_after=None, track_y_pad=5,
                aux=False, pad=0.1, **kw):
 
-        xn, yn = self.series[plotid][series]
-
-        plot = self.plots[plotid]
-
-        xd = plot.data.get_data(xn)
-        yd = plot.data.get_data(yn)
-
         if x is None:
             try:
                 tg = self.time_generators[plotid]
@@ -183,30 +224,26 @@ class StreamGraph(Graph):
             nx = x
 
         ny = float(y)
-        # update raw data
-        #        rx = self.raw_x[plotid][series]
-        #        ry = self.raw_y[plotid][series]
-        #
-        #        self.raw_x[plotid][series] = hstack((rx[MAX_LIMIT:], [nx]))
-        #        self.raw_y[plotid][series] = hstack((ry[MAX_LIMIT:], [ny]))
 
         dl = self.data_limits[plotid]
         sd = self.scan_delays[plotid]
         pad = dl * pad
-        #        lim = MAX_LIMIT
-        #         pad = 100
-        #        print lim, nx, ny
-        lim = -dl * sd - 1000
-        new_xd = hstack((xd[lim:], [nx]))
-        new_yd = hstack((yd[lim:], [ny]))
-        #        print new_xd
-        self.cur_max[plotid] = max(self.cur_max[plotid], max(new_yd))
-        self.cur_min[plotid] = min(self.cur_min[plotid], min(new_yd))
+
+        ys = [ny]
+        if not aux:
+            buf = self._get_buffer(plotid, series)
+            buf.append(nx, ny)
+            if self.cur_max[plotid] == -Inf or self.cur_min[plotid] == Inf:
+                # y limits were reset. use the samples in the tracking window
+                _, ys = buf.get_range(nx - dl * sd, nx, pad=0)
+
+        self.cur_max[plotid] = max(self.cur_max[plotid], max(ys))
+        self.cur_min[plotid] = min(self.cur_min[plotid], min(ys))
 
         def _record_():
             if track_x and (self.track_x_min or self.track_x_max) \
                 or self.force_track_x_flag:
-                ma = new_xd[-1]
+                ma = nx
                 sd = self.scan_delays[plotid]
                 mi = ma - dl * sd + pad
                 if self.force_track_x_flag or \
@@ -226,12 +263,17 @@ class StreamGraph(Graph):
                     else:
                         mi = max(1, mi)
 
-                    self.set_x_limits(max_=ma,
-                                      min_=mi,
-                                      plotid=plotid,
-                                      #                              force=False
-                                      #                              pad=10 * self.scan_delays[plotid]
-                    )
+                    # the data is pushed below. don't re-query on this limit change
+                    self._suppress_requery = True
+                    try:
+                        self.set_x_limits(max_=ma,
+                                          min_=mi,
+                                          plotid=plotid,
+                                          #                              force=False
+                                          #                              pad=10 * self.scan_delays[plotid]
+                        )
+                    finally:
+                        self._suppress_requery = False
 
             if track_y and (self.track_y_min[plotid] or self.track_y_max[plotid]):
                 if isinstance(track_y, tuple):
@@ -262,8 +304,7 @@ class StreamGraph(Graph):
             if aux:
                 self.add_datum_to_aux_plot((nx, ny), plotid, series)
             else:
-                plot.data.set_data(xn, new_xd)
-                plot.data.set_data(yn, new_yd)
+                self._throttled_push(plotid, series)
             #            self.redraw()
 
         if do_after:
@@ -273,6 +314,92 @@ class StreamGraph(Graph):
 
         return nx
 
+    def clear_plots(self):
+        self._buffers = {}
+        self._last_push = {}
+        self._pending_flush = set()
+        super(StreamGraph, self).clear_plots()
+
+    def clear_data(self, plotid=None, **kw):
+        series = kw.get('series')
+        for (pid, si), buf in self._buffers.items():
+            if (plotid is None or pid == plotid) and (series is None or si == series):
+                buf.clear()
+
+        super(StreamGraph, self).clear_data(plotid=plotid, **kw)
+
+    #===============================================================================
+    # private
+    #===============================================================================
+    def _get_buffer(self, plotid, series):
+        key = (plotid, series)
+        try:
+            buf = self._buffers[key]
+        except KeyError:
+            xn, yn = self.series[plotid][series]
+            data = self.plots[plotid].data
+            buf = RingBuffer(self.histories[plotid],
+                             xs=data.get_data(xn), ys=data.get_data(yn))
+            self._buffers[key] = buf
+        return buf
+
+    def _throttled_push(self, plotid, series):
+        key = (plotid, series)
+        dt = time.time() - self._last_push.get(key, 0)
+        if dt >= self.redraw_interval:
+            self._push(plotid, series)
+        elif key not in self._pending_flush:
+            # make sure the last samples are drawn even if recording stops
+            self._pending_flush.add(key)
+            delay = int((self.redraw_interval - dt) * 1000) + 1
+            do_after_timer(delay, self._flush_pending, plotid, series)
+
+    def _flush_pending(self, plotid, series):
+        self._pending_flush.discard((plotid, series))
+        self._push(plotid, series)
+
+    def _push(self, plotid, series):
+        '''
+            set the plot data to the decimated samples in the visible index range
+        '''
+        key = (plotid, series)
+        buf = self._buffers.get(key)
+        if buf is None or plotid >= len(self.plots):
+            return
+
+        plot = self.plots[plotid]
+        lo, hi = self._visible_range(plot)
+        xs, ys = buf.get_range(lo, hi)
+        xs, ys = minmax_decimate(xs, ys, int(plot.width) or DEFAULT_WIDTH)
+
+        xn, yn = self.series[plotid][series]
+        self._last_push[key] = time.time()
+
+        # with auto ranges setting the data fires index_range.updated
+        self._suppress_requery = True
+        try:
+            plot.data.set_data(xn, xs)
+            plot.data.set_data(yn, ys)
+        finally:
+            self._suppress_requery = False
+
+    def _visible_range(self, plot):
+        r = plot.index_range
+        lo = -Inf if r.low_setting == 'auto' else r.low
+        hi = Inf if r.high_setting in ('auto', 'track') else r.high
+        return lo, hi
+
+    def _index_range_changed(self, plotid):
+        '''
+            zoomed or panned. re-query the visible samples
+        '''
+        if self._suppress_requery:
+            return
+
+        for pid, series in self._buffers.keys():
+            if pid == plotid:
+                self._push(pid, series)
+
 
 class StreamStackedGraph(StreamGraph, StackedGraph):
     pass
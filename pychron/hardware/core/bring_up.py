@@ -0,0 +1,270 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import sys
+import time
+from Queue import Queue, Empty
+from threading import Thread, Event, Lock
+#============= local library imports  ==========================
+from pychron.core.helpers.dialog_router import set_dialog_handler
+
+WAITING = 'waiting'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+BLOCKED = 'blocked'
+
+
+class BringUpTask(object):
+    """
+        a named sequence of stages, e.g. [('open', func), ('initialize', func)].
+
+        depends: names of tasks that have to finish (or time out) before this task starts
+        group: tasks with the same group, e.g. a shared serial port, never run at the same time
+            and are started in the order given
+        timeout: seconds the task may run before it is given up on
+    """
+
+    def __init__(self, name, stages, depends=None, group=None, timeout=None):
+        self.name = name
+        self.stages = stages
+        self.depends = depends or []
+        self.group = group
+        self.timeout = timeout
+
+        self.state = WAITING
+        self.results = {}
+        self.timings = []
+        self.exc_info = None
+        self.started = None
+        self.finished = None
+
+        # seconds spent waiting for the user. not counted against the timeout
+        self.dialog_time = 0
+        self.in_dialog = False
+        self._lock = Lock()
+
+    @property
+    def duration(self):
+        if self.started is not None and self.finished is not None:
+            return self.finished - self.started
+
+
+class ProgressProxy(object):
+    """
+        stands in for a progress dialog in worker threads. calls are queued and replayed
+        on the dialog by the thread running run_tasks
+    """
+
+    def __init__(self, queue):
+        self._queue = queue
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+
+        def func(*args, **kw):
+            self._queue.put(('progress', None, (attr, args, kw)))
+
+        return func
+
+
+def run_tasks(tasks, nthreads=4, report=None, progress=None, poll=0.1, on_late=None):
+    """
+        run tasks concurrently on at most nthreads threads. blocks until every task has
+        finished, failed, timed out or is blocked by a dependency cycle or a hung group member.
+
+        each stage is called as func(progress) where progress is a ProgressProxy
+        for progress, or None. a stage raising an exception fails the task.
+
+        report(task, msg), the progress calls and any dialogs opened by a stage
+        (see pychron.core.helpers.dialog_router) are run in the calling thread.
+        time spent in a dialog doesn't count against the task's timeout.
+
+        a timed out task's thread is left running, its group stays busy until it returns.
+        on_late(task) is called from the task's thread when it finally returns. dialogs requested
+        by a task after run_tasks has returned are not opened, they return None
+    """
+    if report is None:
+        report = lambda t, m: None
+
+    queue = Queue()
+    proxy = ProgressProxy(queue) if progress is not None else None
+    names = set(t.name for t in tasks)
+
+    pending = list(tasks)
+    running = []
+    settled = set()
+    busy = set()
+
+    state = {'alive': True}
+    state_lock = Lock()
+
+    def dialog_handler(task):
+        def handler(func, args, kw):
+            box = [None, None, Event()]
+            with state_lock:
+                if not state['alive']:
+                    return
+                task.in_dialog = True
+                queue.put(('dialog', task, (func, args, kw, box)))
+
+            st = time.time()
+            box[2].wait()
+            task.dialog_time += time.time() - st
+            task.in_dialog = False
+
+            if box[1]:
+                raise box[1][0], box[1][1], box[1][2]
+            return box[0]
+
+        return handler
+
+    def worker(task):
+        set_dialog_handler(dialog_handler(task))
+        for stage, func in task.stages:
+            st = time.time()
+            queue.put(('stage', task, '{} {}'.format(stage, task.name)))
+            try:
+                task.results[stage] = func(proxy)
+            except Exception:
+                task.exc_info = sys.exc_info()
+            task.timings.append((stage, st, time.time() - st))
+            if task.exc_info:
+                break
+
+        with task._lock:
+            task.finished = time.time()
+            late = task.state == TIMEOUT
+
+        queue.put(('done', task, None))
+        if late and on_late is not None:
+            on_late(task)
+
+    def startable(task, seen):
+        if task.group is not None and (task.group in busy or task.group in seen):
+            return False
+        return all(d in settled or d not in names for d in task.depends)
+
+    def answer_dialog(msg):
+        func, args, kw, box = msg
+        try:
+            box[0] = func(*args, **kw)
+        except BaseException:
+            box[1] = sys.exc_info()
+        finally:
+            box[2].set()
+
+    while 1:
+        seen = set()
+        for task in list(pending):
+            if len(running) >= nthreads:
+                break
+
+            if startable(task, seen):
+                pending.remove(task)
+                running.append(task)
+                if task.group is not None:
+                    busy.add(task.group)
+
+                task.state = RUNNING
+                task.started = time.time()
+                t = Thread(target=worker, args=(task,), name='BringUp-{}'.format(task.name))
+                t.setDaemon(True)
+                t.start()
+            elif task.group is not None:
+                seen.add(task.group)
+
+        if not running:
+            break
+
+        try:
+            kind, task, msg = queue.get(timeout=poll)
+        except Empty:
+            kind = None
+
+        if kind == 'progress':
+            attr, args, kw = msg
+            getattr(progress, attr)(*args, **kw)
+        elif kind == 'dialog':
+            answer_dialog(msg)
+        elif kind == 'stage':
+            report(task, msg)
+        elif kind == 'done':
+            if task.group is not None:
+                busy.discard(task.group)
+
+            if task.state == TIMEOUT:
+                report(task, '{} finished after its deadline'.format(task.name))
+            else:
+                running.remove(task)
+                settled.add(task.name)
+                task.state = FAILED if task.exc_info else DONE
+
+        now = time.time()
+        for task in list(running):
+            if task.in_dialog or not task.timeout:
+                continue
+
+            with task._lock:
+                if task.finished is None and now - task.started - task.dialog_time > task.timeout:
+                    task.state = TIMEOUT
+
+            if task.state == TIMEOUT:
+                report(task, '{} did not finish within {}s'.format(task.name, task.timeout))
+                running.remove(task)
+                settled.add(task.name)
+
+    with state_lock:
+        state['alive'] = False
+
+    # answer dialogs requested while exiting
+    while 1:
+        try:
+            kind, task, msg = queue.get_nowait()
+        except Empty:
+            break
+        if kind == 'dialog':
+            msg[3][2].set()
+
+    for task in pending:
+        task.state = BLOCKED
+        report(task, '{} blocked'.format(task.name))
+
+    return tasks
+
+
+def format_timeline(tasks, t0=None):
+    """
+        one line per task with the start/end of each stage relative to t0
+    """
+    starts = [t.started for t in tasks if t.started is not None]
+    if t0 is None:
+        t0 = min(starts) if starts else 0
+
+    lines = []
+    for task in tasks:
+        ss = ' '.join('{} {:0.2f}-{:0.2f}s'.format(stage, st - t0, st - t0 + dur)
+                      for stage, st, dur in task.timings)
+        if task.state == TIMEOUT:
+            ss = '{} gave up after {}s'.format(ss, task.timeout)
+        lines.append('{:<25s} {:<8s} {}'.format(task.name, task.state, ss))
+    return lines
+
+#============= EOF =============================================
@@ -25,6 +25,7 @@ from threading import Lock
 
 #============= local library imports  ==========================
 from pychron.config_loadable import ConfigLoadable
+from pychron.hardware.core.communicators.scheduler import PRIORITY_MEASUREMENT
 
 
 class Communicator(ConfigLoadable):
@@ -37,6 +38,8 @@ class Communicator(ConfigLoadable):
     write_terminator = chr(13)  # '\r'
     handle = None
     scheduler = None
+    # priority of the device's requests on the scheduler. set by the device with the scheduler
+    scheduler_priority = PRIORITY_MEASUREMENT
     def __init__(self, *args, **kw):
         '''
         '''
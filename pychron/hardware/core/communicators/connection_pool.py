@@ -0,0 +1,354 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import bisect
+import select
+import socket
+import time
+from contextlib import contextmanager
+from threading import Lock, Semaphore
+#============= local library imports  ==========================
+
+# upper edges of the latency histogram bins in seconds
+LATENCY_BINS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05,
+                0.1, 0.2, 0.5, 1, 2, 5)
+
+
+class LatencyHistogram(object):
+    """
+        round trip times of a device's queries
+    """
+
+    def __init__(self, name, bins=LATENCY_BINS):
+        self.name = name
+        self.bins = bins
+        self.counts = [0] * (len(bins) + 1)
+        self.n = 0
+        self.failures = 0
+        self.total = 0
+        self.max = 0
+        self._lock = Lock()
+
+    def record(self, dt):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bins, dt)] += 1
+            self.n += 1
+            self.total += dt
+            self.max = max(self.max, dt)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    @property
+    def mean(self):
+        if self.n:
+            return self.total / self.n
+        return 0
+
+    def percentile(self, p):
+        """
+            upper edge of the bin containing the p'th percentile
+        """
+        if not self.n:
+            return 0
+
+        target = self.n * p / 100.
+        c = 0
+        for edge, ci in zip(self.bins, self.counts):
+            c += ci
+            if c >= target:
+                return edge
+        return self.max
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.bins) + 1)
+            self.n = self.failures = 0
+            self.total = self.max = 0
+
+    def to_dict(self):
+        return dict(name=self.name, n=self.n, failures=self.failures,
+                    mean=self.mean, max=self.max,
+                    p50=self.percentile(50), p95=self.percentile(95))
+
+    def __str__(self):
+        return '{name:<30s} n={n:<7d} failures={failures:<4d} mean={mean:0.4f} ' \
+               'p50<={p50:0.4f} p95<={p95:0.4f} max={max:0.4f}'.format(**self.to_dict())
+
+
+_histograms = {}
+_histograms_lock = Lock()
+
+
+def get_latency_histogram(name):
+    with _histograms_lock:
+        try:
+            h = _histograms[name]
+        except KeyError:
+            h = _histograms[name] = LatencyHistogram(name)
+        return h
+
+
+def latency_report():
+    """
+        latency histograms of all devices, slowest first
+    """
+    with _histograms_lock:
+        hs = _histograms.values()
+
+    return sorted(hs, key=lambda h: (h.percentile(95), h.mean), reverse=True)
+
+
+class PooledConnection(object):
+    """
+        a persistent tcp connection.
+
+        if terminator is None a response is whatever a single recv returns, otherwise
+        data is read until terminator is seen. any error marks the connection as broken
+    """
+    datasize = 2 ** 12
+
+    def __init__(self, address, timeout=1.0, terminator=None):
+        self.address = address
+        self.timeout = timeout
+        self.terminator = terminator
+
+        self.broken = False
+        self._buf = ''
+
+        sock = socket.create_connection(address, timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+
+    def send(self, p):
+        try:
+            self.sock.sendall(p)
+            return True
+        except socket.error:
+            self.broken = True
+
+    def recv(self):
+        try:
+            if self.terminator is None:
+                r = self._buf or self.sock.recv(self.datasize)
+                self._buf = ''
+            else:
+                r = self._recv_terminated()
+
+            if not r:
+                # connection closed by the device
+                self.broken = True
+                r = None
+
+            return r
+        except socket.error:
+            self.broken = True
+
+    def ask(self, p):
+        if self.send(p):
+            return self.recv()
+
+    def ask_many(self, ps):
+        """
+            pipeline ps. send all requests then read the responses in order.
+            requires a terminator to split the responses
+        """
+        if self.send(''.join(ps)):
+            return [self.recv() for _ in ps]
+        return [None] * len(ps)
+
+    def is_healthy(self):
+        """
+            return False if the device closed the connection. unsolicited data
+            left over from a previous exchange is discarded so it is never taken
+            as the response to the next request
+        """
+        if self.broken:
+            return False
+
+        try:
+            r, _, _ = select.select([self.sock], [], [], 0)
+            while r:
+                data = self.sock.recv(self.datasize)
+                if not data:
+                    return False
+                r, _, _ = select.select([self.sock], [], [], 0)
+        except (socket.error, select.error, ValueError):
+            return False
+
+        self._buf = ''
+        return True
+
+    def close(self):
+        try:
+            self.sock.close()
+        except socket.error:
+            pass
+
+    def _recv_terminated(self):
+        t = self.terminator
+        buf = self._buf
+        while t not in buf:
+            data = self.sock.recv(self.datasize)
+            if not data:
+                self._buf = ''
+                return
+
+            buf += data
+
+        idx = buf.index(t) + len(t)
+        self._buf = buf[idx:]
+        return buf[:idx]
+
+
+class ConnectionPool(object):
+    """
+        keep-alive tcp connections to one host/port.
+
+        at most size connections are open at once, i.e. size requests can be in flight
+        at the same time. idle connections are health checked and drained before reuse.
+
+        connections are only kept alive if there is a terminator. without one the end of
+        a response can't be found, the rest of a fragmented response would be
+        read as the next response, so the connection is closed after each exchange.
+
+        failed connection attempts back off exponentially up to max_backoff seconds.
+        while backing off connection() yields None without trying to connect
+    """
+
+    def __init__(self, host, port, size=1, timeout=1.0, terminator=None,
+                 backoff=0.5, max_backoff=30.0):
+        self.address = (host, port)
+        self.size = size
+        self.timeout = timeout
+        self.terminator = terminator
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.nconnects = 0
+        self.nreused = 0
+
+        self._idle = []
+        self._lock = Lock()
+        self._slots = Semaphore(size)
+
+        self._nfailures = 0
+        self._next_attempt = 0
+
+    @contextmanager
+    def connection(self):
+        """
+            yield a PooledConnection or None if a connection could not be made.
+            broken connections are closed instead of returned to the pool
+        """
+        self._slots.acquire()
+        conn = None
+        try:
+            conn = self._get()
+            yield conn
+        finally:
+            if conn is not None:
+                self._put(conn)
+            self._slots.release()
+
+    @property
+    def backing_off(self):
+        return time.time() < self._next_attempt
+
+    def close(self):
+        """
+            close the idle connections
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for c in idle:
+            c.close()
+
+    def _get(self):
+        while 1:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn = self._idle.pop()
+
+            if conn.is_healthy():
+                self.nreused += 1
+                return conn
+
+            conn.close()
+
+        return self._connect()
+
+    def _put(self, conn):
+        if conn.broken or self.terminator is None:
+            conn.close()
+        else:
+            with self._lock:
+                self._idle.append(conn)
+
+    def _connect(self):
+        with self._lock:
+            if self.backing_off:
+                return
+
+        try:
+            conn = PooledConnection(self.address, self.timeout, self.terminator)
+        except socket.error:
+            with self._lock:
+                self._nfailures += 1
+                delay = min(self.max_backoff, self.backoff * 2 ** (self._nfailures - 1))
+                self._next_attempt = time.time() + delay
+            return
+
+        with self._lock:
+            self._nfailures = 0
+            self._next_attempt = 0
+            self.nconnects += 1
+        return conn
+
+
+_pools = {}
+_pools_lock = Lock()
+
+
+def get_pool(host, port, **kw):
+    """
+        return the shared ConnectionPool for host, port and settings kw.
+        devices that use the same address with different settings, e.g. terminator,
+        get separate pools
+    """
+    key = (host, port, tuple(sorted(kw.items())))
+    with _pools_lock:
+        try:
+            p = _pools[key]
+        except KeyError:
+            p = _pools[key] = ConnectionPool(host, port, **kw)
+        return p
+
+
+def close_pools():
+    with _pools_lock:
+        pools = _pools.values()
+        _pools.clear()
+
+    for p in pools:
+        p.close()
+
+#============= EOF =============================================
@@ -19,8 +19,10 @@
 #============= enthought library imports =======================
 #============= standard library imports ========================
 import socket
+import time
 #============= local library imports  ==========================
 from communicator import Communicator
+from connection_pool import get_pool, get_latency_histogram
 from pychron.loggable import Loggable
 
 
@@ -44,15 +46,35 @@ class Handler(Loggable):
 
 
 class TCPHandler(Handler):
+    """
+        borrows a persistent connection from a ConnectionPool for one exchange.
+        end() returns the connection to the pool
+    """
+    conn = None
+
+    def __init__(self, pool, *args, **kw):
+        super(TCPHandler, self).__init__(*args, **kw)
+        self._pool = pool
+        self._ctx = None
 
     def get_packet(self, cmd):
-        pass
+        if self.conn is not None:
+            return self.conn.recv()
 
     def send_packet(self, p):
-        pass
+        if self.conn is None:
+            self._ctx = self._pool.connection()
+            self.conn = self._ctx.__enter__()
+            if self.conn is None:
+                self.end()
+                return False
+
+        return self.conn.send(p)
 
     def end(self):
-        self.sock.close()
+        if self._ctx is not None:
+            ctx, self._ctx, self.conn = self._ctx, None, None
+            ctx.__exit__(None, None, None)
 
 
 class UDPHandler(Handler):
@@ -98,6 +120,18 @@ class EthernetCommunicator(Communicator):
     port = None
     handler = None
     kind = 'UDP'
+
+    # tcp options
+    read_terminator = None
+    # number of simultaneous requests. only increase if the device handles concurrent connections
+    pool_size = 1
+    timeout = 1.0
+    # send several commands before reading the responses. the device must accept this
+    pipeline = False
+
+    _pool = None
+    _latency = None
+
     def load(self, config, path):
         '''
         '''
@@ -110,12 +144,48 @@ class EthernetCommunicator(Communicator):
         if self.kind is None:
             self.kind = 'UDP'
 
+        self.set_attribute(config, 'read_terminator', 'Communications', 'terminator',
+                           optional=True, default=None)
+        self.set_attribute(config, 'pool_size', 'Communications', 'pool_size',
+                           cast='int', optional=True)
+        self.set_attribute(config, 'timeout', 'Communications', 'timeout',
+                           cast='float', optional=True)
+        self.set_attribute(config, 'pipeline', 'Communications', 'pipeline',
+                           cast='boolean', optional=True)
+
         return True
 
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = get_pool(self.host, self.port,
+                                  size=self.pool_size,
+                                  timeout=self.timeout,
+                                  terminator=self.read_terminator)
+        return self._pool
+
+    @property
+    def latency(self):
+        """
+            LatencyHistogram of this device's asks
+        """
+        if self._latency is None:
+            self._latency = get_latency_histogram(self.name or '{}:{}'.format(self.host, self.port))
+        return self._latency
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+
     def open(self, *args, **kw):
 
         self.simulation = False
 
+        if self._is_tcp():
+            with self.pool.connection() as conn:
+                self.simulation = conn is None
+            return not self.simulation
+
         handler = self.get_handler()
         # send a test command so see if wer have connection
         cmd = '***'
@@ -136,7 +206,7 @@ class EthernetCommunicator(Communicator):
             else:
                 h = self.handler
         else:
-            h = TCPHandler()
+            return TCPHandler(self.pool)
 
         self.handler = h
         return h
@@ -158,6 +228,10 @@ class EthernetCommunicator(Communicator):
                 self.info('no handle    {}'.format(cmd.strip()))
             return
 
+        if self._is_tcp():
+            return self._tcp_ask(cmd, retries, verbose, info)
+
+        st = time.time()
         r = None
         with self._lock:
 #            self._lock.acquire()
@@ -177,6 +251,9 @@ class EthernetCommunicator(Communicator):
 
         if r is not None:
             re = self.process_response(r)
+            self.latency.record(time.time() - st)
+        else:
+            self.latency.record_failure()
 
         handler.end()
         if verbose:
@@ -184,7 +261,55 @@ class EthernetCommunicator(Communicator):
 
         return re
 
+    def ask_many(self, cmds, retries=3, verbose=True, info=None):
+        """
+            ask a sequence of commands. if pipeline is enabled all commands are
+            sent on one connection before the responses are read
+        """
+        if self.simulation or not (self._is_tcp() and self.pipeline and self.read_terminator):
+            return [self.ask(cmd, retries=retries, verbose=verbose, info=info) for cmd in cmds]
+
+        rs = None
+        st = time.time()
+        for _ in range(retries):
+            with self.pool.connection() as conn:
+                if conn is None:
+                    break
+
+                rs = conn.ask_many(cmds)
+                if None not in rs:
+                    break
+
+        res = []
+        if rs is None or None in rs:
+            self.latency.record_failure()
+            rs = [None] * len(cmds)
+        else:
+            # per command latency
+            dt = (time.time() - st) / len(cmds)
+            for _ in cmds:
+                self.latency.record(dt)
+
+        for cmd, r in zip(cmds, rs):
+            re = 'ERROR: Connection refused {}:{}'.format(self.host, self.port)
+            if r is not None:
+                re = self.process_response(r)
+            if verbose:
+                self.log_response(cmd, re, info)
+            res.append(re)
+
+        return res
+
     def tell(self, cmd, verbose=True, info=None):
+        if self._is_tcp():
+            with self.pool.connection() as conn:
+                if conn is not None and conn.send(cmd):
+                    # discard the reply so it is not read as the response to the next ask
+                    conn.recv()
+                    if verbose:
+                        self.log_tell(cmd, info)
+            return
+
         self._lock.acquire()
         handler = self.get_handler()
 
@@ -193,4 +318,38 @@ class EthernetCommunicator(Communicator):
                 self.log_tell(cmd, info)
         self._lock.release()
 
+    def _is_tcp(self):
+        return self.kind.lower() == 'tcp'
+
+    def _tcp_ask(self, cmd, retries, verbose, info):
+        """
+            tcp asks do not share the communicator lock. each ask borrows its own
+            connection from the pool so at most pool_size asks run at once
+        """
+        re = 'ERROR: Connection refused {}:{}'.format(self.host, self.port)
+
+        r = None
+        st = time.time()
+        for _ in range(retries):
+            handler = self.get_handler()
+            try:
+                if handler.send_packet(cmd):
+                    r = handler.get_packet(cmd)
+            finally:
+                handler.end()
+
+            if r is not None or self.pool.backing_off:
+                break
+
+        if r is not None:
+            re = self.process_response(r)
+            self.latency.record(time.time() - st)
+        else:
+            self.latency.record_failure()
+
+        if verbose:
+            self.log_response(cmd, re, info)
+
+        return re
+
 #============= EOF ====================================
@@ -22,9 +22,13 @@ import struct
 import binascii
 #=============local library imports  =========================
 from serial_communicator import SerialCommunicator
+from scheduler import PRIORITY_INTERLOCK
 from pychron.hardware.core.checksum_helper import computeCRC
 
 
+READ_FUNC_CODES = ('01', '02', '03', '04')
+
+
 class CRCError(BaseException):
     _cmd = ''
 
@@ -97,9 +101,14 @@ class ModbusCommunicator(SerialCommunicator):
         kw['is_hex'] = True
 
         if self.scheduler is not None:
+            # reads can share a bus transaction and have the device's priority.
+            # writes actuate the device and go first
+            is_read = args[0] in READ_FUNC_CODES
             resp = self.scheduler.schedule(self.ask, args=(cmd,),
-                                           kwargs=kw
-            )
+                                           kwargs=kw,
+                                           priority=self.scheduler_priority if is_read else PRIORITY_INTERLOCK,
+                                           coalesce=is_read,
+                                           device=self.name)
         else:
             resp = self.ask(cmd, **kw)
 
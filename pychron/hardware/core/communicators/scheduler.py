@@ -18,92 +18,194 @@
 from traits.api import Float
 
 #============= standard library imports ========================
-from threading import Lock
+import heapq
+import sys
+import time
+from itertools import count
+from threading import Condition, Event, Thread, current_thread
 
 #============= local library imports  ==========================
 from pychron.loggable import Loggable
 
-# SINGLE_ITEM_BUF = True
-# SINGLE_ITEM_BUF=False
+# priority classes. lower values are serviced first
+PRIORITY_INTERLOCK = 0
+PRIORITY_MEASUREMENT = 1
+PRIORITY_STATUS = 2
+
+PRIORITIES = {'interlock': PRIORITY_INTERLOCK,
+              'actuation': PRIORITY_INTERLOCK,
+              'measurement': PRIORITY_MEASUREMENT,
+              'status': PRIORITY_STATUS}
+
+
+class BusRequest(object):
+    def __init__(self, func, args, kwargs, priority, key, device):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.device = device
+
+        self.started = False
+        self.result = None
+        self.exc_info = None
+        self.nwaiters = 1
+        self.enqueued = time.time()
+        self.done = Event()
+
+
+class DeviceBusStats(object):
+    def __init__(self):
+        self.n = 0
+        self.coalesced = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.total_wait = 0
+        self.max_wait = 0
+
+    @property
+    def mean_wait(self):
+        if self.n:
+            return self.total_wait / self.n
+        return 0
+
+    def to_dict(self):
+        return dict(n=self.n, coalesced=self.coalesced,
+                    depth=self.depth, max_depth=self.max_depth,
+                    mean_wait=self.mean_wait, max_wait=self.max_wait)
+
+
 class CommunicationScheduler(Loggable):
     '''
-    
-        
-        this class should be used when working with multiple rs485 devices on the same port. 
-        
-        it uses a simple lock and sleep cycle to avoid collision on the data lines
-        
+        this class should be used when working with multiple rs485 devices on the same port.
+
+        requests are queued and executed one at a time by a worker thread in priority order
+        (interlock/actuation > measurement > status, first come first served within a class).
+        collision_delay ms are left between the end of one transaction and the start of the next.
+
+        identical pending requests scheduled with coalesce=True are executed once and
+        every caller gets the result. only use coalesce for read queries
+
         when setting up the devices use device.set_scheduler to set the shared scheduler
-        
     '''
 
-#    collision_delay = Float(125)
-    collision_delay = Float(50)
+    collision_delay = Float(5)
 
     def __init__(self, *args, **kw):
         super(CommunicationScheduler, self).__init__(*args, **kw)
-        self._lock = Lock()
-#        self._condition = Condition()
-#        self._command_queue = Queue()
-#        self._buffer = Queue()
-#
-#        consumer = Consumer(self._command_queue,
-#                            self._buffer,
-# #                            self._condition,
-#                            self.collision_delay)
-#        consumer.start()
+        self._cond = Condition()
+        self._queue = []
+        self._pending = {}
+        self._seq = count()
+        self._stats = {}
+        self._worker = None
+        self._last_end = 0
 
-    def schedule(self, func, args=None, kwargs=None):
+    def schedule(self, func, args=None, kwargs=None,
+                 priority=PRIORITY_MEASUREMENT, coalesce=False, device=None):
         if args is None:
             args = tuple()
         if kwargs is None:
             kwargs = dict()
 
-#        while SINGLE_ITEM_BUF and not self._buffer.empty():
-#            time.sleep(0.0001)
-#
-#        self._command_queue.put((func, args, kwargs))
-#
-#        try:
-#            r = self._buffer.get(timeout=0.5)
-#        except Empty:
-#            r = None
+        # a scheduled function scheduling another request would deadlock. run it directly
+        if current_thread() is self._worker:
+            return func(*args, **kwargs)
 
-        with self._lock:
-            r = func(*args, **kwargs)
+        key = None
+        if coalesce:
+            key = (func, tuple(args), tuple(sorted(kwargs.iteritems())))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
 
-        return r
+        with self._cond:
+            self._start_worker()
 
+            stats = self._get_stats(device)
+            req = self._pending.get(key) if key is not None else None
+            if req is not None:
+                req.nwaiters += 1
+                stats.coalesced += 1
+                if priority < req.priority:
+                    # requeue at the higher priority. the worker skips the stale entry
+                    req.priority = priority
+                    heapq.heappush(self._queue, (priority, next(self._seq), req))
+            else:
+                req = BusRequest(func, args, kwargs, priority, key, device)
+                if key is not None:
+                    self._pending[key] = req
 
-# class Consumer(Thread):
-#
-#    def __init__(self, q, b, cd):
-#        Thread.__init__(self)
-#        self._q = q
-#        self._buf = b
-# #        self.logger = add_console(name='consumer')
-# #        self.cond = cond
-#        self.cd = cd
-#
-#    def run(self):
-#        while 1:
-# #            self.cond.acquire()
-#            while self._q.empty():
-#                time.sleep(0.0001)
-# #                self.cond.wait(timeout=0.05)
-# #            st = time.time()
-#            func, args, kwargs = self._q.get()
-#
-#            while SINGLE_ITEM_BUF and not self._buf.empty():
-#                time.sleep(0.0001)
-#
-#            r = func(*args, **kwargs)
-# #            self.logger.info(r)
-#            self._buf.put(r)
-# #            self.cond.release()
-#
-# #            time.sleep(self.cd/1000.)
-# #            time.sleep(max(0.0001, self.cd / 1000. - (time.time() - st) - 0.001))
+                heapq.heappush(self._queue, (priority, next(self._seq), req))
+                stats.depth += 1
+                stats.max_depth = max(stats.max_depth, stats.depth)
+
+            self._cond.notify()
+
+        req.done.wait()
+        if req.exc_info:
+            raise req.exc_info[0], req.exc_info[1], req.exc_info[2]
+
+        return req.result
+
+    def get_stats(self):
+        '''
+            return {device: dict(n, coalesced, depth, max_depth, mean_wait, max_wait)}
+        '''
+        with self._cond:
+            return dict((k, v.to_dict()) for k, v in self._stats.iteritems())
+
+    def _get_stats(self, device):
+        try:
+            s = self._stats[device]
+        except KeyError:
+            s = self._stats[device] = DeviceBusStats()
+        return s
+
+    def _start_worker(self):
+        if self._worker is None:
+            self._worker = Thread(target=self._run, name='Scheduler-{}'.format(self.name))
+            self._worker.setDaemon(True)
+            self._worker.start()
+
+    def _next_request(self):
+        with self._cond:
+            while 1:
+                while not self._queue:
+                    self._cond.wait()
+
+                _, _, req = heapq.heappop(self._queue)
+                if req.started:
+                    continue
+
+                req.started = True
+                if req.key is not None:
+                    self._pending.pop(req.key, None)
+
+                stats = self._get_stats(req.device)
+                stats.depth -= 1
+                stats.n += 1
+                wait = time.time() - req.enqueued
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+                return req
+
+    def _run(self):
+        while 1:
+            req = self._next_request()
+
+            gap = self.collision_delay / 1000. - (time.time() - self._last_end)
+            if gap > 0:
+                time.sleep(gap)
 
+            try:
+                req.result = req.func(*req.args, **req.kwargs)
+            except BaseException:
+                req.exc_info = sys.exc_info()
+            finally:
+                self._last_end = time.time()
+                req.done.set()
 
 #============= EOF ====================================
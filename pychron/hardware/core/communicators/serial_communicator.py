@@ -30,6 +30,7 @@ import serial
 
 #=============local library imports  ==========================
 from communicator import Communicator
+from serial_reader import BackgroundReader, split_frame, wait_readable
 from pychron.globals import globalv
 
 
@@ -69,9 +70,24 @@ class SerialCommunicator(Communicator):
     read_terminator = None
     clear_output = False
 
+    # read the port continuously on a separate thread
+    background_reader = False
+    _reader = None
+    # end a response at the first terminator and keep the bytes after it for the next read.
+    # by default a response is everything received up to a trailing terminator
+    split_frames = False
+    # ms without new data after a trailing terminator before a response is complete.
+    # lets a multi-line response that arrives in pieces be read whole
+    frame_gap = 25
+    # bytes received after the end of the last frame
+    _rx = ''
 
     def reset(self):
         handle = self.handle
+
+        # the reader thread exits when the handle is closed under it
+        restart = self._reader is not None
+        self._stop_reader()
         try:
             isopen = handle.isOpen()
             orate = handle.getBaudrate()
@@ -90,7 +106,11 @@ class SerialCommunicator(Communicator):
         except Exception:
             self.warning('failed to reset connection')
 
+        if restart and handle is not None and handle.isOpen():
+            self._start_reader()
+
     def close(self):
+        self._stop_reader()
         if self.handle:
             self.debug('closing handle {}'.format(self.handle))
             self.handle.close()
@@ -127,8 +147,13 @@ class SerialCommunicator(Communicator):
             self.stopbits = getattr(serial, 'STOPBITS_%s' % stopbits.upper())
 
         self.set_attribute(config, 'read_delay', 'Communications', 'read_delay',
-                           cast='float', optional=True, default=25
-        )
+                           cast='float', optional=True)
+        self.set_attribute(config, 'background_reader', 'Communications', 'background_reader',
+                           cast='boolean', optional=True)
+        self.set_attribute(config, 'split_frames', 'Communications', 'split_frames',
+                           cast='boolean', optional=True)
+        self.set_attribute(config, 'frame_gap', 'Communications', 'frame_gap',
+                           cast='float', optional=True)
 
         self.set_attribute(config, 'read_terminator', 'Communications', 'terminator',
                            optional=True, default=None)
@@ -193,8 +218,10 @@ class SerialCommunicator(Communicator):
             return 
 
         with self._lock:
+            # leftovers of a previous response never answer this command
+            self.handle.flushInput()
+            self._clear_input()
             if self.clear_output:
-                self.handle.flushInput()
                 self.handle.flushOutput()
             #            self.info('acquiring lock {}'.format(self._lock))
             self._write(cmd, is_hex=is_hex)
@@ -282,8 +309,54 @@ class SerialCommunicator(Communicator):
             self._find_handle(args, **kw)
 
         connected = True if self.handle is not None else False
+        if connected and self.background_reader:
+            self._start_reader()
+
         return connected
 
+    def _start_reader(self):
+        self._stop_reader()
+        self._reader = BackgroundReader(self.handle, name='SerialReader-{}'.format(self.port))
+        self._reader.start()
+
+    def _stop_reader(self):
+        if self._reader is not None:
+            self._reader.stop()
+            self._reader = None
+
+    def _clear_input(self):
+        self._rx = ''
+        if self._reader is not None:
+            self._reader.clear()
+
+    def _read_available(self):
+        '''
+            return the bytes received so far
+        '''
+        r, self._rx = self._rx, ''
+        if self._reader is not None:
+            r += self._reader.read()
+        else:
+            inw = self.handle.inWaiting()
+            if inw:
+                r += self.handle.read(inw)
+        return r
+
+    def _unread(self, r):
+        '''
+            keep bytes past the end of a frame for the next read
+        '''
+        self._rx = r + self._rx
+
+    def _wait_for_data(self, timeout):
+        if self._rx:
+            return True
+
+        if self._reader is not None:
+            return self._reader.wait(timeout)
+        else:
+            return wait_readable(self.handle, timeout)
+
     def _find_handle(self, args, **kw):
         found = False
         self.simulation = False
@@ -459,38 +532,28 @@ class SerialCommunicator(Communicator):
         '''
             1 byte == 2 chars
         '''
-        handle = self.handle
-        #        inw = 0
-        #        timeout = 1
-        #        tt = 0
-        #        r = ''
-
-        #        while len(r) < nbytes and tt < timeout:
-        inw = handle.inWaiting()
-        #            c = inw
-        c = min(inw, nchars - len(r))
-        r += ''.join(map('{:02X}'.format, map(ord, handle.read(c))))
-        #        print len(r), nchars
-        #            d = 1 / 1000.
-        #            time.sleep(d)
-        #            tt += d
-        #        print len(r), nchars
+        nbytes = (nchars - len(r) + 1) / 2
+        data = self._read_available()
+        if len(data) > nbytes:
+            self._unread(data[nbytes:])
+            data = data[:nbytes]
+
+        r += ''.join(map('{:02X}'.format, map(ord, data)))
         return r[:nchars], len(r) >= nchars
 
     def _get_nchars(self, nchars, r):
         '''
         '''
-        handle = self.handle
-        inw = handle.inWaiting()
-        c = min(inw, nchars - len(r))
-        r += handle.read(c)
-        # print 'get n', len(r), nchars, self._prep_str(r), len(r) == nchars
-        return r[:nchars], len(r) >= nchars
+        r += self._read_available()
+        if len(r) > nchars:
+            self._unread(r[nchars:])
+            r = r[:nchars]
+
+        return r, len(r) >= nchars
 
     def _check_handshake(self, handshake_chrs):
         ack, nak = handshake_chrs
-        inw = self.handle.inWaiting()
-        r = self.handle.read(inw)
+        r = self._read_available()
         if r:
             return ack == r[0], r[1:]
         return False, None
@@ -498,35 +561,32 @@ class SerialCommunicator(Communicator):
     def _get_isterminated(self, r, terminator=None):
         terminated = False
         try:
-            inw = self.handle.inWaiting()
-            r += self.handle.read(inw)
-            #            print 'inw', inw, r, terminator
+            r += self._read_available()
             if terminator is None:
                 terminator = ('\n', '\r')
 
             if not isinstance(terminator, (list, tuple)):
                 terminator = (terminator,)
 
-            if r and r.strip():
-                for ti in terminator:
-                #                    print ' '.join(map(str,[ord(t) for t in ti])),' '.join(map(str,[ord(t) for t in r]))
-                    if r.endswith(ti):
-                        terminated = True
-                        break
-                    #                terminated = r[-1] in terminator
-
-                    #                t1 = '\n'
-                    #                t2 = '\r'
-                    #                return r, r.endswith(t1) or r.endswith(t2) if r is not None else False
-                    #            else:
-                    #                return r, r.endswith(terminator) if r is not None else False
+            if self.split_frames:
+                frame, rest = split_frame(r, terminator)
+                if frame is not None:
+                    r = frame
+                    self._unread(rest)
+                    terminated = True
+            elif r.strip() and any(r.endswith(ti) for ti in terminator):
+                # complete unless more arrives within frame_gap
+                terminated = not self._wait_for_data(self.frame_gap / 1000.)
 
         except (OSError, IOError), e:
             self.warning(e)
         return r, terminated
 
     def _read_loop(self, func, delay, timeout=1):
-        # print func, delay, timeout
+        '''
+            call func until it reports the response is complete. between calls block
+            until more data arrives instead of sleeping a fixed interval
+        '''
         if delay is not None:
             time.sleep(delay / 1000.)
 
@@ -536,28 +596,25 @@ class SerialCommunicator(Communicator):
         r = ''
         st = time.time()
 
-        handle=self.handle
-
-        ct = time.time()
-        while ct - st < timeout:
+        handle = self.handle
+        while 1:
             if not handle.isOpen():
                 break
-            
+
             try:
                 r, isterminated = func(r)
-                #                print r, isterminated
                 if isterminated:
                     break
             except (ValueError, TypeError):
                 pass
-#                import traceback
-#                traceback.print_exc()
-            time.sleep(0.01)
-            ct = time.time()
-
-        if ct - st > timeout:
-            l = len(r) if r else 0
-            self.info('timed out. {}s r={}, len={}'.format(timeout, r, l))
+
+            remaining = timeout - (time.time() - st)
+            if remaining <= 0:
+                l = len(r) if r else 0
+                self.info('timed out. {}s r={}, len={}'.format(timeout, r, l))
+                break
+
+            self._wait_for_data(remaining)
 
         return r
 
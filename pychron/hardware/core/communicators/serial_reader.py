@@ -0,0 +1,151 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import select
+import time
+from threading import Thread, Condition, Event
+
+import serial
+#============= local library imports  ==========================
+
+# poll period used when the handle cannot be selected on (e.g. windows)
+POLL_PERIOD = 0.001
+
+
+def split_frame(r, terminators):
+    """
+        split r at the first terminator that follows some non whitespace data.
+        consecutive terminators are kept with the frame so '\\r\\n' is not split.
+
+        return frame, rest. frame is None if r does not contain a complete frame
+    """
+    content = len(r) - len(r.lstrip())
+    if content == len(r):
+        return None, r
+
+    end = None
+    for ti in terminators:
+        idx = r.find(ti, content)
+        if idx != -1:
+            idx += len(ti)
+            if end is None or idx < end:
+                end = idx
+
+    if end is None:
+        return None, r
+
+    extended = True
+    while extended:
+        extended = False
+        for ti in terminators:
+            if r.startswith(ti, end):
+                end += len(ti)
+                extended = True
+
+    return r[:end], r[end:]
+
+
+def wait_readable(handle, timeout):
+    """
+        block until handle has data to read or timeout seconds elapse.
+        return True if data may be available
+    """
+    try:
+        fd = handle.fileno()
+    except (AttributeError, ValueError, serial.SerialException):
+        fd = None
+
+    if fd is not None:
+        try:
+            r, _, _ = select.select([fd], [], [], max(0, timeout))
+            return bool(r)
+        except (select.error, ValueError):
+            pass
+
+    st = time.time()
+    while 1:
+        if handle.inWaiting():
+            return True
+
+        if time.time() - st >= timeout:
+            return False
+
+        time.sleep(POLL_PERIOD)
+
+
+class BackgroundReader(Thread):
+    """
+        continuously move bytes from a serial handle into a buffer.
+
+        readers wait on the buffer instead of polling the port so a response is picked up
+        as soon as it arrives
+    """
+
+    def __init__(self, handle, name=None):
+        Thread.__init__(self, name=name)
+        self.daemon = True
+        self.handle = handle
+
+        self._buf = ''
+        self._cond = Condition()
+        self._stop_evt = Event()
+
+    def run(self):
+        handle = self.handle
+        while not self._stop_evt.is_set():
+            try:
+                if not wait_readable(handle, 0.1):
+                    continue
+
+                n = handle.inWaiting()
+                data = handle.read(n) if n else ''
+            except (OSError, IOError, ValueError, serial.SerialException):
+                break
+
+            if data:
+                with self._cond:
+                    self._buf += data
+                    self._cond.notify_all()
+
+    def read(self):
+        """
+            return and clear the buffered data
+        """
+        with self._cond:
+            r, self._buf = self._buf, ''
+        return r
+
+    def wait(self, timeout):
+        """
+            wait up to timeout seconds for data
+        """
+        with self._cond:
+            if not self._buf:
+                self._cond.wait(timeout)
+
+            return bool(self._buf)
+
+    def clear(self):
+        with self._cond:
+            self._buf = ''
+
+    def stop(self):
+        self._stop_evt.set()
+        self.join(1)
+
+#============= EOF =============================================
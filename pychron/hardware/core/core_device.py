@@ -35,7 +35,8 @@ from pychron.hardware.core.communicators.modbus_communicator import CRCError
 from pychron.hardware.core.scanable_device import ScanableDevice
 from pychron.rpc.rpcable import RPCable
 from pychron.has_communicator import HasCommunicator
-from pychron.hardware.core.communicators.scheduler import CommunicationScheduler
+from pychron.hardware.core.communicators.scheduler import CommunicationScheduler, PRIORITIES, \
+    PRIORITY_MEASUREMENT
 from pychron.consumer_mixin import ConsumerMixin
 
 def crc_caller(func):
@@ -108,6 +109,8 @@ class CoreDevice(ScanableDevice, RPCable, HasCommunicator, ConsumerMixin):
     _auto_started = False
 
     _scheduler_name = None
+    # default priority of this device's requests on a shared bus
+    scheduler_priority = PRIORITY_MEASUREMENT
 
     #ICoreDevice protocol
     def close(self):
@@ -144,6 +147,13 @@ class CoreDevice(ScanableDevice, RPCable, HasCommunicator, ConsumerMixin):
                     return False
 
                 self.set_attribute(config, '_scheduler_name', 'Communications', 'scheduler', optional=True)
+                priority = self.config_get(config, 'Communications', 'priority', optional=True)
+                if priority is not None:
+                    try:
+                        self.scheduler_priority = PRIORITIES[priority.lower()]
+                    except KeyError:
+                        self.warning('invalid priority "{}". use one of {}. '
+                                     'using the default'.format(priority, ', '.join(sorted(PRIORITIES))))
 
             self._load_hook(config)
 
@@ -167,15 +177,22 @@ class CoreDevice(ScanableDevice, RPCable, HasCommunicator, ConsumerMixin):
         return True
 
     @crc_caller
-    def ask(self, cmd, **kw):
+    def ask(self, cmd, priority=None, coalesce=False, **kw):
         """
+            priority, coalesce: only used if the communicator has a scheduler.
+            see CommunicationScheduler.schedule
         """
         comm = self._communicator
         if comm is not None:
             if comm.scheduler:
+                if priority is None:
+                    priority = self.scheduler_priority
+
                 r = comm.scheduler.schedule(comm.ask, args=(cmd,),
-                                            kwargs=kw
-                )
+                                            kwargs=kw,
+                                            priority=priority,
+                                            coalesce=coalesce,
+                                            device=self.name)
             else:
                 r = comm.ask(cmd, **kw)
             self._communicate_hook(cmd, r)
@@ -249,6 +266,7 @@ class CoreDevice(ScanableDevice, RPCable, HasCommunicator, ConsumerMixin):
     def set_scheduler(self, s):
         if self._communicator is not None:
             self._communicator.scheduler = s
+            self._communicator.scheduler_priority = self.scheduler_priority
             #            self._communicator._lock=s._lock
 
     def _parse_response(self, v):
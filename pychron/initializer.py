@@ -17,15 +17,19 @@
 #============= enthought library imports =======================
 from traits.api import Any
 #============= standard library imports ========================
+import time
+import traceback
 #============= local library imports  ==========================
 from pychron.paths import paths
+from pychron.hardware.core.bring_up import BringUpTask, run_tasks, format_timeline, \
+    TIMEOUT, BLOCKED
 from pychron.hardware.core.i_core_device import ICoreDevice
 from pychron.initialization_parser import InitializationParser
 from loggable import Loggable
 from pychron.core.ui.progress_dialog import myProgressDialog
 import os
 from pychron.globals import globalv
-# from pychron.core.ui.gui import invoke_in_main_thread
+from pychron.core.ui.gui import invoke_in_main_thread
 # from pyface.ui.qt4.progress_dialog import ProgressDialog
 
 
@@ -38,6 +42,11 @@ class Initializer(Loggable):
     application = Any
     device_prefs = Any
 
+    # devices opened and initialized at the same time
+    device_threads = 4
+    # default seconds a device may take to open and initialize
+    device_timeout = 30
+
     def __init__(self, *args, **kw):
 
         super(Initializer, self).__init__(*args, **kw)
@@ -48,6 +57,7 @@ class Initializer(Loggable):
     def clear(self):
         self.init_list = []
         self.application = None
+        self.timeline = []
 
     def add_initialization(self, a):
         """
@@ -313,8 +323,7 @@ Do you want to quit to enable {} in the Initialization File?'''.format(name, nam
         '''
         '''
 
-        opened = []
-        devs = []
+        tasks = []
         if manager is None:
             return
 
@@ -362,37 +371,106 @@ Do you want to quit to enable {} in the Initialization File?'''.format(name, nam
                     self.application.register_service(ICoreDevice, dev,
                                                       {'display': True})
 
-                devs.append(dev)
-                self.info('opening {}'.format(dev.name))
-                if not dev.open(prefs=self.device_prefs):
-                    self.info('failed connecting to {}'.format(dev.name))
-                else:
-                    opened.append(dev)
+                tasks.append(self._make_bring_up_task(device, dev, pdev))
             else:
                 self.info('failed loading {}'.format(dev.name))
 
-                #        for od in opened:
+        application = self.application
 
-        for od in devs:
-            self.info('Initializing {}'.format(od.name))
-            result = od.initialize(progress=self.pd)
-            if result is not True:
-                self.warning('Failed setting up communications to {}'.format(od.name))
-                if od._communicator:
-                    od._communicator.simulation = True
+        def on_late(task):
+            # called from the device's bring up thread
+            invoke_in_main_thread(self._finish_device, manager, task, application)
 
-            elif result is None:
-                raise NotImplementedError
+        st = time.time()
+        run_tasks(tasks, nthreads=self.device_threads,
+                  report=lambda t, msg: self.info(msg),
+                  progress=self.pd,
+                  on_late=on_late)
+        self._report_timeline(tasks, st)
+
+        for task in tasks:
+            if task.state == TIMEOUT:
+                # its thread is still in open/initialize. setting up the device now would race
+                # with it so the device is handed to the manager by on_late once the thread returns
+                self.warning('{} is still starting. It will be added when it finishes'.format(task.device.name))
+                continue
+
+            self._finish_device(manager, task, application)
+
+    def _finish_device(self, manager, task, application):
+        od = task.device
+        if task.state == BLOCKED:
+            result = False
+        elif task.exc_info:
+            self.warning(''.join(traceback.format_exception(*task.exc_info)))
+            result = False
+        else:
+            if not task.results.get('open'):
+                self.info('failed connecting to {}'.format(od.name))
+            result = task.results.get('initialize')
 
-            od.application = self.application
-            od.post_initialize()
+        if result is not True:
+            self.warning('Failed setting up communications to {}'.format(od.name))
+            if od._communicator:
+                od._communicator.simulation = True
 
-            manager.devices.append(od)
+        od.application = application
+        od.post_initialize()
 
+        manager.devices.append(od)
 
+    def _make_bring_up_task(self, name, dev, pdev):
+        """
+            open then initialize dev.
+
+            optional device parameters in the initialization file
+                depends: comma separated names of devices to bring up first
+                startup_timeout: seconds to wait for this device
+        """
+        depends = self.parser.get_parameter(pdev, 'depends')
+        if depends:
+            depends = [d.strip() for d in depends.split(',')]
+
+        timeout = self.parser.get_parameter(pdev, 'startup_timeout')
+        try:
+            timeout = float(timeout)
+        except (TypeError, ValueError):
+            timeout = self.device_timeout
+
+        stages = [('open', lambda progress: dev.open(prefs=self.device_prefs)),
+                  ('initialize', lambda progress: dev.initialize(progress=progress))]
+
+        task = BringUpTask(name, stages,
+                           depends=depends,
+                           group=self._get_device_group(dev),
+                           timeout=timeout)
+        task.device = dev
+        return task
+
+    def _get_device_group(self, dev):
+        """
+            devices on the same scheduler, serial port or host:port are brought up one at a time
+        """
+        sname = getattr(dev, '_scheduler_name', None)
+        if sname:
+            return 'scheduler {}'.format(sname)
+
+        comm = dev._communicator
+        if comm is not None:
+            port = getattr(comm, 'port', None)
+            host = getattr(comm, 'host', None)
+            if host:
+                return '{}:{}'.format(host, port)
+            return port
+
+    def _report_timeline(self, tasks, st):
+        if not tasks:
+            return
 
-            #            if od.simulation:
-            #                time.sleep(0.25)
+        self.info('devices up in {:0.2f}s'.format(time.time() - st))
+        for line in format_timeline(tasks, st):
+            self.info(line)
+            self.timeline.append(line)
 
     def load_progress(self, n):
         '''
@@ -29,6 +29,16 @@ from pychron.core.helpers.filetools import parse_file
 from pychron.paths import paths
 from pychron.loggable import Loggable
 from pychron.core.geometry.affine import AffineTransform
+from pychron.core.geometry.grid_index import GridIndex
+
+# relative positions of the neighbors used for interpolation
+# N, W, E, S, NW, NE, SW, SE
+NEIGHBOR_OFFSETS = [(0, 1),
+                    (-1, 0), (1, 0),
+                    (0, -1),
+                    (-1, 1), (1, 1),
+                    (-1, -1), (1, -1)]
+
 
 class SampleHole(HasTraits):
     id = Str
@@ -95,6 +105,11 @@ class StageMap(Loggable):
     calibration_holes = None
     cpos = None
     rotation = None
+
+    _nominal_index = None
+    _corrected_index = None
+    _hole_indices = None
+
     def interpolate_noncorrected(self):
         self.info('iteratively fill in non corrected holes')
         n = len(self.sample_holes)
@@ -118,49 +133,87 @@ class StageMap(Loggable):
 
         h = self.get_hole(holenum)
         if h is not None:
-            nxs = []
-            nys = []
-            iholes = []
-            n = 3
-            for sd in range(n):
-                xi, yi, hi = self._calculated_interpolated_position(h, sd + 1)
-                # do simple weighting by distance
-                w = (n - sd)
-                nxs += xi * w
-                nys += yi * w
-                iholes += hi
-
-            if nxs and nys:
-                nx, ny = (sum(nxs) / max(1, len(nxs)),
-                        sum(nys) / max(1, len(nys)))
-
-                # verify within tolerance
-                tol = h.dimension * 0.85
-
-                hx, hy = self.map_to_calibration(h.nominal_position)
-                if abs(nx - hx) < tol and abs(ny - hy) < tol:
-                    h.interpolated = True
-                    h.corrected = True
-                    h.interpolation_holes = set(iholes)
-
-                    h.x_cor = nx
-                    h.y_cor = ny
-
-                    return nx, ny
+            founds = [self._find_neighbors([h], sd + 1)[0] for sd in range(3)]
+            return self._interpolate_hole(h, founds)
+
+    def _interpolate_hole(self, h, founds):
+        '''
+            founds: neighbors of h for search distances 1, 2, 3...
+        '''
+        nxs = []
+        nys = []
+        iholes = []
+        n = len(founds)
+        for sd, found in enumerate(founds):
+            xi, yi, hi = self._calculated_interpolated_position(h, sd + 1, found)
+            # do simple weighting by distance
+            w = (n - sd)
+            nxs += xi * w
+            nys += yi * w
+            iholes += hi
+
+        if nxs and nys:
+            nx, ny = (sum(nxs) / max(1, len(nxs)),
+                      sum(nys) / max(1, len(nys)))
+
+            # verify within tolerance
+            tol = h.dimension * 0.85
+
+            hx, hy = self.map_to_calibration(h.nominal_position)
+            if abs(nx - hx) < tol and abs(ny - hy) < tol:
+                h.interpolated = True
+                h.corrected = True
+                h.interpolation_holes = set(iholes)
+
+                h.x_cor = nx
+                h.y_cor = ny
+
+                return nx, ny
 
     def _interpolate_noncorrected(self):
-        self.sample_holes.reverse()
-        for h in self.sample_holes:
-            self._calculated_interpolated_position(h)
+        '''
+            neighbors of all the noncorrected holes are found in one batch. holes corrected
+            earlier in the pass are used for the holes that follow
+        '''
+        holes = [h for h in reversed(self.sample_holes) if not h.has_correction()]
+        if not holes:
+            return
+
+        founds = zip(*[self._find_neighbors(holes, sd + 1) for sd in range(3)])
+        for h, fs in zip(holes, founds):
+            self._interpolate_hole(h, fs)
+
+    def _find_neighbors(self, holes, search_distance):
+        '''
+            return the cardinal and corner holes of each hole in holes
+            [N, W, E, S, NW, NE, SW, SE]. None if there is no hole at a position
+        '''
+        spacing = self._get_spacing(search_distance)
+        offsets = array(NEIGHBOR_OFFSETS) * spacing
+
+        xs = array([h.x for h in holes])
+        ys = array([h.y for h in holes])
+        qx = (xs[:, None] + offsets[:, 0]).ravel()
+        qy = (ys[:, None] + offsets[:, 1]).ravel()
 
-    def _calculated_interpolated_position(self, h, search_distance):
+        idx = self._get_index('x', 'y').nearest(qx, qy, self.g_dimension)
+        shs = self.sample_holes
+        idx = idx.reshape(len(holes), len(offsets))
+        return [[shs[i] if i >= 0 and shs[i] is not h else None for i in row]
+                for h, row in zip(holes, idx)]
+
+    def _get_spacing(self, search_distance):
+        return search_distance * abs(self.sample_holes[0].x - self.sample_holes[1].x)
+
+    def _calculated_interpolated_position(self, h, search_distance, found=None):
         '''
             search distance is a scalar in hole units. it defines how many
             holes away to
-        '''
 
+            found: neighbors of h from _find_neighbors
+        '''
 
-        spacing = search_distance * abs(self.sample_holes[0].x - self.sample_holes[1].x)
+        spacing = self._get_spacing(search_distance)
 #         debug_hole = '18'
         nxs = []
         nys = []
@@ -168,29 +221,12 @@ class StageMap(Loggable):
 
         if not h.has_correction():
             # this hole does not have a correction value
-            found = []
-            # get the cardinal holes and corner holes
-            for rx, ry in [(0, 1),
-                           (-1, 0), (1, 0),
-                                (0, -1),
-
-                          (-1, 1), (1, 1),
-                          (-1, -1), (1, -1)
-                          ]:
-
-                x = h.x + rx * spacing
-                y = h.y + ry * spacing
+            if found is None:
+                found = self._find_neighbors([h], search_distance)[0]
 
-                ihole = self._get_hole_by_position(x, y)
-
-                if ihole == h:
-                    ihole = None
-
-                fo = None
-                if ihole is not None:
-                    if ihole.has_correction():
-                        fo = ihole
-                found.append(fo)
+            # only use the corrected holes
+            found = [fo if fo is not None and fo.has_correction() else None
+                     for fo in found]
 
             self._interpolate_midpoint(h, found, nxs, nys, iholes)
             self._interpolate_triangulation(h, found, nxs, nys, iholes)
@@ -331,18 +367,22 @@ class StageMap(Loggable):
         return pos
 
     def get_hole(self, key):
-        return next((h for h in self.sample_holes if h.id == str(key)), None)
-
-    def get_hole_pos(self, key):
         '''
             hole ids are str so convert key to str
         '''
-        return next(((h.x, h.y)
-                     for h in self.sample_holes if h.id == str(key)), None)
+        i = self._get_hole_indices().get(str(key))
+        if i is not None:
+            return self.sample_holes[i]
+
+    def get_hole_pos(self, key):
+        h = self.get_hole(key)
+        if h is not None:
+            return h.x, h.y
 
     def get_corrected_hole_pos(self, key):
-        return next(((h.x_cor, h.y_cor)
-                     for h in self.sample_holes if h.id == key), None)
+        h = self.get_hole(key)
+        if h is not None:
+            return h.x_cor, h.y_cor
 
     def load_correction_file(self):
         p = os.path.join(paths.hidden_dir, '{}_correction_file'.format(self.name))
@@ -394,7 +434,7 @@ class StageMap(Loggable):
         self.info('saved correction file {}'.format(p))
 
     def set_hole_correction(self, hn, x_cor, y_cor):
-        hole = next((h for h in self.sample_holes if h.id == hn), None)
+        hole = self.get_hole(hn)
         if hole is not None:
             hole.x_cor = x_cor
             hole.y_cor = y_cor
@@ -410,13 +450,58 @@ class StageMap(Loggable):
         if tol is None:
             tol = self.g_dimension  # * 0.75
 
-        pythag = lambda hi, xi, yi:((hi.x - xi) ** 2 + (hi.y - yi) ** 2) ** 0.5
-        holes = [(hole, pythag(hole, x, y)) for hole in self.sample_holes
-                 if abs(getattr(hole, xkey) - x) < tol and abs(getattr(hole, ykey) - y) < tol]
-        if holes:
-#            #sort holes by deviation
-            holes = sorted(holes, lambda a, b: cmp(a[1], b[1]))
-            return holes[0][0]
+        if not self.sample_holes:
+            return
+
+        i = self._get_index(xkey, ykey).nearest(x, y, tol)
+        if i >= 0:
+            return self.sample_holes[i]
+
+    def _get_hole_indices(self):
+        '''
+            {hole id: index in sample_holes}. the first hole wins if ids are duplicated
+        '''
+        if self._hole_indices is None:
+            self._hole_indices = dict((h.id, i) for i, h in reversed(list(enumerate(self.sample_holes))))
+        return self._hole_indices
+
+    def _get_index(self, xkey, ykey):
+        '''
+            grid index of the nominal (x, y) or corrected (x_cor, y_cor) hole positions
+        '''
+        attr = '_nominal_index' if xkey == 'x' else '_corrected_index'
+        index = getattr(self, attr)
+        if index is None:
+            shs = self.sample_holes
+            cell = self.g_dimension or 1
+            index = GridIndex([getattr(h, xkey) for h in shs],
+                              [getattr(h, ykey) for h in shs], cell)
+            setattr(self, attr, index)
+        return index
+
+    @on_trait_change('sample_holes, sample_holes_items, g_dimension')
+    def _reset_indices(self):
+        self._nominal_index = None
+        self._corrected_index = None
+        self._hole_indices = None
+
+    @on_trait_change('sample_holes:[x, y, id]')
+    def _update_nominal(self, obj, name, old, new):
+        self._nominal_index = None
+        if name == 'id':
+            self._hole_indices = None
+
+    @on_trait_change('sample_holes:[x_cor, y_cor]')
+    def _update_corrected(self, obj, name, old, new):
+        index = self._corrected_index
+        if index is not None:
+            i = self._get_hole_indices().get(obj.id)
+            if i is None or self.sample_holes[i] is not obj:
+                try:
+                    i = self.sample_holes.index(obj)
+                except ValueError:
+                    return
+            index.move(i, obj.x_cor, obj.y_cor)
 
     def _get_bitmap_path(self):
 
@@ -28,6 +28,7 @@ from pychron.core.ui.thread import currentThreadName
 
 from pychron.core.ui.dialogs import myConfirmationDialog, myMessageDialog
 from pychron.core.ui.gui import invoke_in_main_thread
+from pychron.core.helpers.dialog_router import open_dialog
 
 color_name_gen = colorname_generator()
 NAME_WIDTH = 40
@@ -125,6 +126,15 @@ class Loggable(HasTraits):
         invoke_in_main_thread(_open_)
 
     def warning_dialog(self, msg, sound=None, title='Warning'):
+        return open_dialog(self._warning_dialog, msg, sound=sound, title=title)
+
+    def confirmation_dialog(self, *args, **kw):
+        return open_dialog(confirmation_dialog, *args, **kw)
+
+    def information_dialog(self, msg, title='Information'):
+        return open_dialog(self._information_dialog, msg, title=title)
+
+    def _warning_dialog(self, msg, sound=None, title='Warning'):
         dialog = myMessageDialog(
             parent=None, message=str(msg),
             title=title,
@@ -137,11 +147,8 @@ class Loggable(HasTraits):
         #         from threading import current_thread
         #         print current_thread()
         dialog.open()
-    
-    def confirmation_dialog(self,*args, **kw):
-        return confirmation_dialog(*args, **kw)
 
-    def information_dialog(self, msg, title='Information'):
+    def _information_dialog(self, msg, title='Information'):
         dlg = myMessageDialog(parent=None, message=msg,
                               title=title,
                               severity='information')
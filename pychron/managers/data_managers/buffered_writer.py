@@ -0,0 +1,115 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import time
+from threading import Lock
+from numpy import empty
+#============= local library imports  ==========================
+
+
+class H5BufferedWriter(object):
+    """
+        buffered time series writer on top of an H5DataManager.
+
+        table handles are looked up once and cached. rows are accumulated in memory
+        and appended to the tables in one call every flush_rows rows or flush_interval seconds,
+        whichever comes first. a flush also flushes the file so data is on disk
+        up to the last flush.
+
+        the file must be open (e.g. H5DataManager.open_file) while writing and the writer
+        must be closed (flushed) before the file is closed.
+    """
+
+    def __init__(self, data_manager, flush_rows=50, flush_interval=5.0):
+        self.data_manager = data_manager
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+
+        self.nrows = 0
+        self.nflushes = 0
+
+        self._tables = {}
+        self._pending = {}
+        self._npending = 0
+        self._last_flush = time.time()
+        self._lock = Lock()
+
+    def write(self, name, group, x, value):
+        """
+            buffer a (time, value) row for table group/name.
+            return False if the table does not exist
+        """
+        key = (group, name)
+        with self._lock:
+            if key not in self._tables:
+                t = self.data_manager.get_table(name, group)
+                if t is None:
+                    return False
+                self._tables[key] = t
+                self._pending[key] = []
+
+            self._pending[key].append((x, value))
+            self._npending += 1
+            self.nrows += 1
+
+            if self._npending >= self.flush_rows or \
+                            time.time() - self._last_flush > self.flush_interval:
+                self._flush()
+
+        return True
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """
+            flush and release the cached table handles
+        """
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                self._tables = {}
+                self._pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _flush(self):
+        if self._npending:
+            for key, rows in self._pending.iteritems():
+                if rows:
+                    t = self._tables[key]
+                    data = empty(len(rows), dtype=t.dtype)
+                    data['time'], data['value'] = zip(*rows)
+                    t.append(data)
+                    t.flush()
+                    del rows[:]
+
+            self.data_manager.flush_file()
+
+            self.nflushes += 1
+            self._npending = 0
+
+        self._last_flush = time.time()
+
+#============= EOF =============================================
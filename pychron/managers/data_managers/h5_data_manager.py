@@ -216,6 +216,10 @@ class H5DataManager(DataManager):
             traceback.print_exc()
             return True
 
+    def flush_file(self):
+        if self._frame is not None:
+            self._frame.flush()
+
     def close_file(self):
         try:
             self.debug('flush and close file {}'.format(self._frame.filename))
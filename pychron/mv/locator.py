@@ -14,10 +14,11 @@
 #===============================================================================
 
 #============= enthought library imports =======================
-from traits.api import Float
+from traits.api import Float, Int, List
 
 # from pychron.core.geometry.centroid import centroid
 #============= standard library imports ========================
+import time
 
 from numpy import array, histogram, argmax, zeros, asarray, ones_like, \
     nonzero, max
@@ -28,6 +29,7 @@ from scipy import ndimage
 from skimage.exposure import rescale_intensity
 #============= local library imports  ==========================
 # from pychron.core.geometry.centroid.calculate_centroid import calculate_centroid
+from pychron.core.helpers.thread_pool import first_accepted
 from pychron.loggable import Loggable
 from pychron.mv.segment.region import RegionSegmenter
 from pychron.image.cv_wrapper import grayspace, draw_contour_list, contour, \
@@ -71,6 +73,14 @@ class Locator(Loggable):
     use_histogram = False
     use_circle_minimization = True
     step_signal = None
+
+    # number of thresholds segmented concurrently. 1 = sequential
+    sweep_threads = Int(4)
+
+    # per stage timings of the most recent autocenter attempts
+    timings = List
+    max_timings = 50
+
     def wait(self):
         if self.step_signal:
             self.step_signal.wait()
@@ -128,6 +138,9 @@ class Locator(Loggable):
             use a segmentor to segment the image
         '''
 
+        timings = dict(preprocess=0, edges=0, segment=0, polygons=0, filter=0,
+                       nthresholds=0, threshold=None)
+        st = time.time()
         if preprocess:
             src = self._preprocess(frame)
         else:
@@ -138,37 +151,83 @@ class Locator(Loggable):
 #         self.test_image.set_image(pychron)
         seg = RegionSegmenter(use_adaptive_threshold=False)
 
+        t = time.time()
+        timings['preprocess'] = t - st
+        # the edge map is the same for every threshold
+        elmap = seg.edge_map(src)
+        timings['edges'] = time.time() - t
+
         if start is None:
             start = int(array(src).mean()) - 3 * w
 
         fa = self._get_filter_target_area(dim)
 
+        windows = []
+        block_size = seg.block_size
         for i in range(n):
-            seg.threshold_low = max((0, start + i * step - w))
-            seg.threshold_high = max((1, min((255, start + i * step + w))))
+            lo = max((0, start + i * step - w))
+            hi = max((1, min((255, start + i * step + w))))
+            block_size += 5
+            windows.append((src, elmap, lo, hi, block_size))
 
-            seg.block_size += 5
-            nsrc = seg.segment(src)
+        found = []
 
-            nf = colorspace(nsrc)
-#             nf = array(colorspace(nsrc))
+        def accept(r):
+            lo, targets, nf, tseg, tpoly = r
+            timings['segment'] += tseg
+            timings['polygons'] += tpoly
+            timings['nthresholds'] += 1
 
-
-            # draw contours
-
-
-            targets = self._find_polygon_targets(nsrc,
-                                                frame=nf
-                                                 )
             if targets:
                 if set_image:
                     image.set_frame(nf)
                 # filter targets
                 if filter_targets:
+                    ft = time.time()
                     targets = self._filter_targets(image, frame, dim, targets, fa)
+                    timings['filter'] += time.time() - ft
 
             if targets:
-                return targets
+                timings['threshold'] = lo
+                found.extend(targets)
+                return True
+
+        first_accepted(self._segment_threshold, windows, accept,
+                       nthreads=self.sweep_threads)
+
+        timings['total'] = time.time() - st
+        self._add_timings(timings)
+
+        if found:
+            return found
+
+    def _segment_threshold(self, src, elmap, lo, hi, block_size):
+        '''
+            segment src using the threshold window lo-hi and find the polygon targets.
+            runs in a sweep thread so it must not touch the image
+        '''
+        st = time.time()
+        seg = RegionSegmenter(use_adaptive_threshold=False)
+        seg.threshold_low = lo
+        seg.threshold_high = hi
+        seg.block_size = block_size
+        nsrc = seg.segment(src, elmap=elmap)
+
+        t = time.time()
+        nf = colorspace(nsrc)
+#             nf = array(colorspace(nsrc))
+
+        # draw contours
+        targets = self._find_polygon_targets(nsrc, frame=nf)
+        return lo, targets, nf, t - st, time.time() - t
+
+    def _add_timings(self, timings):
+        self.debug('autocenter timings total={total:0.3f} preprocess={preprocess:0.3f} '
+                   'edges={edges:0.3f} segment={segment:0.3f} polygons={polygons:0.3f} '
+                   'filter={filter:0.3f} nthresholds={nthresholds} threshold={threshold}'.format(**timings))
+        self.timings.append(timings)
+        if len(self.timings) > self.max_timings:
+            self.timings.pop(0)
 
 #===============================================================================
 # filter
@@ -34,9 +34,17 @@ class RegionSegmenter(BaseSegmenter):
     threshold_high = 255
     block_size = 20
 
-    def segment(self, src):
+    def edge_map(self, src):
+        '''
+            the elevation map used for the watershed. it does not depend on the thresholds
+            so it can be calculated once and passed to segment
+        '''
+        return sobel(src, mask=src)
+
+    def segment(self, src, elmap=None):
         '''
             pychron: preprocessing cv.Mat
+            elmap: precalculated edge_map of src
         '''
 #        image = pychron.ndarray[:]
 #         image = asarray(pychron)
@@ -55,7 +63,8 @@ class RegionSegmenter(BaseSegmenter):
             markers[image < self.threshold_low] = 1
             markers[image > self.threshold_high] = 255
 
-        elmap = sobel(image, mask=image)
+        if elmap is None:
+            elmap = self.edge_map(image)
         wsrc = watershed(elmap, markers, mask=image)
 
 #         wsrc = wsrc.astype('uint8')
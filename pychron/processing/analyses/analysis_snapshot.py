@@ -0,0 +1,187 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from multiprocessing import Pool, cpu_count
+from numpy import array
+#============= local library imports  ==========================
+from pychron.core.helpers.binpack import unpack_signal
+from pychron.core.regression.mean_regressor import MeanRegressor
+from pychron.core.regression.ols_regressor import PolynomialRegressor
+from pychron.processing.isotope import Sniff
+
+"""
+    picklable snapshots of the raw data needed to reduce an analysis.
+
+    the parent process syncs the DBAnalysis metadata from the database and makes a
+    snapshot of each isotope/baseline/sniff signal blob and its fit. reduce_snapshot runs in a
+    worker process (unpack and regress) and apply_snapshot copies the results back into
+    the DBAnalysis
+"""
+
+
+class MeasurementSnapshot(object):
+    def __init__(self, name, kind, blob, fit, error_type, filter_outliers_dict):
+        self.name = name
+        self.kind = kind
+        self.blob = blob
+        self.fit = fit
+        self.error_type = error_type
+        self.filter_outliers_dict = filter_outliers_dict
+
+        self.xs = None
+        self.ys = None
+        self.value = None
+        self.error = None
+        self.unpack_error = None
+
+
+class AnalysisSnapshot(object):
+    def __init__(self, uuid, measurements):
+        self.uuid = uuid
+        self.measurements = measurements
+
+
+def make_snapshot(analysis, meas_analysis):
+    """
+        analysis: a DBAnalysis synced with unpack=False
+        meas_analysis: the meas_AnalysisTable record. signal blobs must be loaded
+    """
+    ms = []
+    for dbiso in meas_analysis.isotopes:
+        if not dbiso.molecular_weight or not dbiso.signal:
+            continue
+
+        name = dbiso.molecular_weight.name
+        if name not in analysis.isotopes:
+            continue
+
+        iso = analysis.isotopes[name]
+        if dbiso.kind == 'sniff':
+            # sniffs are not regressed
+            ms.append(MeasurementSnapshot(name, 'sniff', dbiso.signal.data,
+                                          None, None, None))
+            continue
+        elif dbiso.kind == 'baseline':
+            iso = iso.baseline
+        elif dbiso.kind != 'signal':
+            continue
+
+        ms.append(MeasurementSnapshot(name, dbiso.kind, dbiso.signal.data,
+                                      iso.fit, iso.error_type,
+                                      iso.filter_outliers_dict))
+
+    return AnalysisSnapshot(analysis.uuid, ms)
+
+
+def reduce_snapshot(snapshot):
+    """
+        unpack and regress each measurement. runs in a worker process
+    """
+    for m in snapshot.measurements:
+        try:
+            xs, ys = unpack_signal(m.blob)
+        except ValueError, e:
+            m.unpack_error = str(e)
+            continue
+        finally:
+            #no need to send the blob back to the parent
+            m.blob = None
+
+        m.xs = array(xs, dtype=float)
+        m.ys = array(ys, dtype=float)
+        if len(m.xs) > 1 and m.fit:
+            kw = dict(xs=m.xs, ys=m.ys,
+                      filter_outliers_dict=m.filter_outliers_dict,
+                      error_calc_type=m.error_type or 'SEM')
+            if 'average' in m.fit.lower():
+                reg = MeanRegressor(**kw)
+            else:
+                reg = PolynomialRegressor(degree=m.fit, **kw)
+
+            reg.calculate()
+            m.value = float(reg.predict(0))
+            m.error = float(reg.predict_error(0))
+
+    return snapshot
+
+
+def apply_snapshot(analysis, snapshot, set_data=True):
+    """
+        copy the regression results into analysis.
+
+        if set_data is False only the intercepts are copied. the raw data can be added
+        later with set_snapshot_data
+    """
+    isotopes = analysis.isotopes
+    for m in snapshot.measurements:
+        if m.kind == 'signal' and m.unpack_error:
+            # same as DBAnalysis._get_signals. drop the isotope
+            analysis.warning('Bad isotope {} {}. error: {}'.format(analysis.record_id, m.name, m.unpack_error))
+            analysis.temp_status = 1
+            isotopes.pop(m.name, None)
+            continue
+
+        if m.name not in isotopes or m.value is None:
+            continue
+
+        iso = isotopes[m.name]
+        if m.kind == 'baseline':
+            iso = iso.baseline
+
+        iso.set_uvalue((m.value, m.error))
+
+    if set_data:
+        set_snapshot_data(analysis, snapshot)
+
+
+def set_snapshot_data(analysis, snapshot):
+    """
+        set the raw data. the isotopes keep the worker's fit so they are not refit
+        in this process until their data, fit or filtering change
+    """
+    isotopes = analysis.isotopes
+    for m in snapshot.measurements:
+        if m.xs is None or m.name not in isotopes:
+            continue
+
+        iso = isotopes[m.name]
+        if m.kind == 'baseline':
+            iso = iso.baseline
+        elif m.kind == 'sniff':
+            sniff = getattr(iso, 'sniff', None)
+            if sniff is None:
+                sniff = Sniff(name=m.name, detector=iso.detector)
+                iso.sniff = sniff
+            iso = sniff
+
+        iso.trait_set(xs=m.xs, ys=m.ys)
+        if m.value is not None:
+            iso.set_fit_result(m.value, m.error)
+
+    analysis.has_raw_data = True
+
+
+def snapshot_pool(processes=None):
+    """
+        processes: number of worker processes. defaults to the number of cpus
+    """
+    if not processes:
+        processes = cpu_count()
+    return Pool(processes)
+
+#============= EOF =============================================
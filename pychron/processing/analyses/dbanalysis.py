@@ -1,10 +1,10 @@
 from datetime import datetime
-import struct
 import time
 
 from traits.trait_types import Str, Float, Either, Date, Any, Dict, List
 from uncertainties import ufloat
 
+from pychron.core.helpers.binpack import unpack_signal
 from pychron.processing.analyses.analysis import Analysis, Fit
 from pychron.processing.analyses.analysis_view import DBAnalysisView
 from pychron.processing.analyses.changes import BlankChange, FitChange
@@ -172,6 +172,7 @@ class DBAnalysis(Analysis):
 
         #this is the dominant time sink
         self._sync_isotopes(meas_analysis, unpack)
+        self.has_raw_data = unpack
 
         self._sync_detector_info(meas_analysis)
         self._sync_extraction(meas_analysis)
@@ -546,9 +547,10 @@ class DBAnalysis(Analysis):
         pc = meas_analysis.peak_center
         if pc:
             center = float(pc.center)
-            packed_xy = pc.points
-            return center, zip(*[struct.unpack('<ff', packed_xy[i:i + 8])
-                                 for i in xrange(0, len(packed_xy), 8)])
+            try:
+                return center, unpack_signal(pc.points, endianness='<')
+            except ValueError:
+                return center, None
         else:
             return 0.0, None
 
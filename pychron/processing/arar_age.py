@@ -29,7 +29,6 @@ from pychron.pychron_constants import ARGON_KEYS
 
 #============= standard library imports ========================
 from uncertainties import ufloat, Variable, AffineScalarFunc
-from numpy import hstack
 #============= local library imports  ==========================
 from pychron.processing.argon_calculations import calculate_F, abundance_sensitivity_correction, age_equation, calculate_decay_factor
 from pychron.processing.arar_constants import ArArConstants
@@ -180,19 +179,39 @@ class ArArAge(Loggable):
 
     #def get_signal_value(self, k):
     #    return self._get_arar_result_attr(k)
-    def append_data(self, iso, det, x, signal, kind):
+    def append_data(self, iso, det, x, signal, kind, notify=True):
+        """
+            notify: if False the point is buffered and xs, ys are not updated until
+            the next notifying append or flush_data
+        """
         for i in (iso, '{}{}'.format(iso,det)):
             if i in self.isotopes:
                 ii = self.isotopes[i]
                 if kind in ('sniff', 'baseline'):
                     ii = getattr(ii, kind)
-                ii.xs = hstack((ii.xs, (x,)))
-                ii.ys = hstack((ii.ys, (signal,)))
+                ii.append_data(x, signal, notify=notify)
                 return True
 
         # else:
         #     self.debug('failed appending data for {}. not a current isotope {}'.format(iso, self.isotope_keys))
 
+    def set_online_regression(self, online):
+        """
+            use incremental regression for isotopes and baselines while acquiring data
+        """
+        for iso in self.isotopes.itervalues():
+            iso.set_online_regression(online)
+            iso.baseline.set_online_regression(online)
+
+    def flush_data(self):
+        """
+            push any buffered points to the isotopes, baselines and sniffs
+        """
+        for iso in self.isotopes.itervalues():
+            iso.flush_data()
+            iso.baseline.flush_data()
+            iso.sniff.flush_data()
+
     def clear_baselines(self):
         for k in self.isotopes:
             self.set_baseline(k, (0, 0))
@@ -19,8 +19,9 @@
 #============= standard library imports ========================
 import math
 from copy import deepcopy
+from collections import deque
 
-from numpy import asarray, argmax, average
+from numpy import asarray, argmax, average, hstack, cumsum
 from uncertainties import ufloat, umath
 from numpy import array
 
@@ -367,12 +368,89 @@ def overlap(a1, a2, e1, e2, overlap_sigma):
     if a1 - e1 < a2 + e2 and a1 + e1 > a2 - e2:
         return True
 
+def find_plateaus(ages, errors, signals, overlap_sigma=1, exclude=None):
+    """
+        return (start, end) indices of the longest plateau or None
+
+        a plateau is a contiguous run of steps (ignoring excluded steps) where
+        every pair of steps overlaps at overlap_sigma, at least 3 steps long
+        and containing >=50% of the total signal.
+
+        O(n). precompute the overlap bounds and the cumulative signal (prefix sums) and
+        slide a window over the steps. monotonic deques track the max lower bound and min upper
+        bound of the steps in the window so a new step can be checked against
+        all steps in the window in constant time.
+
+        equivalent to find_plateaus_naive
+    """
+    n = len(ages)
+    if exclude is None:
+        exclude = []
+    exclude = set(exclude)
+
+    ages = asarray(ages, dtype=float)
+    errors = asarray(errors, dtype=float) * overlap_sigma
+    los = ages - errors
+    his = ages + errors
+
+    csignals = hstack(([0], cumsum(asarray(signals, dtype=float))))
+    tot = csignals[-1]
+
+    idxs = [i for i in xrange(n) if i not in exclude]
+    m = len(idxs)
+
+    # ends[k]= index into idxs of the furthest step that overlaps with every step from idxs[k]
+    ends = [0] * m
+    maxlo, minhi = deque(), deque()
+    e = 0
+    for k in xrange(m):
+        while e < m:
+            j = idxs[e]
+            # does step j overlap with all steps in the window
+            if (maxlo and los[idxs[maxlo[0]]] >= his[j]) or (minhi and los[j] >= his[idxs[minhi[0]]]):
+                break
+
+            while maxlo and los[idxs[maxlo[-1]]] <= los[j]:
+                maxlo.pop()
+            maxlo.append(e)
+            while minhi and his[idxs[minhi[-1]]] >= his[j]:
+                minhi.pop()
+            minhi.append(e)
+            e += 1
+
+        ends[k] = e - 1
+
+        # slide the start of the window
+        if maxlo and maxlo[0] == k:
+            maxlo.popleft()
+        if minhi and minhi[0] == k:
+            minhi.popleft()
+
+    best = None
+    bestn = 0
+    for k in xrange(m):
+        start, end = idxs[k], idxs[ends[k]]
+        if end - start + 1 < plateau_criteria['number_steps']:
+            continue
+
+        if (csignals[end + 1] - csignals[start]) / tot < 0.5:
+            continue
+
+        if end - start > bestn:
+            bestn = end - start
+            best = start, end
+
+    return best
+
+
 #===============================================================================
 # non-recursive
 #===============================================================================
-def find_plateaus(ages, errors, signals, overlap_sigma=1, exclude=None):
+def find_plateaus_naive(ages, errors, signals, overlap_sigma=1, exclude=None):
     """
         return list of plateau indices
+
+        original brute force implementation. ~O(n**4). use find_plateaus
     """
 
     if exclude is None:
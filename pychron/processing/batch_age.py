@@ -0,0 +1,459 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+from numpy import zeros, ones, asarray, where, log, sqrt, einsum, isfinite, errstate
+from uncertainties import ufloat, nominal_value, std_dev, covariance_matrix
+#============= local library imports  ==========================
+from pychron.core.helpers.logger_setup import new_logger
+from pychron.processing.arar_constants import ArArConstants
+from pychron.pychron_constants import ARGON_KEYS
+
+logger = new_logger('BatchAge')
+
+"""
+    vectorized version of ArArAge._calculate_age.
+
+    Each quantity is carried as a nominal value array (N,) and a gradient array (N, K)
+    taken with respect to the K independent inputs of an analysis. Errors are propagated
+    linearly (same as uncertainties) as g.C.gT
+
+    usage::
+
+        batch = pack_analyses(analyses)
+        result = calculate_batch_ages(batch, include_decay_error=False)
+        result.apply(analyses)
+
+    a packed batch can be recalculated with a new J or a new set of ArArConstants without
+    touching the analyses again
+"""
+
+# indices of the independent variables
+IA40, IA39, IA38, IA37, IA36 = range(5)
+INTERFERENCE_KEYS = ('k4039', 'k3839', 'k3739', 'ca3937', 'ca3837', 'ca3637', 'cl3638')
+IK4039, IK3839, IK3739, ICA3937, ICA3837, ICA3637, ICL3638 = range(5, 12)
+IJ, ILAMBDA_K, IFIXED_K3739 = 12, 13, 14
+NVARIABLES = 15
+
+IRRAD_SLICE = slice(IK4039, ICL3638 + 1)
+
+
+class Dual(object):
+    """
+        value + gradient. minimal forward mode differentiation over numpy arrays
+    """
+    __slots__ = ('v', 'd')
+
+    def __init__(self, v, d):
+        self.v = v
+        self.d = d
+
+    def _coerce(self, o):
+        if isinstance(o, Dual):
+            return o.v, o.d
+        return o, None
+
+    def __add__(self, o):
+        v, d = self._coerce(o)
+        return Dual(self.v + v, self.d if d is None else self.d + d)
+
+    __radd__ = __add__
+
+    def __sub__(self, o):
+        v, d = self._coerce(o)
+        return Dual(self.v - v, self.d if d is None else self.d - d)
+
+    def __rsub__(self, o):
+        return (-self) + o
+
+    def __neg__(self):
+        return Dual(-self.v, -self.d)
+
+    def __mul__(self, o):
+        v, d = self._coerce(o)
+        if d is None:
+            v = asarray(v)
+            dd = self.d * v[..., None] if v.ndim else self.d * v
+            return Dual(self.v * v, dd)
+        return Dual(self.v * v, self.d * v[:, None] + d * self.v[:, None])
+
+    __rmul__ = __mul__
+
+    def __div__(self, o):
+        v, d = self._coerce(o)
+        if d is None:
+            return self * (1.0 / asarray(v, dtype=float))
+
+        r = self.v / v
+        return Dual(r, (self.d - d * r[:, None]) / v[:, None])
+
+    __truediv__ = __div__
+
+    def __rdiv__(self, o):
+        r = o / self.v
+        return Dual(r, -self.d * (r / self.v)[:, None])
+
+    __rtruediv__ = __rdiv__
+
+    def log(self):
+        return Dual(log(self.v), self.d / self.v[:, None])
+
+    def where(self, mask, other):
+        """
+            return self where mask is True otherwise other.
+            other is either a Dual or a constant
+        """
+        v, d = self._coerce(other)
+        if d is None:
+            d = zeros(self.d.shape)
+        return Dual(where(mask, self.v, v), where(mask[:, None], self.d, d))
+
+
+def variable(v, idx, n):
+    """
+        independent variable idx
+    """
+    v = asarray(v, dtype=float) * ones(n)
+    d = zeros((n, NVARIABLES))
+    d[:, idx] = 1
+    return Dual(v, d)
+
+
+def constant(v, n):
+    return Dual(asarray(v, dtype=float) * ones(n), zeros((n, NVARIABLES)))
+
+
+class AgeBatch(object):
+    """
+        packed inputs for a group of analyses.
+
+        values: (N, 5) Ar40..Ar36 intensities. baseline, blank, ic and disc corrected
+        isotope_covariance: (N, 5, 5)
+        tagged_variance: (N, 5) variance due only to the isotope signal itself. used for
+        the age error components
+        interferences, interference_variance, interference_mask: (N, 7) ordered as INTERFERENCE_KEYS
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.valid = ones(n, dtype=bool)
+
+        self.values = zeros((n, 5))
+        self.isotope_covariance = zeros((n, 5, 5))
+        self.tagged_variance = zeros((n, 5))
+
+        self.interferences = zeros((n, 7))
+        self.interference_variance = zeros((n, 7))
+        self.interference_mask = zeros((n, 7), dtype=bool)
+
+        self.j = ones(n) * 1e-4
+        self.j_variance = ones(n) * 1e-14
+
+        self.ar39decayfactor = ones(n)
+        self.ar37decayfactor = ones(n)
+        self.decay_days = zeros(n)
+
+        self.ca_k = ones(n)
+        self.cl_k = ones(n)
+
+    def set_j(self, j, j_err=None):
+        """
+            replace J for every analysis. j and j_err can be scalars or arrays
+        """
+        self.j = asarray(j, dtype=float) * ones(self.n)
+        if j_err is not None:
+            self.j_variance = (asarray(j_err, dtype=float) * ones(self.n)) ** 2
+
+
+def pack_analyses(analyses):
+    """
+        pack a list of ArArAge objects into an AgeBatch.
+
+        analyses missing one of the argon isotopes are marked invalid
+    """
+    n = len(analyses)
+    batch = AgeBatch(n)
+    for i, ai in enumerate(analyses):
+        isos = ai._assemble_ar_ar_isotopes()
+        if not isos:
+            batch.valid[i] = False
+            continue
+
+        batch.values[i] = [nominal_value(v) for v in isos]
+        batch.isotope_covariance[i] = covariance_matrix(isos)
+        for k, (key, v) in enumerate(zip(ARGON_KEYS, isos)):
+            batch.tagged_variance[i, k] = sum((e ** 2 for var, e in v.error_components().iteritems()
+                                               if var.tag == key))
+
+        ifc = ai.interference_corrections
+        for k, key in enumerate(INTERFERENCE_KEYS):
+            if key in ifc:
+                v = ifc[key]
+                batch.interferences[i, k] = nominal_value(v)
+                batch.interference_variance[i, k] = std_dev(v) ** 2
+                batch.interference_mask[i, k] = True
+
+        if ai.j is not None:
+            batch.j[i] = nominal_value(ai.j)
+            batch.j_variance[i] = std_dev(ai.j) ** 2
+
+        ai.calculate_decay_factors()
+        batch.ar39decayfactor[i] = ai.ar39decayfactor
+        batch.ar37decayfactor[i] = ai.ar37decayfactor
+        batch.decay_days[i] = ai.decay_days
+
+        prs = ai.production_ratios
+        if prs:
+            for attr, key in (('ca_k', 'Ca_K'), ('cl_k', 'Cl_K')):
+                v = prs.get(key, 1)
+                if v is None:
+                    v = 1.0
+                getattr(batch, attr)[i] = nominal_value(v)
+
+    return batch
+
+
+class BatchAgeResult(object):
+    """
+        nominal values and errors for every analysis in a batch.
+        arrays are indexed the same as the analyses passed to pack_analyses
+    """
+
+    def __init__(self, batch):
+        self.batch = batch
+
+    def apply(self, analyses):
+        """
+            copy the results into the analyses. equivalent to ArArAge.calculate_age(force=True)
+
+            uncertainties objects are rebuilt from the nominal values and errors so
+            they are not correlated with the isotopes of the analysis
+        """
+        valid = self.batch.valid
+        for i, ai in enumerate(analyses):
+            if not valid[i]:
+                ai.warning('No argon isotopes. Skipping batch age')
+                continue
+
+            ai.ar39decayfactor = self.batch.ar39decayfactor[i]
+            ai.ar37decayfactor = self.batch.ar37decayfactor[i]
+
+            u = lambda k: ufloat(self.values[k][i], self.errors[k][i], tag=k)
+
+            ai.non_ar_isotopes = dict((k, u(k)) for k in ('ca39', 'k38', 'ca38', 'k37', 'ca37', 'ca36', 'cl36'))
+            ai.computed = dict((k, u(k)) for k in ('rad40', 'rad40_percent', 'k39'))
+            ai.rad40_percent = ai.computed['rad40_percent']
+
+            for k in ARGON_KEYS:
+                ai.isotopes[k].interference_corrected_value = u('{}_ic'.format(k))
+
+            ai.uF = u('F')
+            ai.F = float(self.values['F'][i])
+            ai.F_err = float(self.errors['F'][i])
+            ai.F_err_wo_irrad = float(self.errors['F_wo_irrad'][i])
+
+            ai.uage = u('age')
+            ai.age = float(self.values['age'][i])
+            ai.age_err = float(self.errors['age'][i])
+            ai.age_err_wo_j = float(self.errors['age_wo_j'][i])
+            ai.age_err_wo_irrad = float(self.errors['age_wo_irrad'][i])
+            ai.age_err_wo_j_irrad = float(self.errors['age_wo_j_irrad'][i])
+
+            for iso in ai.isotopes.itervalues():
+                try:
+                    idx = ARGON_KEYS.index(iso.name)
+                    iso.age_error_component = float(self.age_error_components[i, idx])
+                except ValueError:
+                    iso.age_error_component = 0
+
+            if isfinite(self.values['kca'][i]):
+                ai.kca = u('kca')
+            if isfinite(self.values['kcl'][i]):
+                ai.kcl = u('kcl')
+
+
+def calculate_batch_ages(batch, arar_constants=None, include_decay_error=False):
+    """
+        vectorized ArArAge._calculate_age, _calculate_kca and _calculate_kcl
+
+        returns a BatchAgeResult
+    """
+    if arar_constants is None:
+        arar_constants = ArArConstants()
+
+    arc = arar_constants
+    n = batch.n
+
+    # variances of the non-isotope variables
+    pvar = zeros((n, NVARIABLES - 5))
+    pvar[:, IRRAD_SLICE.start - 5:IRRAD_SLICE.stop - 5] = batch.interference_variance
+    pvar[:, IJ - 5] = batch.j_variance
+    lk = arc.lambda_k
+    if include_decay_error:
+        pvar[:, ILAMBDA_K - 5] = std_dev(lk) ** 2
+    fk = arc.fixed_k3739
+    pvar[:, IFIXED_K3739 - 5] = std_dev(fk) ** 2
+
+    def errors(x, exclude=None):
+        g = x.d
+        giso = g[:, :5]
+        var = einsum('ni,nij,nj->n', giso, batch.isotope_covariance, giso)
+        pv = pvar
+        if exclude:
+            pv = pvar.copy()
+            for e in exclude:
+                if isinstance(e, slice):
+                    e = slice(e.start - 5, e.stop - 5)
+                else:
+                    e -= 5
+                pv[:, e] = 0
+        var += (g[:, 5:] ** 2 * pv).sum(axis=1)
+        return sqrt(var)
+
+    with errstate(divide='ignore', invalid='ignore'):
+        s40, s39, s38, s37, s36 = [variable(batch.values[:, i], i, n) for i in range(5)]
+
+        # abundance sensitivity. assumes symmetric and equal abundant sens for all peaks
+        ab = arc.abundance_sensitivity
+        a40 = s40 - ab * (s39 + s39)
+        a39 = (s39 - ab * (s40 + s38)) * batch.ar39decayfactor
+        a38 = s38 - ab * (s39 + s37)
+        a37 = (s37 - ab * (s38 + s36)) * batch.ar37decayfactor
+        a36 = s36 - ab * (s37 + s37)
+
+        mask = batch.interference_mask
+
+        def pr(idx, default):
+            k = idx - 5
+            v = where(mask[:, k], batch.interferences[:, k], default)
+            return variable(v, idx, n).where(mask[:, k], default)
+
+        k4039 = pr(IK4039, 1)
+        k3839 = pr(IK3839, 0)
+        k3739 = pr(IK3739, 0)
+        ca3937 = pr(ICA3937, 0)
+        ca3837 = pr(ICA3837, 0)
+        ca3637 = pr(ICA3637, 0)
+        cl3638 = pr(ICL3638, 0)
+
+        # interference corrections
+        if arc.k3739_mode.lower() == 'normal':
+            k37 = constant(0, n)
+            for _ in range(5):
+                ca37 = a37 - k37
+                ca39 = ca3937 * ca37
+                k39 = a39 - ca39
+                k37 = k3739 * k39
+        else:
+            x = variable(nominal_value(fk), IFIXED_K3739, n)
+            y = 1 / pr(ICA3937, 1)
+
+            ca37 = (a39 * x * y) / (x + y)
+            ca39 = ca3937 * ca37
+            k39 = a39 - ca39
+            k37 = x * k39
+
+        k38 = k3839 * k39
+        ca36 = ca3637 * ca37
+        ca38 = ca3837 * ca37
+
+        # atmospheric
+        m = cl3638 * (arc.lambda_Cl36.nominal_value * batch.decay_days)
+        atm3836 = arc.atm3836.nominal_value
+        atm36 = constant(0, n)
+        for _ in range(5):
+            ar38atm = atm36 * atm3836
+            cl38 = a38 - ar38atm - k38 - ca38
+            cl36 = cl38 * m
+            atm36 = a36 - ca36 - cl36
+
+        # radiogenic. dont include error in 40/36
+        atm40 = atm36 * arc.atm4036.nominal_value
+        k40 = k39 * k4039
+        rad40 = a40 - atm40 - k40
+
+        nonzero = k39.v != 0
+        f = (rad40 / k39).where(nonzero, 1.0)
+
+        nonzero = a40.v != 0
+        rp = (rad40 / a40 * 100).where(nonzero, 0)
+
+        # age
+        j = variable(batch.j, IJ, n)
+        lkv = variable(nominal_value(lk), ILAMBDA_K, n)
+        arg = j * f + 1
+        ok = arg.v > 0
+        age = (arg.where(ok, 1).log() / lkv) / float(arc.age_scalar)
+        age = age.where(ok, 0)
+
+        kca = k39 / ca37 * (1 / batch.ca_k)
+        kcl = k39 / cl36 * (1 / batch.cl_k)
+
+    result = BatchAgeResult(batch)
+
+    # values computed with the interference errors cleared. matches calculate_F
+    irrad = (IRRAD_SLICE,)
+    quantities = dict(ca39=(ca39, irrad), k38=(k38, irrad), ca38=(ca38, irrad),
+                      k37=(k37, irrad), ca37=(ca37, irrad), ca36=(ca36, irrad), cl36=(cl36, irrad),
+                      rad40=(rad40, irrad), rad40_percent=(rp, irrad), k39=(k39, irrad),
+                      Ar40_ic=(a40 - k40, irrad), Ar39_ic=(k39, irrad), Ar38_ic=(a38, irrad),
+                      Ar37_ic=(a37, irrad), Ar36_ic=(atm36, irrad),
+                      kca=(kca, irrad), kcl=(kcl, irrad),
+                      F=(f, None), F_wo_irrad=(f, irrad),
+                      age=(age, None), age_wo_j=(age, (IJ,)), age_wo_irrad=(age, irrad),
+                      age_wo_j_irrad=(age, (IJ, IRRAD_SLICE)))
+
+    values, errs = {}, {}
+    for k, (q, exclude) in quantities.iteritems():
+        values[k] = q.v
+        errs[k] = errors(q, exclude)
+
+    # ca37 or cl36 == 0. can't calculate k/ca, k/cl
+    for k in ('kca', 'kcl'):
+        bad = ~isfinite(values[k])
+        values[k][bad] = float('nan')
+
+    result.values = values
+    result.errors = errs
+
+    ae = errs['age']
+    with errstate(divide='ignore', invalid='ignore'):
+        comps = age.d[:, :5] ** 2 * batch.tagged_variance / (ae ** 2)[:, None] * 100
+    comps[~isfinite(comps)] = 0
+    result.age_error_components = comps
+
+    return result
+
+
+def calculate_ages(analyses, arar_constants=None, include_decay_error=False):
+    """
+        convenience function. pack, calculate and apply in one call
+    """
+    if not analyses:
+        return
+
+    if arar_constants is None:
+        arar_constants = analyses[0].arar_constants
+
+    batch = pack_analyses(analyses)
+    result = calculate_batch_ages(batch, arar_constants, include_decay_error)
+    result.apply(analyses)
+
+    logger.debug('batch calculated {} ages'.format(batch.n))
+    return result
+
+#============= EOF =============================================
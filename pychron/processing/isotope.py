@@ -16,11 +16,10 @@
 
 #============= enthought library imports =======================
 from binascii import hexlify
-from itertools import izip
 import re
 
 from traits.api import HasTraits, Str, Float, Property, Instance, \
-    Array, String, Either, Dict, cached_property, Event, List
+    Array, String, Either, Dict, cached_property, Event, List, on_trait_change
 
 
 
@@ -33,9 +32,11 @@ from traits.api import HasTraits, Str, Float, Property, Instance, \
 from uncertainties import ufloat, Variable, AffineScalarFunc
 from numpy import array, Inf
 from pychron.core.helpers.fits import natural_name_fit
+from pychron.core.helpers.sample_buffer import SampleBuffer
 from pychron.core.regression.mean_regressor import MeanRegressor
 from pychron.core.regression.ols_regressor import PolynomialRegressor
-import struct
+from pychron.core.regression.online_regressor import OnlineRegressor, fit_to_degree
+from pychron.core.helpers.binpack import unpack_signal, pack_signal
 #============= local library imports  ==========================
 #logger = new_logger('isotopes')
 
@@ -60,6 +61,9 @@ class BaseMeasurement(HasTraits):
     endianness = '>'
     reverse_unpack = False
 
+    _buffer = None
+    _buffer_views = None
+
     def __init__(self, dbrecord=None, unpack=False, unpacker=None, *args, **kw):
         super(BaseMeasurement, self).__init__(*args, **kw)
         # print 'uasdf', unpack, self.name, type(self)
@@ -71,15 +75,40 @@ class BaseMeasurement(HasTraits):
             except (ValueError, TypeError, IndexError, AttributeError), e:
                 self.unpack_error = e
                 return
-            self.xs = array(xs)
-            self.ys = array(ys)
+            self.xs = array(xs, dtype=float)
+            self.ys = array(ys, dtype=float)
+
+    def append_data(self, x, y, notify=True):
+        """
+            append a point to the preallocated sample buffer.
+
+            xs, ys are only updated (and change notifications fired) when notify is True.
+            use flush_data to push any pending points
+        """
+        buf = self._buffer
+        views = self._buffer_views
+        if buf is None or views[0] is not self.xs or views[1] is not self.ys:
+            # xs, ys were set externally. reseed the buffer
+            buf = SampleBuffer(xs=self.xs, ys=self.ys)
+            self._buffer = buf
+            self._buffer_views = (self.xs, self.ys)
+
+        buf.append(x, y)
+        if notify:
+            self.flush_data()
+
+    def flush_data(self):
+        buf = self._buffer
+        if buf is not None and len(buf) != len(self.xs):
+            xs, ys = buf.xs, buf.ys
+            self.trait_set(xs=xs, ys=ys)
+            self._buffer_views = (self.xs, self.ys)
 
     def pack(self, endianness=None, as_hex=True):
         if endianness is None:
             endianness = self.endianness
 
-        fmt = '{}ff'.format(endianness)
-        txt=''.join((struct.pack(fmt, x, y) for x, y in izip(self.xs, self.ys)))
+        txt = pack_signal(self.xs, self.ys, endianness)
         if as_hex:
             txt=hexlify(txt)
         return txt
@@ -88,15 +117,7 @@ class BaseMeasurement(HasTraits):
         if endianness is None:
             endianness = self.endianness
 
-        try:
-            x, y = zip(*[struct.unpack('{}ff'.format(endianness), blob[i:i + 8]) for i in xrange(0, len(blob), 8)])
-            if self.reverse_unpack:
-                return y, x
-            else:
-                return x, y
-
-        except struct.error, e:
-            print 'unpack_blob', e
+        return unpack_signal(blob, endianness, self.reverse_unpack)
 
     def _get_n(self):
         return len(self.xs)
@@ -121,6 +142,10 @@ class IsotopicMeasurement(BaseMeasurement):
     regressor = Property(depends_on='xs, ys, fit, dirty, error_type')
     dirty = Event
 
+    _online_regressor = None
+    # (value, error) of a fit of the current data calculated elsewhere, e.g. in a worker process
+    _fit_result = None
+
     def __init__(self, dbresult=None, *args, **kw):
 
         if dbresult:
@@ -185,6 +210,56 @@ class IsotopicMeasurement(BaseMeasurement):
             self.error_type=fit.error_type or 'SEM'
             self.trait_set(fit=fit.fit, trait_change_notify=notify)
 
+    def set_online_regression(self, online):
+        """
+            online=True use an incremental OnlineRegressor for value/error while acquiring data.
+            online=False go back to the full fit (with outlier filtering)
+        """
+        if online:
+            buf = self._buffer
+            if buf is not None and len(buf) >= len(self.xs):
+                xs, ys = buf.xs, buf.ys
+            else:
+                xs, ys = self.xs, self.ys
+            self._online_regressor = OnlineRegressor(xs, ys)
+        else:
+            self._online_regressor = None
+
+        self.dirty = True
+
+    def append_data(self, x, y, notify=True):
+        super(IsotopicMeasurement, self).append_data(x, y, notify=False)
+
+        reg = self._online_regressor
+        if reg is not None:
+            buf = self._buffer
+            if reg.n == len(buf) - 1:
+                reg.add(x, y)
+            else:
+                reg.clear()
+                reg.extend(buf.xs, buf.ys)
+
+        if notify:
+            self.flush_data()
+
+    def flush_data(self):
+        super(IsotopicMeasurement, self).flush_data()
+        if self._online_regressor is not None:
+            self.dirty = True
+
+    def set_fit_result(self, value, error):
+        """
+            use value, error of an existing fit of xs, ys instead of fitting them again.
+            dropped as soon as the data, fit or filtering change
+        """
+        # invalidate uvalue first. dirty also clears _fit_result
+        self.dirty = True
+        self._fit_result = value, error
+
+    @on_trait_change('xs, ys, _fit, dirty, error_type, filter_outliers_dict')
+    def _clear_fit_result(self):
+        self._fit_result = None
+
     def set_uvalue(self, v):
         if isinstance(v, tuple):
             self._value, self._error = v
@@ -207,6 +282,13 @@ class IsotopicMeasurement(BaseMeasurement):
         self._value = v
 
     def _get_value(self):
+        v = self._get_online_value()
+        if v is not None:
+            return v
+
+        if self._fit_result is not None:
+            return self._fit_result[0]
+
         if len(self.xs) > 1:  # and self.ys is not None:
             v = self.regressor.predict(0)
             return v
@@ -214,12 +296,36 @@ class IsotopicMeasurement(BaseMeasurement):
             return self._value
 
     def _get_error(self):
+        e = self._get_online_value(error=True)
+        if e is not None:
+            return e
+
+        if self._fit_result is not None:
+            return self._fit_result[1]
+
         if len(self.xs) > 1:
             v = self.regressor.predict_error(0)
             return v
         else:
             return self._error
 
+    def _get_online_value(self, error=False):
+        reg = self._online_regressor
+        if reg is None or reg.n < 2:
+            return
+
+        degree = fit_to_degree(self.fit)
+        if degree is None:
+            return
+
+        if error:
+            et = self.error_type or 'SEM'
+            if et not in ('SEM', 'SD'):
+                return
+            return reg.predict_error(0, degree, et)
+        else:
+            return reg.predict(0, degree)
+
     @cached_property
     def _get_regressor(self):
         # print '{} getting regerssior'.format(self.name)
@@ -15,10 +15,10 @@
 #===============================================================================
 
 #============= enthought library imports =======================
-from traits.api import Float, Array
+from traits.api import Float, Array, Any
 #============= standard library imports ========================
-from numpy import linspace, pi, exp, zeros, ones, array, arange, \
-    Inf
+from numpy import linspace, array, arange, \
+    Inf, array_equal
 #============= local library imports  ==========================
 
 from pychron.processing.plotters.arar_figure import BaseArArFigure
@@ -27,6 +27,7 @@ from pychron.processing.plotters.flow_label import FlowPlotLabel
 from pychron.processing.plotters.ideogram.mean_indicator_overlay import MeanIndicatorOverlay
 from pychron.core.stats.peak_detection import find_peaks
 from pychron.core.stats.core import calculate_weighted_mean
+from pychron.core.stats.probability_curves import CumulativeProbability, asymptotic_limits
 from pychron.processing.plotters.point_move_tool import OverlayMoveTool
 
 N = 500
@@ -37,6 +38,7 @@ class Ideogram(BaseArArFigure):
     xma = Float
     xs = Array
     xes = Array
+    _cumulative = Any
     # index_key = 'uage'
     ytitle = 'Relative Probability'
     #     _reverse_sorted_analyses = True
@@ -379,18 +381,12 @@ class Ideogram(BaseArArFigure):
         dp = plot.plots['Original-{}'.format(gid)][0]
         #sp = plot.plots['Mean-{}'.format(gid)][0]
 
-        def f(a):
-            i, _ = a
-            #print a, i not in sel, sel
-            return i not in sel
+        sel = set(sel)
+        fxs = [a for i, a in enumerate(self.xs) if i not in sel]
+        if fxs:
+            fxes = [e for i, e in enumerate(self.xes) if i not in sel]
 
-        d = zip(self.xs, self.xes)
-        oxs, oxes = zip(*d)
-        d = filter(f, enumerate(d))
-        if d:
-            fxs, fxes = zip(*[(a, b) for _, (a, b) in d])
-
-            xs, ys = self._calculate_probability_curve(fxs, fxes)
+            xs, ys = self._calculate_probability_curve(self.xs, self.xes, exclude=sel)
             wm, we, mswd, valid_mswd = self._calculate_stats(fxs, fxes, xs, ys)
 
             lp.value.set_data(ys)
@@ -422,7 +418,7 @@ class Ideogram(BaseArArFigure):
 
             if sel:
                 dp.visible = True
-                xs, ys = self._calculate_probability_curve(oxs, oxes)
+                xs, ys = self._calculate_probability_curve(self.xs, self.xes)
                 dp.value.set_data(ys)
                 dp.index.set_data(xs)
             else:
@@ -460,8 +456,10 @@ class Ideogram(BaseArArFigure):
                                plotid=pid)
         return s
 
-    def _calculate_probability_curve(self, ages, errors, calculate_limits=False):
-
+    def _calculate_probability_curve(self, ages, errors, calculate_limits=False, exclude=None):
+        """
+            exclude: indices of ages to leave out of the curve
+        """
         xmi, xma = self.graph.get_x_limits()
         if xmi == -Inf or xma == Inf:
             xmi, xma = self.xmi, self.xma
@@ -469,20 +467,18 @@ class Ideogram(BaseArArFigure):
         opt = self.options
 
         if opt.probability_curve_kind == 'kernel':
+            if exclude:
+                ages = [a for i, a in enumerate(ages) if i not in exclude]
             return self._kernel_density(ages, errors, xmi, xma)
 
         else:
             if opt.use_asymptotic_limits and calculate_limits:
-                cfunc = lambda x1, x2: self._cumulative_probability(ages, errors, x1, x2)
-                # bins,probs=cfunc(xmi,xma)
-                bins, probs, x1, x2 = self._calculate_asymptotic_limits(cfunc, xmi, xma,
-                                                                        asymptotic_width=opt.asymptotic_width)
+                x1, x2 = asymptotic_limits(ages, errors, xmi, xma,
+                                           asymptotic_width=opt.asymptotic_width)
                 self.trait_setq(xmi=x1, xma=x2)
-                # print x1, x2
-                # self.xmi, self.xma=x1,x2
-                return bins, probs
-            else:
-                return self._cumulative_probability(ages, errors, xmi, xma)
+                xmi, xma = x1, x2
+
+            return self._cumulative_probability(ages, errors, xmi, xma, exclude=exclude)
 
     def _kernel_density(self, ages, errors, xmi, xma):
         from scipy.stats.kde import gaussian_kde
@@ -493,75 +489,23 @@ class Ideogram(BaseArArFigure):
 
         return x, y
 
-    def _cumulative_probability(self, ages, errors, xmi, xma):
-        bins = linspace(xmi, xma, N)
-        probs = zeros(N)
-
-        for ai, ei in zip(ages, errors):
-            if abs(ai) < 1e-10 or abs(ei) < 1e-10:
-                continue
-
-            # calculate probability curve for ai+/-ei
-            # p=1/(2*p*sigma2) *exp (-(x-u)**2)/(2*sigma2)
-            # see http://en.wikipedia.org/wiki/Normal_distribution
-            ds = (ones(N) * ai - bins) ** 2
-            es = ones(N) * ei
-            es2 = 2 * es * es
-            gs = (es2 * pi) ** -0.5 * exp(-ds / es2)
-
-            # cumulate probabilities
-            # numpy element_wise addition
-            probs += gs
-
-        return bins, probs
-
-    def _calculate_asymptotic_limits(self, cfunc, xmi, xma,
-                                     max_iter=200, asymptotic_width=1,
-                                     tol=0.1):
+    def _cumulative_probability(self, ages, errors, xmi, xma, exclude=None):
         """
-            cfunc: callable that returns xs,ys and accepts xmin, xmax
-                    xs, ys= cfunc(x1,x2)
-
-            asymptotic_width=width of asymptotic section in index units (Ma,ka)
-                    Essentially amount of white space at either end
-
-            returns xs,ys,xmi,xma
+            the CumulativeProbability for the last set of ages is cached so
+            toggling the selection only subtracts the excluded kernels
         """
-        rx1, rx2 = None, None
-        step = asymptotic_width * 0.25
-        N2 = N / 2.0
-        for i in xrange(max_iter):
-            x1, x2 = xmi - step * i, xma + step * i
-            xs, ys = cfunc(x1, x2)
-
-            bin_per_ma = N / (x2 - x1)
-
-            aw = int(asymptotic_width * bin_per_ma)
-            if aw > N2:
-                continue
-
-            if aw < 1:
-                break
-
-            low = ys[:aw]
-            high = ys[-aw:]
-
-            tt = tol * max(ys)
-            # print tt, low.mean(), high.mean(), aw, bin_per_ma, asymptotic_width, xmi, xma
-            if low.mean() < tt:  # and low.std()<std_tol:
-                rx1 = x1
-            if high.mean() < tt:  # and high.std()<std_tol:
-                rx2 = x2
-            if rx1 is not None and rx2 is not None:
-                break
-
-        if rx1 is None:
-            rx1 = x1
-        if rx2 is None:
-            rx2 = x2
+        cp = self._cumulative
+        if cp is None or not cp.matches(xmi, xma, N) or \
+                not array_equal(cp.ages, ages) or not array_equal(cp.errors, errors):
+            cp = CumulativeProbability(ages, errors, xmi, xma, n=N)
+            self._cumulative = cp
+
+        if exclude:
+            probs = cp.excluding(sorted(exclude))
+        else:
+            probs = cp.probs.copy()
 
-        # print 'x1,x2',rx1, rx2
-        return xs, ys, rx1, rx2
+        return cp.bins, probs
 
     def _cmp_analyses(self, x):
         return x.age
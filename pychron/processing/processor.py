@@ -35,6 +35,7 @@ from pychron.database.orms.isotope.meas import meas_AnalysisTable, meas_Measurem
 # from pychron.processing.plotters.inverse_isochron import InverseIsochron
 # from pychron.processing.plotters.series import Series
 from pychron.core.helpers.iterfuncs import partition
+from pychron.processing.references import merge_windows, assign_references
 # from pychron.processing.plotters import plotter_options
 
 
@@ -78,6 +79,53 @@ class Processor(IsotopeDatabaseManager):
         # ar = self._find_analyses(ms, post, delta, atype, **kw)
         # return br + ar
 
+    def find_associated_analyses_batch(self, analyses, delta=12, limit=10, atype=None,
+                                       exclude_uuids=None, **kw):
+        """
+            find_associated_analyses for a list of analyses.
+
+            returns a list of references per analysis, the same as calling find_associated_analyses
+            for each analysis in turn with exclude_uuids holding the uuids found so far.
+
+            the windows are grouped by mass spectrometer and analysis type and overlapping
+            windows are merged so there is one query per merged window. the references are
+            then assigned to the analyses in memory
+        """
+        dt = timedelta(hours=delta)
+        keys = []
+        groups = {}
+        for ai in analyses:
+            post = ai.timestamp
+            if isinstance(post, float):
+                post = datetime.fromtimestamp(post)
+
+            at = atype
+            if at is None:
+                at = 'blank_{}'.format(ai.analysis_type)
+
+            g = (ai.mass_spectrometer, at)
+            w = (post - dt, post + dt)
+            keys.append((g, w))
+            groups.setdefault(g, []).append(w)
+
+        refs = {}
+        for (ms, at), ws in groups.iteritems():
+            rs = []
+            for lpost, hpost in merge_windows(ws):
+                rs.extend(self._filter_analyses(ms, lpost, hpost, None, at, **kw) or [])
+
+            refs[(ms, at)] = sorted(rs, key=lambda x: x.analysis_timestamp)
+
+        taken = set(exclude_uuids or [])
+        found = {}
+        for g, rs in refs.iteritems():
+            idxs = [i for i, (gi, _) in enumerate(keys) if gi == g]
+            fs = assign_references([keys[i][1] for i in idxs], rs, limit, taken)
+            for i, fi in zip(idxs, fs):
+                found[i] = fi
+
+        return [found[i] for i in xrange(len(keys))]
+
     def group_level(self, level, irradiation=None, monitor_filter=None):
         if monitor_filter is None:
             def monitor_filter(pos):
@@ -425,6 +473,9 @@ class Processor(IsotopeDatabaseManager):
         func = getattr(self, '_apply_{}_correction'.format(kind))
         func(history, analysis, fit_obj, set_id)
 
+        #blanks/ic changed. cached analysis is stale
+        self.remove_from_cache(analysis)
+
     def _apply_detector_intercalibration_correction(self, history, analysis, fit_obj, set_id):
         n, d = fit_obj.name.split('/')
 
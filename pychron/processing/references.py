@@ -0,0 +1,82 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import time
+
+from numpy import array, searchsorted
+#============= local library imports  ==========================
+
+
+def to_seconds(dt):
+    return time.mktime(dt.timetuple()) + dt.microsecond * 1e-6
+
+
+def merge_windows(windows):
+    """
+        merge overlapping (low, high) windows. returns the merged windows sorted by low
+    """
+    merged = []
+    for lo, hi in sorted(windows):
+        if merged and lo <= merged[-1][1]:
+            if hi > merged[-1][1]:
+                merged[-1][1] = hi
+        else:
+            merged.append([lo, hi])
+
+    return [tuple(m) for m in merged]
+
+
+def assign_references(windows, references, limit, taken=None, key=None):
+    """
+        windows: (low, high) per unknown, in the order the unknowns are processed
+        references: candidate references sorted by time
+        key: func returning a reference's time, comparable with low and high
+
+        each unknown gets up to limit of the most recent references in its window
+        that have not been assigned to a previous unknown, i.e. what a query ordered by
+        time desc with limit and a NOT IN of the references already found returns.
+
+        returns a list of references per window
+    """
+    if key is None:
+        key = lambda r: r.analysis_timestamp
+    if taken is None:
+        taken = set()
+
+    ts = array([to_seconds(key(r)) for r in references])
+
+    found = []
+    for lo, hi in windows:
+        s = searchsorted(ts, to_seconds(lo), side='left')
+        e = searchsorted(ts, to_seconds(hi), side='right')
+
+        fs = []
+        for i in xrange(e - 1, s - 1, -1):
+            if len(fs) == limit:
+                break
+
+            r = references[i]
+            if r.uuid not in taken:
+                taken.add(r.uuid)
+                fs.append(r)
+
+        found.append(fs)
+
+    return found
+
+#============= EOF =============================================
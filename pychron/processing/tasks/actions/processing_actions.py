@@ -228,10 +228,9 @@ class ClearAnalysisCacheAction(Action):
     image = icon('edit-clear')
 
     def perform(self, event=None):
-        from pychron.database.isotope_database_manager import ANALYSIS_CACHE, ANALYSIS_CACHE_COUNT
+        from pychron.database.isotope_database_manager import ANALYSIS_CACHE
 
         ANALYSIS_CACHE.clear()
-        ANALYSIS_CACHE_COUNT.clear()
 
 
 class ExportAnalysesAction(Action):
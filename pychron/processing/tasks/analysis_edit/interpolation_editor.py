@@ -192,28 +192,22 @@ class InterpolationEditor(GraphEditor):
     def _find_references(self, progress=None):
 
         self.debug('find references {}'.format(progress))
-        ans = []
         proc = self.processor
-        uuids = []
         with proc.db.session_ctx():
             n = len(self.analyses)
 
             if n > 1:
                 if progress is None:
-                    progress = proc.open_progress(n+1)
+                    progress = proc.open_progress(2)
                 else:
-                    progress.increase_max(n)
-
-            for ui in self.analyses:
-                if progress:
-                    progress.change_message('Finding associated analyses for {}'.format(ui.record_id))
-
-                for ai in proc.find_associated_analyses(ui,
-                                                        atype=self.default_reference_analysis_type,
-                                                        exclude_uuids=uuids):
-                    if not ai.uuid in uuids:
-                        uuids.append(ai.uuid)
-                        ans.append(ai)
+                    progress.increase_max(1)
+
+            if progress:
+                progress.change_message('Finding associated analyses for {} analyses'.format(n))
+
+            found = proc.find_associated_analyses_batch(self.analyses,
+                                                        atype=self.default_reference_analysis_type)
+            ans = [ai for fi in found for ai in fi]
 
             self.debug('find references pre make')
             ans = sorted(list(ans), key=lambda x: x.analysis_timestamp)
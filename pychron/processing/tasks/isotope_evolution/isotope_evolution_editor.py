@@ -90,7 +90,7 @@ class IsotopeEvolutionEditor(GraphEditor):
                 #prog.change_message('{} Saving ArAr age'.format(unk.record_id))
                 #proc.save_arar(unk, meas_analysis)
 
-            self.remove_from_cache(unk)
+            proc.remove_from_cache(unk)
 
         progress.soft_close()
 
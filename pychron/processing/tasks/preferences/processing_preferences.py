@@ -41,6 +41,10 @@ class ProcessingPreferences(BasePreferencesHelper):
         else:
             return v
 
+    use_process_pool = Bool
+    process_pool_size = Int
+
+
 class ProcessingPreferencesPane(PreferencesPane):
     model_factory = ProcessingPreferences
     category = 'Processing'
@@ -52,7 +56,16 @@ class ProcessingPreferencesPane(PreferencesPane):
             label='Recent',
             show_border=True)
 
-        v = View(recent_grp)
+        pool_grp = Group(
+            Item('use_process_pool', label='Use Process Pool',
+                 tooltip='Unpack and regress raw data in parallel worker processes when loading analyses'),
+            Item('process_pool_size', label='Processes',
+                 enabled_when='use_process_pool',
+                 tooltip='Number of worker processes. 0= number of cpus'),
+            label='Loading',
+            show_border=True)
+
+        v = View(recent_grp, pool_grp)
         return v
 
 
@@ -16,18 +16,18 @@
 from pychron.core.helpers.filetools import to_bool
 
 #============= enthought library imports =======================
-from scipy import optimize
 from traits.api import HasTraits, List, Any, Property, Float, Event, Str, Bool
 from traitsui.api import View, Item, VGroup, HGroup, Spring, \
     RangeEditor
 
 #============= standard library imports ========================
 import os
-import csv
 import time
-from numpy import min, nonzero, array, asarray
+
+from numpy import isnan
 #============= local library imports  ==========================
 from pychron.paths import paths
+from pychron.spectrometer.magnet_calibration import FieldTable
 # import math
 # from pychron.graph.graph import Graph
 from pychron.spectrometer.spectrometer_device import SpectrometerDevice
@@ -55,17 +55,6 @@ def get_detector_name(det):
     return det
 
 
-def mass_cal_func(p, x):
-    return p[2] + (p[0] ** 2 * x / p[1]) ** 0.5
-
-
-def least_squares(func, xs, ys, initial_guess):
-    xs, ys = asarray(xs), asarray(ys)
-    errfunc = lambda p, x, v: func(p, x) - v
-    ret, info = optimize.leastsq(errfunc, initial_guess, args=(xs, ys))
-    return ret
-
-
 class Magnet(SpectrometerDevice):
     _mftable = None
 
@@ -108,24 +97,18 @@ class Magnet(SpectrometerDevice):
 
         self.info('update mftable {} {}'.format(isotope, dac))
 
-        d, header = self._get_mftable()
-
-        isos, xs, ys = map(array, d[det][:3])
+        table = self._get_mftable()
+        cal = table[det]
 
         try:
-            refindex = min(nonzero(isos == isotope)[0])
+            refindex = cal.isotopes.index(isotope)
 
-            delta = dac - ys[refindex]
+            delta = dac - cal.dacs[refindex]
             # need to calculate all ys
-            # using simple linear offset
-            #ys += delta
-            for k, (iso, xx, yy, _) in d.iteritems():
-                ny = yy + delta
-                p = least_squares(mass_cal_func, xx, ny, [ny[0], xx[0], 0])
-                d[k] = iso, xx, ny, p
-
-            self.dump(isos, header, d)
-            #self._mftable = isos, xs, ys
+            # using simple linear offset.
+            # the offset is absorbed by the constant term of the fit so nothing is refit
+            table.shift(delta)
+            table.dump(cal.isotopes)
 
         except ValueError:
             import traceback
@@ -193,43 +176,34 @@ class Magnet(SpectrometerDevice):
         if d is not None:
             self._dac = d
 
-    def dump(self, isos, header, d):
-        p = os.path.join(paths.spectrometer_dir, 'mftable.csv')
-        with open(p, 'w') as f:
-            writer = csv.writer(f)
-
-            writer.writerow(['iso'] + header)
-
-            for i, iso in enumerate(isos):
-                a = [iso]
-                for hi in header:
-                    iso, xs, ys, _ = d[hi]
-                    a.append(ys[i])
-
-                writer.writerow(a)
-
     #===============================================================================
     # mapping
     #===============================================================================
     def map_dac_to_mass(self, dac, detname):
+        """
+            dac: scalar or array
+
+            dacs outside the calibration map to nan and are logged as a warning
+        """
         detname = get_detector_name(detname)
 
-        d, _ = self._get_mftable()
-        _, xs, ys, p = d[detname]
+        cal = self._get_mftable()[detname]
+        mass = cal.get_mass(dac)
 
-        def func(x, *args):
-            c = list(p)
-            c[-1] -= dac
-            return mass_cal_func(c, x)
+        nbad = isnan(mass).sum()
+        if nbad:
+            self.warning('{} dac value(s) outside the {} calibration. mass=nan'.format(nbad, detname))
 
-        mass = optimize.brentq(func, 0, 200)
         return mass
 
     def map_mass_to_dac(self, mass, detname):
+        """
+            mass: scalar or array
+        """
         detname = get_detector_name(detname)
-        d, _ = self._get_mftable()
-        _, xs, ys, p = d[detname]
-        dac = mass_cal_func(p, mass)
+
+        cal = self._get_mftable()[detname]
+        dac = cal.get_dac(mass)
 
         self.debug('map mass to dac {} >> {}'.format(mass, dac))
 
@@ -249,51 +223,22 @@ class Magnet(SpectrometerDevice):
         return next((k for k, v in molweights.iteritems() if abs(v - m) < 0.001), None)
 
     def _get_mftable(self):
-        if not self._mftable:
-            self._mftable = self._load_mftable()
+        table = self._mftable
+        if table is None or table.is_stale():
+            self._mftable = table = self._load_mftable()
 
-        return self._mftable
+        return table
 
     def _load_mftable(self):
         p = os.path.join(paths.spectrometer_dir, 'mftable.csv')
         self.info('loading mftable {}'.format(p))
         if os.path.isfile(p):
-            with open(p, 'U') as f:
-                reader = csv.reader(f)
-                if self.spectrometer:
-                    molweights = self.spectrometer.molecular_weights
-                else:
-                    from pychron.spectrometer.molecular_weights import MOLECULAR_WEIGHTS as molweights
-
-                header = map(str.strip, reader.next()[1:])
-                d = {}
-                for line in reader:
-                    iso = line[0]
-                    try:
-                        mw = molweights[iso]
-                    except KeyError:
-                        continue
-
-                    for i, li in enumerate(line[1:]):
-                        hi = header[i]
-                        try:
-                            li = float(li)
-                        except (TypeError, ValueError):
-                            continue
-
-                        if hi in d:
-                            isos, xs, ys = d[hi]
-                            isos.append(iso)
-                            xs.append(mw)
-                            ys.append(li)
-                        else:
-                            d[hi] = [iso], [mw], [li]
-
-            for k, (isos, xs, ys) in d.iteritems():
-                cs = least_squares(mass_cal_func, xs, ys, [ys[0], xs[0], 0])
-                d[k] = (isos, xs, ys, cs)
-
-            return d, header
+            if self.spectrometer:
+                molweights = self.spectrometer.molecular_weights
+            else:
+                from pychron.spectrometer.molecular_weights import MOLECULAR_WEIGHTS as molweights
+
+            return FieldTable(p, molweights)
         else:
             self.warning_dialog('No Magnet Field Table. Create {}'.format(p))
 
@@ -0,0 +1,210 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import os
+import csv
+
+from numpy import asarray, array, where, nan, linspace, interp, diff
+from scipy import optimize
+#============= local library imports  ==========================
+
+
+def mass_cal_func(p, x):
+    return p[2] + (p[0] ** 2 * x / p[1]) ** 0.5
+
+
+def mass_cal_inverse(p, y):
+    """
+        analytic inverse of mass_cal_func. nan where y is below the offset p[2]
+    """
+    d = asarray(y, dtype=float) - p[2]
+    return where(d >= 0, d ** 2 * p[1] / p[0] ** 2, nan)
+
+
+def least_squares(func, xs, ys, initial_guess):
+    xs, ys = asarray(xs), asarray(ys)
+    errfunc = lambda p, x, v: func(p, x) - v
+    ret, info = optimize.leastsq(errfunc, initial_guess, args=(xs, ys))
+    return ret
+
+
+# fit functions with a closed form inverse
+INVERSES = {mass_cal_func: mass_cal_inverse}
+
+# fit functions with an additive constant term. {func: index of the term}
+OFFSETS = {mass_cal_func: 2}
+
+
+def _scalar_or_array(v, like):
+    if asarray(like).ndim == 0:
+        return float(v)
+    return v
+
+
+class MagnetCalibration(object):
+    """
+        mass <-> dac mapping of one detector.
+
+        get_dac and get_mass accept scalars or arrays. get_mass uses the analytic
+        inverse of the fit function if there is one, otherwise a monotonic lookup
+        table evaluated over mass_range once and interpolated
+    """
+
+    def __init__(self, isotopes, masses, dacs, func=mass_cal_func, coeffs=None,
+                 mass_range=(0, 200), npts=20000):
+        self.isotopes = list(isotopes)
+        self.masses = array(masses, dtype=float)
+        self.dacs = array(dacs, dtype=float)
+        self.func = func
+        self.mass_range = mass_range
+        self.npts = npts
+
+        if coeffs is None:
+            coeffs = least_squares(func, self.masses, self.dacs,
+                                   [self.dacs[0], self.masses[0], 0])
+        self.coeffs = array(coeffs, dtype=float)
+
+        self._inverse = INVERSES.get(func)
+        self._table = None
+
+    def get_dac(self, mass):
+        return _scalar_or_array(self.func(self.coeffs, asarray(mass, dtype=float)), mass)
+
+    def get_mass(self, dac):
+        """
+            nan for dacs without a mass, i.e. below the offset or outside the lookup table
+        """
+        if self._inverse:
+            m = self._inverse(self.coeffs, dac)
+        else:
+            ds, ms = self._get_table()
+            m = interp(asarray(dac, dtype=float), ds, ms, left=nan, right=nan)
+
+        return _scalar_or_array(m, dac)
+
+    def shifted(self, delta):
+        """
+            return a calibration with all dacs offset by delta.
+            if the fit function has a constant term it absorbs the offset and no refit is needed
+        """
+        coeffs = None
+        idx = OFFSETS.get(self.func)
+        if idx is not None:
+            coeffs = self.coeffs.copy()
+            coeffs[idx] += delta
+
+        return MagnetCalibration(self.isotopes, self.masses, self.dacs + delta,
+                                 func=self.func, coeffs=coeffs,
+                                 mass_range=self.mass_range, npts=self.npts)
+
+    def _get_table(self):
+        if self._table is None:
+            ms = linspace(self.mass_range[0], self.mass_range[1], self.npts)
+            ds = self.func(self.coeffs, ms)
+            if ds[-1] < ds[0]:
+                ms, ds = ms[::-1], ds[::-1]
+
+            # keep the monotonic part so interp is well defined
+            keep = diff(ds) > 0
+            ms = ms[1:][keep]
+            ds = ds[1:][keep]
+
+            self._table = ds, ms
+        return self._table
+
+
+class FieldTable(object):
+    """
+        mftable.csv. one MagnetCalibration per detector.
+
+        the table remembers the modification time of the file so it is only
+        reloaded (and refit) when the file changes
+    """
+
+    def __init__(self, path, molweights):
+        self.path = path
+        self.molweights = molweights
+        self.header = []
+        self.calibrations = {}
+        self.mtime = None
+
+        self.load()
+
+    def load(self):
+        with open(self.path, 'U') as f:
+            reader = csv.reader(f)
+
+            header = map(str.strip, reader.next()[1:])
+            d = {}
+            for line in reader:
+                iso = line[0]
+                try:
+                    mw = self.molweights[iso]
+                except KeyError:
+                    continue
+
+                for i, li in enumerate(line[1:]):
+                    hi = header[i]
+                    try:
+                        li = float(li)
+                    except (TypeError, ValueError):
+                        continue
+
+                    isos, xs, ys = d.setdefault(hi, ([], [], []))
+                    isos.append(iso)
+                    xs.append(mw)
+                    ys.append(li)
+
+        self.header = header
+        self.calibrations = dict((k, MagnetCalibration(*v)) for k, v in d.iteritems())
+        self.mtime = self._get_mtime()
+
+    def dump(self, isos):
+        with open(self.path, 'w') as f:
+            writer = csv.writer(f)
+
+            writer.writerow(['iso'] + self.header)
+
+            for i, iso in enumerate(isos):
+                a = [iso]
+                for hi in self.header:
+                    a.append(self.calibrations[hi].dacs[i])
+
+                writer.writerow(a)
+
+        self.mtime = self._get_mtime()
+
+    def is_stale(self):
+        return self._get_mtime() != self.mtime
+
+    def shift(self, delta):
+        """
+            offset every detector's calibration by delta
+        """
+        self.calibrations = dict((k, c.shifted(delta)) for k, c in self.calibrations.iteritems())
+
+    def _get_mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            pass
+
+    def __getitem__(self, det):
+        return self.calibrations[det]
+
+#============= EOF =============================================
@@ -0,0 +1,88 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    compare ArArAge.calculate_age against the vectorized batch_age engine
+    for synthetic groups of 10 to 10,000 analyses
+"""
+from pychron.core.ui import set_qt
+
+set_qt()
+#============= standard library imports ========================
+import time
+import random
+from uncertainties import ufloat
+#============= local library imports  ==========================
+from pychron.processing.arar_age import ArArAge
+from pychron.processing.batch_age import pack_analyses, calculate_batch_ages
+
+
+def make_analysis():
+    a = ArArAge()
+    for k, v in (('Ar40', 100), ('Ar39', 10), ('Ar38', 0.5), ('Ar37', 2), ('Ar36', 0.1)):
+        v *= random.uniform(0.5, 1.5)
+        a.set_isotope(k, (v, v * 0.005))
+        a.set_blank(k, (v * 0.01, v * 0.001))
+
+    a.j = ufloat(5e-4, 1e-6)
+    a.interference_corrections = dict(k4039=ufloat(0.01, 0.001),
+                                      k3839=ufloat(0.013, 0.0001),
+                                      k3739=ufloat(0.0001, 0.00001),
+                                      ca3937=ufloat(0.0007, 0.00001),
+                                      ca3837=ufloat(0.00003, 0.000001),
+                                      ca3637=ufloat(0.00026, 0.00001),
+                                      cl3638=ufloat(250, 10))
+    a.timestamp = 100 * 24 * 3600.
+    a.chron_segments = [(1, 0.5, 100)]
+    return a
+
+
+def bench(n):
+    ans = [make_analysis() for _ in xrange(n)]
+    arc = ans[0].arar_constants
+
+    st = time.time()
+    for ai in ans:
+        ai.calculate_age(force=True)
+    serial = time.time() - st
+
+    st = time.time()
+    batch = pack_analyses(ans)
+    pack = time.time() - st
+
+    st = time.time()
+    r = calculate_batch_ages(batch, arc)
+    calc = time.time() - st
+
+    st = time.time()
+    r.apply(ans)
+    apply_ = time.time() - st
+
+    # recalculate after a J change. only the vectorized pass is repeated
+    batch.set_j(6e-4, 1e-6)
+    st = time.time()
+    calculate_batch_ages(batch, arc)
+    recalc = time.time() - st
+
+    print '{:>6d} serial={:0.4f} pack={:0.4f} calculate={:0.4f} apply={:0.4f} ' \
+          'recalculate={:0.4f} speedup={:0.1f}x'.format(n, serial, pack, calc, apply_, recalc,
+                                                       serial / max(recalc, 1e-9))
+
+
+if __name__ == '__main__':
+    for ni in (10, 100, 1000, 10000):
+        bench(ni)
+
+#============= EOF =============================================
@@ -0,0 +1,81 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    sustained counts/second writing 10 detectors per count.
+
+    per_row: the previous writer. get_table, append one row and flush for every detector
+    buffered: H5BufferedWriter
+"""
+#============= standard library imports ========================
+import os
+import time
+import random
+import tempfile
+#============= local library imports  ==========================
+from pychron.managers.data_managers.buffered_writer import H5BufferedWriter
+from pychron.managers.data_managers.h5_data_manager import H5DataManager
+
+DETS = ['H2', 'H1', 'AX', 'L1', 'L2', 'CDD', 'D1', 'D2', 'D3', 'D4']
+NCOUNTS = 2000
+
+
+def build(dm):
+    grp = dm.new_group('signal')
+    for d in DETS:
+        isogrp = dm.new_group('Ar{}'.format(d), parent=grp)
+        dm.new_table(isogrp, d)
+
+
+def per_row(dm, x):
+    for d in DETS:
+        t = dm.get_table(d, '/signal/Ar{}'.format(d))
+        nrow = t.row
+        nrow['time'] = x
+        nrow['value'] = random.random()
+        nrow.append()
+        t.flush()
+
+
+def bench(name, func, **kw):
+    p = os.path.join(tempfile.mkdtemp(), 'bench.hdf5')
+    dm = H5DataManager()
+    with dm.open_file(p, 'w'):
+        build(dm)
+        writer = H5BufferedWriter(dm, **kw)
+        st = time.time()
+        for i in xrange(NCOUNTS):
+            func(dm, writer, i)
+        writer.close()
+        dur = time.time() - st
+
+    with dm.open_file(p, 'r'):
+        n = sum(dm.get_table(d, '/signal/Ar{}'.format(d)).nrows for d in DETS)
+    assert n == NCOUNTS * len(DETS)
+
+    print '{:<24s} {:8.0f} counts/s flushes={}'.format(name, NCOUNTS / dur, writer.nflushes)
+
+
+if __name__ == '__main__':
+    bench('per_row', lambda dm, w, i: per_row(dm, i))
+
+    def buffered(dm, w, i):
+        for d in DETS:
+            w.write(d, '/signal/Ar{}'.format(d), i, random.random())
+
+    for rows in (10, 50, 500):
+        bench('buffered rows={}'.format(rows), buffered, flush_rows=rows)
+
+#============= EOF =============================================
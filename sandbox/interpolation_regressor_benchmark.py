@@ -0,0 +1,69 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    blank predictions for NUNKNOWNS unknowns from NREFS references for each of NISOS isotopes
+
+    per point: the previous InterpolationRegressor._predict, one *_predictors call per x
+    array:     *_predictions on the whole array
+"""
+#============= standard library imports ========================
+import time
+
+from numpy import linspace, random, array, abs as nabs
+#============= local library imports  ==========================
+from pychron.core.regression.interpolation_regressor import InterpolationRegressor
+
+NUNKNOWNS = 2000
+NREFS = 200
+NISOS = 5
+KINDS = ('preceding', 'bracketing average', 'bracketing interpolate')
+
+
+def bench(name, func, regs, xs):
+    st = time.time()
+    res = [(func(r, xs, 'value'), func(r, xs, 'error')) for r in regs]
+    dur = time.time() - st
+    print '{:<10s} {:10.2f} ms {:10.2f} us/point'.format(name, dur * 1000, dur / (2 * NUNKNOWNS * NISOS) * 1e6)
+    return res
+
+
+def per_point(reg, xs, attr):
+    func = getattr(reg, '{}_predictors'.format(reg.kind.replace(' ', '_')))
+    return array([func(xi, attr) for xi in xs], dtype=float)
+
+
+def vectorized(reg, xs, attr):
+    func = getattr(reg, '{}_predictions'.format(reg.kind.replace(' ', '_')))
+    return func(xs, attr)
+
+
+if __name__ == '__main__':
+    rxs = linspace(0, 1000, NREFS)
+    xs = random.uniform(1, 999, NUNKNOWNS)
+    for kind in KINDS:
+        print kind
+        regs = [InterpolationRegressor(xs=rxs,
+                                       ys=random.normal(10, 1, NREFS),
+                                       yserr=random.uniform(0.1, 0.5, NREFS),
+                                       kind=kind) for _ in range(NISOS)]
+
+        a = bench('per point', per_point, regs, xs)
+        b = bench('array', vectorized, regs, xs)
+        print 'max |array-per point|={:0.2e}'.format(max(nabs(ai - bi).max()
+                                                         for ar, br in zip(a, b)
+                                                         for ai, bi in zip(ar, br)))
+
+#============= EOF =============================================
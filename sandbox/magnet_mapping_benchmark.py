@@ -0,0 +1,70 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    dac -> mass for a magnet scan of NSTEPS steps on NDETS detectors
+
+    brentq:   the previous Magnet.map_dac_to_mass. root finding over [0, 200] per point
+    analytic: MagnetCalibration.get_mass on the whole scan
+    table:    MagnetCalibration.get_mass with the lookup table fallback
+"""
+#============= standard library imports ========================
+import time
+
+from numpy import linspace, array, abs as nabs
+from scipy import optimize
+#============= local library imports  ==========================
+from pychron.spectrometer.magnet_calibration import MagnetCalibration, mass_cal_func, INVERSES
+
+NSTEPS = 1000
+NDETS = 6
+MASSES = [35.96, 36.97, 38.96, 39.96]
+
+
+def brentq_mass(p, dac):
+    def func(x):
+        c = list(p)
+        c[-1] -= dac
+        return mass_cal_func(c, x)
+
+    return optimize.brentq(func, 0, 200)
+
+
+def bench(name, func, cals, dacs):
+    st = time.time()
+    res = [func(c, dacs) for c in cals]
+    dur = time.time() - st
+    print '{:<10s} {:10.2f} ms {:10.2f} us/point'.format(name, dur * 1000, dur / (NSTEPS * NDETS) * 1e6)
+    return res
+
+
+if __name__ == '__main__':
+    cals = [MagnetCalibration(MASSES, MASSES, mass_cal_func([1.2 + i * 0.01, 1, 0.05], array(MASSES)))
+            for i in range(NDETS)]
+    dacs = linspace(cals[0].get_dac(35), cals[0].get_dac(41), NSTEPS)
+
+    a = bench('brentq', lambda c, ds: array([brentq_mass(c.coeffs, d) for d in ds]), cals, dacs)
+    b = bench('analytic', lambda c, ds: c.get_mass(ds), cals, dacs)
+
+    INVERSES.clear()
+    for c in cals:
+        c._inverse = None
+    t = bench('table', lambda c, ds: c.get_mass(ds), cals, dacs)
+
+    print 'max |analytic-brentq|={:0.2e} max |table-brentq|={:0.2e}'.format(
+        max(nabs(ai - bi).max() for ai, bi in zip(a, b)),
+        max(nabs(ai - ti).max() for ai, ti in zip(a, t)))
+
+#============= EOF =============================================
@@ -0,0 +1,126 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    build a sqlite fixture database and compare the number of queries needed to
+    sync DBAnalysis objects with lazy loading (get_analysis_uuid per record) vs.
+    bulk eager loading (get_analyses_uuid)
+"""
+from pychron.core.ui import set_qt
+
+set_qt()
+#============= standard library imports ========================
+import os
+import time
+import tempfile
+import random
+from datetime import datetime
+from sqlalchemy import event
+#============= local library imports  ==========================
+from pychron.core.helpers.binpack import pack_signal
+from pychron.database.offline_bridge import OfflineBridge
+from pychron.processing.analyses.dbanalysis import DBAnalysis
+
+NANALYSES = 200
+ISOTOPES = [('Ar40', 39.962), ('Ar39', 38.964), ('Ar38', 37.963), ('Ar37', 36.967), ('Ar36', 35.967)]
+
+
+def build_fixture(p, n=NANALYSES):
+    db = OfflineBridge()
+    db.init(p)
+
+    with db.session_ctx():
+        db.add_mass_spectrometer('jan')
+        db.add_analysis_type('unknown')
+        db.add_detector('H1')
+        db.add_extraction_device('Fusions CO2')
+        db.add_material('sanidine')
+        db.add_project('bench')
+        for name, mass in ISOTOPES:
+            db.add_molecular_weight(name, mass)
+
+        sample = db.add_sample('FC-2', project='bench', material='sanidine')
+
+        chron = db.add_irradiation_chronology('2013-01-01 00:00:00%2013-01-02 00:00:00')
+        irrad = db.add_irradiation('NM-1', chronology=chron)
+        prod = db.add_irradiation_production(name='default', K4039=0.001, K4039_err=0.0001)
+        db.add_irradiation_holder('24Spokes')
+        level = db.add_irradiation_level('A', irrad, '24Spokes', prod)
+
+        xs = range(100)
+        blob = pack_signal(xs, [random.random() for _ in xs])
+        for i in xrange(n):
+            ln = db.add_labnumber('{:05d}'.format(i), sample=sample, unique=False)
+            pos = db.add_irradiation_position(i, ln, irrad, level)
+            fh = db.add_flux_history(pos)
+            fh.flux = db.add_flux(0.001, 0.00001)
+            ln.selected_flux_history = fh
+
+            a = db.add_analysis(ln, uuid='{:032x}'.format(i), aliquot=1, step='',
+                                analysis_timestamp=datetime.now())
+            db.add_measurement(a, 'unknown', 'jan')
+            db.add_extraction(a, 'Fusions CO2')
+            for kind in ('signal', 'baseline'):
+                for name, _ in ISOTOPES:
+                    iso = db.add_isotope(a, name, 'H1', kind=kind)
+                    db.add_signal(iso, blob)
+    return db
+
+
+class QueryCounter(object):
+    def __init__(self, db):
+        self.n = 0
+        engine = db.session_factory.kw['bind']
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args, **kw):
+        self.n += 1
+
+
+def lazy(db, uuids, unpack):
+    with db.session_ctx():
+        for u in uuids:
+            DBAnalysis().sync(db.get_analysis_uuid(u), unpack=unpack)
+
+
+def bulk(db, uuids, unpack):
+    with db.session_ctx():
+        records = db.get_analyses_uuid(uuids, unpack=unpack)
+        for u in uuids:
+            DBAnalysis().sync(records[u], unpack=unpack)
+
+
+def bench(db, counter, func, unpack):
+    uuids = ['{:032x}'.format(i) for i in xrange(NANALYSES)]
+    counter.n = 0
+    st = time.time()
+    func(db, uuids, unpack)
+    dur = time.time() - st
+    print '{:<6s} unpack={:<5s} queries={:<6d} queries/analysis={:<8.2f} {:0.2f}s'.format(func.__name__,
+                                                                                          str(unpack),
+                                                                                          counter.n,
+                                                                                          counter.n / float(NANALYSES),
+                                                                                          dur)
+
+
+if __name__ == '__main__':
+    p = os.path.join(tempfile.mkdtemp(), 'bench.sqlite')
+    db = build_fixture(p)
+    counter = QueryCounter(db)
+    for unpack in (False, True):
+        bench(db, counter, lazy, unpack)
+        bench(db, counter, bulk, unpack)
+
+#============= EOF =============================================
@@ -0,0 +1,71 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    make_analyses(unpack=True) scaling. serial vs. process pool with 1 to ncpus workers.
+    uses the sqlite fixture from make_analyses_benchmark
+"""
+from pychron.core.ui import set_qt
+
+set_qt()
+#============= standard library imports ========================
+import os
+import time
+import tempfile
+from multiprocessing import cpu_count
+#============= local library imports  ==========================
+from pychron.database.isotope_database_manager import IsotopeDatabaseManager
+from make_analyses_benchmark import build_fixture
+
+NANALYSES = 200
+
+
+class Record(object):
+    analysis_type = 'unknown'
+
+    def __init__(self, i):
+        self.uuid = '{:032x}'.format(i)
+        self.record_id = str(i)
+
+
+def bench(man, recs, processes):
+    man.clear_cache()
+    man.use_process_pool = bool(processes)
+    man.process_pool_size = processes
+
+    st = time.time()
+    ans = man.make_analyses(recs, unpack=True, use_progress=False)
+    dur = time.time() - st
+    assert len(ans) == len(recs)
+
+    name = 'pool n={}'.format(processes) if processes else 'serial'
+    print '{:<12s} {:0.2f}s {:0.1f} ms/analysis'.format(name, dur, dur / len(recs) * 1000)
+    return dur
+
+
+if __name__ == '__main__':
+    p = os.path.join(tempfile.mkdtemp(), 'bench.sqlite')
+    db = build_fixture(p, NANALYSES)
+
+    man = IsotopeDatabaseManager(connect=False, bind=False)
+    man.db = db
+
+    recs = [Record(i) for i in xrange(NANALYSES)]
+    t0 = bench(man, recs, 0)
+    for n in xrange(1, cpu_count() + 1):
+        t = bench(man, recs, n)
+        print '    speedup {:0.2f}x'.format(t0 / t)
+
+#============= EOF =============================================
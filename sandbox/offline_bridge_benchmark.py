@@ -0,0 +1,112 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    sqlite -> sqlite transfer of analyses with DatabaseBridge
+
+    per_row: reflect, query and merge one row at a time
+    bulk: BulkReplicator. one IN query per table and executemany inserts
+"""
+from pychron.core.ui import set_qt
+
+set_qt()
+#============= standard library imports ========================
+import os
+import time
+import tempfile
+from sqlalchemy import event
+#============= local library imports  ==========================
+from pychron.database.bulk_replicator import reflect_metadata
+from pychron.database.offline_bridge import OfflineBridge, DatabaseBridge
+from sandbox.make_analyses_benchmark import build_fixture
+
+NANALYSES = 500
+
+
+class Record(object):
+    def __init__(self, uuid, labnumber):
+        self.uuid = uuid
+        self.labnumber = labnumber
+
+
+def add_histories(db, uuids):
+    """
+        the per row transfer expects every analysis to have blanks, fits and detector param histories
+    """
+    with db.session_ctx():
+        db.add_tag('ok')
+        records = db.get_analyses_uuid(uuids)
+        for u in uuids:
+            a = records[u]
+            sh = db.add_selected_histories(a)
+
+            bh = db.add_blanks_history(a)
+            db.add_blanks(bh, isotope='Ar40', user_value=0.1, user_error=0.01)
+            sh.selected_blanks = bh
+
+            fh = db.add_fit_history(a)
+            for iso in a.isotopes:
+                db.add_fit(fh, iso, fit='linear')
+            sh.selected_fits = fh
+
+            dh = db.add_detector_parameter_history(a)
+            db.add_detector_parameter(dh, 'H1', disc=1.0)
+            sh.selected_detector_param = dh
+
+        return [Record(u, records[u].labnumber.identifier) for u in uuids]
+
+
+def count_rows(db):
+    with db.session_ctx() as sess:
+        meta = reflect_metadata(sess.bind)
+        return sum(sess.execute('select count(*) from {}'.format(tn)).scalar()
+                   for tn in meta.tables)
+
+
+def bench(src, ans, bulk):
+    dest = OfflineBridge()
+    dest.init(os.path.join(tempfile.mkdtemp(), 'dest.sqlite'))
+
+    counter = [0]
+
+    def count(*args, **kw):
+        counter[0] += 1
+
+    for e in (src.session_factory.kw['bind'], dest.session_factory.kw['bind']):
+        event.listen(e, 'before_cursor_execute', count)
+
+    bridge = DatabaseBridge(source=src, dest=dest, bulk=bulk)
+    st = time.time()
+    with src.session_ctx():
+        bridge.add_analyses(ans)
+    dur = time.time() - st
+
+    for e in (src.session_factory.kw['bind'], dest.session_factory.kw['bind']):
+        event.remove(e, 'before_cursor_execute', count)
+
+    n = count_rows(dest)
+    print '{:<8s} rows={:<7d} queries={:<7d} {:0.2f}s {:8.0f} rows/s'.format('bulk' if bulk else 'per_row',
+                                                                           n, counter[0], dur, n / dur)
+
+
+if __name__ == '__main__':
+    p = os.path.join(tempfile.mkdtemp(), 'src.sqlite')
+    src = build_fixture(p, NANALYSES)
+    ans = add_histories(src, ['{:032x}'.format(i) for i in xrange(NANALYSES)])
+
+    bench(src, ans, False)
+    bench(src, ans, True)
+
+#============= EOF =============================================
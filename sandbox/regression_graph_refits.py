@@ -0,0 +1,61 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    number of regressions RegressionGraph calculates per user action on a
+    20 panel (10 isotopes x signal, baseline) stacked graph
+"""
+from pychron.core.ui import set_qt
+
+set_qt()
+#============= standard library imports ========================
+import time
+from numpy import linspace, random
+#============= local library imports  ==========================
+from pychron.graph.regression_graph import StackedRegressionGraph
+
+NPANELS = 20
+
+
+def make_graph():
+    g = StackedRegressionGraph(bind_index=False)
+    xs = linspace(0, 100, 50)
+    for i in range(NPANELS):
+        g.new_plot()
+        g.new_series(xs, 10 - 0.01 * xs + random.normal(0, 0.01, 50), fit='linear', plotid=i)
+    return g
+
+
+def action(g, name, func):
+    st = time.time()
+    func()
+    dur = time.time() - st
+    print '{:<24s} refits={:<4d} {:0.1f} ms'.format(name, g.last_refit_count, dur * 1000)
+
+
+if __name__ == '__main__':
+    g = make_graph()
+
+    action(g, 'refresh after build', g.refresh)
+
+    scatter = g.plots[3].plots['data0'][0]
+    action(g, 'exclude point', lambda: scatter.index.trait_set(metadata={'selections': [5]}))
+
+    g.set_fit('parabolic', plotid=7)
+    action(g, 'change fit', g.refresh)
+
+    print 'total refits={}'.format(g.refit_count)
+
+#============= EOF =============================================
@@ -0,0 +1,72 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    simulate the DataCollector._update_isotopes loop. 10 detectors x 5000 counts
+
+    compares the old hstack append against the preallocated SampleBuffer at
+    several notification rates
+"""
+from pychron.core.ui import set_qt
+
+set_qt()
+#============= standard library imports ========================
+import time
+import random
+from numpy import hstack
+#============= local library imports  ==========================
+from pychron.processing.arar_age import ArArAge
+
+NDETS = 10
+NCOUNTS = 5000
+
+
+def make_arar_age():
+    a = ArArAge()
+    for i in range(NDETS):
+        a.set_isotope('Ar{}'.format(i), (0, 0))
+    return a
+
+
+def hstack_append(a, iso, x, y, notify):
+    ii = a.isotopes[iso]
+    ii.xs = hstack((ii.xs, (x,)))
+    ii.ys = hstack((ii.ys, (y,)))
+
+
+def buffer_append(a, iso, x, y, notify):
+    a.append_data(iso, '', x, y, 'signal', notify=notify)
+
+
+def bench(name, func, rate=1):
+    a = make_arar_age()
+    keys = ['Ar{}'.format(i) for i in range(NDETS)]
+    st = time.time()
+    for c in xrange(1, NCOUNTS + 1):
+        notify = c % rate == 0
+        for k in keys:
+            func(a, k, c, random.random(), notify)
+    a.flush_data()
+    dur = time.time() - st
+    assert len(a.isotopes['Ar0'].xs) == NCOUNTS
+    print '{:<20s} rate={:<4d} {:0.3f}s {:0.1f} us/point'.format(name, rate, dur, dur / (NCOUNTS * NDETS) * 1e6)
+
+
+if __name__ == '__main__':
+    bench('hstack', hstack_append)
+    for r in (1, 10, 100):
+        bench('sample_buffer', buffer_append, r)
+
+#============= EOF =============================================
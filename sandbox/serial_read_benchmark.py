@@ -0,0 +1,97 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    serial ask rate against a pseudo terminal loopback device that answers after 1 ms
+
+    polling: the previous read loop. 25 ms read_delay and a 10 ms sleep between polls
+    select: block on the port until data arrives
+    background: BackgroundReader thread fills a buffer the ask waits on
+"""
+#============= standard library imports ========================
+import os
+import time
+from threading import Thread, Event
+
+import serial
+#============= local library imports  ==========================
+from pychron.hardware.core.communicators.serial_communicator import SerialCommunicator
+
+NASKS = 200
+RESPONSE_DELAY = 0.001
+
+
+def device(fd, evt):
+    buf = ''
+    while not evt.is_set():
+        try:
+            data = os.read(fd, 1024)
+        except OSError:
+            break
+        buf += data
+        while '\r' in buf:
+            _, buf = buf.split('\r', 1)
+            time.sleep(RESPONSE_DELAY)
+            os.write(fd, '1.2345\r\n')
+
+
+class PollingCommunicator(SerialCommunicator):
+    read_delay = 25
+
+    def _read_loop(self, func, delay, timeout=1):
+        time.sleep(self.read_delay / 1000.)
+        r = ''
+        st = time.time()
+        while time.time() - st < timeout:
+            r, isterminated = func(r)
+            if isterminated:
+                break
+            time.sleep(0.01)
+        return r
+
+
+def bench(name, klass, background=False):
+    master, slave = os.openpty()
+    evt = Event()
+    t = Thread(target=device, args=(master, evt))
+    t.setDaemon(True)
+    t.start()
+
+    c = klass()
+    c.handle = serial.Serial(os.ttyname(slave), timeout=0)
+    c.simulation = False
+    if background:
+        c._start_reader()
+
+    st = time.time()
+    for _ in xrange(NASKS):
+        r = c.ask('READ', verbose=False)
+        assert r == '1.2345', r
+
+    dur = time.time() - st
+    print '{:<12s} {:8.1f} asks/s {:6.2f} ms/ask'.format(name, NASKS / dur, dur / NASKS * 1000)
+
+    evt.set()
+    c.close()
+    os.close(master)
+    os.close(slave)
+
+
+if __name__ == '__main__':
+    bench('polling', PollingCommunicator)
+    bench('select', SerialCommunicator)
+    bench('background', SerialCommunicator, background=True)
+
+#============= EOF =============================================
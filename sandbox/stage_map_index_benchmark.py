@@ -0,0 +1,81 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    neighbor lookup for every hole of a square tray, 8 neighbors x 3 search distances
+
+    scan:  the previous StageMap._get_hole_by_pos. linear scan + sort per query
+    index: GridIndex.nearest, one batch per search distance
+"""
+#============= standard library imports ========================
+import time
+
+from numpy import array
+#============= local library imports  ==========================
+from pychron.core.geometry.grid_index import GridIndex
+
+SPACING = 2.0
+DIMENSION = 1.5
+OFFSETS = [(0, 1), (-1, 0), (1, 0), (0, -1), (-1, 1), (1, 1), (-1, -1), (1, -1)]
+
+
+def scan(pts, x, y, tol):
+    pythag = lambda hi, xi, yi: ((hi[0] - xi) ** 2 + (hi[1] - yi) ** 2) ** 0.5
+    holes = [(i, pythag(p, x, y)) for i, p in enumerate(pts)
+             if abs(p[0] - x) < tol and abs(p[1] - y) < tol]
+    if holes:
+        holes = sorted(holes, lambda a, b: cmp(a[1], b[1]))
+        return holes[0][0]
+    return -1
+
+
+def bench_scan(pts):
+    res = []
+    for sd in (1, 2, 3):
+        for x, y in pts:
+            for rx, ry in OFFSETS:
+                res.append(scan(pts, x + rx * sd * SPACING, y + ry * sd * SPACING, DIMENSION))
+    return res
+
+
+def bench_index(pts):
+    xs, ys = array(pts).T
+    index = GridIndex(xs, ys, DIMENSION)
+    offsets = array(OFFSETS)
+    res = []
+    for sd in (1, 2, 3):
+        qx = (xs[:, None] + offsets[:, 0] * sd * SPACING).ravel()
+        qy = (ys[:, None] + offsets[:, 1] * sd * SPACING).ravel()
+        res.extend(index.nearest(qx, qy, DIMENSION))
+    return res
+
+
+if __name__ == '__main__':
+    print '{:>6s} {:>10s} {:>10s}'.format('holes', 'scan ms', 'index ms')
+    for n in (8, 15, 25):
+        pts = [(i * SPACING, j * SPACING) for i in range(n) for j in range(n)]
+
+        st = time.time()
+        a = bench_scan(pts)
+        ts = time.time() - st
+
+        st = time.time()
+        b = bench_index(pts)
+        ti = time.time() - st
+
+        assert a == list(b)
+        print '{:>6d} {:>10.1f} {:>10.1f}'.format(len(pts), ts * 1000, ti * 1000)
+
+#============= EOF =============================================
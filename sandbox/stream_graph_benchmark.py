@@ -0,0 +1,63 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+"""
+    cost of recording one sample and producing the plot data with increasing history
+
+    hstack: the previous StreamGraph.record. the whole retained history is copied
+            and handed to the plot on every sample
+    lod:    RingBuffer append + min/max decimated view of the visible window
+"""
+#============= standard library imports ========================
+import time
+import random
+
+from numpy import hstack, array
+#============= local library imports  ==========================
+from pychron.graph.lod import RingBuffer, minmax_decimate
+
+NSAMPLES = 2000
+WIDTH = 1000
+# visible window in samples
+WINDOW = 600
+
+
+def bench_hstack(history):
+    xs = array(range(history), dtype=float)
+    ys = array([random.random() for _ in xs])
+    st = time.time()
+    for i in xrange(NSAMPLES):
+        xs = hstack((xs[-history:], [history + i]))
+        ys = hstack((ys[-history:], [random.random()]))
+        max(ys), min(ys)
+    return (time.time() - st) / NSAMPLES
+
+
+def bench_lod(history):
+    b = RingBuffer(history + 1, xs=range(history), ys=[random.random() for _ in range(history)])
+    st = time.time()
+    for i in xrange(NSAMPLES):
+        x = history + i
+        b.append(x, random.random())
+        minmax_decimate(*(b.get_range(x - WINDOW, x) + (WIDTH,)))
+    return (time.time() - st) / NSAMPLES
+
+
+if __name__ == '__main__':
+    print '{:>10s} {:>12s} {:>12s}'.format('history', 'hstack us', 'lod us')
+    for h in (1000, 10000, 50000, 200000):
+        print '{:>10d} {:>12.1f} {:>12.1f}'.format(h, bench_hstack(h) * 1e6, bench_lod(h) * 1e6)
+
+#============= EOF =============================================
@@ -0,0 +1,80 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import unittest
+#============= local library imports  ==========================
+from pychron.database.analysis_cache import AnalysisCache, ANALYSIS_OVERHEAD
+
+
+class FakeAnalysis(object):
+    def __init__(self, uuid, has_raw_data=False):
+        self.uuid = uuid
+        self.has_raw_data = has_raw_data
+        self.isotopes = {}
+
+
+class AnalysisCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = AnalysisCache(meta_bytes=3 * ANALYSIS_OVERHEAD,
+                                   raw_bytes=3 * ANALYSIS_OVERHEAD,
+                                   max_count=10)
+
+    def test_hit_miss(self):
+        c = self.cache
+        c.put(FakeAnalysis('a'))
+        self.assertIsNotNone(c.get('a'))
+        self.assertIsNone(c.get('b'))
+        s = c.stats()
+        self.assertEqual(s['hits'], 1)
+        self.assertEqual(s['misses'], 1)
+
+    def test_lru_eviction(self):
+        c = self.cache
+        for u in 'abc':
+            c.put(FakeAnalysis(u))
+
+        #touch a so b is least recently used
+        c.get('a')
+        c.put(FakeAnalysis('d'))
+        self.assertIn('a', c)
+        self.assertNotIn('b', c)
+        self.assertEqual(c.stats()['evictions'], 1)
+
+    def test_raw_tier(self):
+        c = self.cache
+        c.put(FakeAnalysis('a'))
+        self.assertIsNone(c.get('a', raw=True))
+
+        c.put(FakeAnalysis('a', has_raw_data=True))
+        self.assertIsNotNone(c.get('a', raw=True))
+        self.assertIsNotNone(c.get('a'))
+        self.assertEqual(len(c), 1)
+
+    def test_invalidate(self):
+        c = self.cache
+        c.put(FakeAnalysis('a'))
+        self.assertTrue(c.remove('a'))
+        self.assertFalse(c.remove('a'))
+        self.assertIsNone(c.get('a'))
+        self.assertEqual(c.stats()['invalidations'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+#============= EOF =============================================
@@ -0,0 +1,137 @@
+__author__ = 'ross'
+
+import time
+import unittest
+from threading import current_thread, Event
+
+from pychron.core.helpers.dialog_router import open_dialog
+from pychron.hardware.core.bring_up import BringUpTask, run_tasks, format_timeline, \
+    DONE, FAILED, TIMEOUT, BLOCKED
+
+
+def sleeper(dt, log=None, name=None):
+    def func(progress):
+        if log is not None:
+            log.append(('start', name))
+        time.sleep(dt)
+        if log is not None:
+            log.append(('end', name))
+        return True
+
+    return func
+
+
+class Progress(object):
+    def __init__(self):
+        self.messages = []
+
+    def change_message(self, msg, auto_increment=True):
+        self.messages.append(msg)
+
+
+class BringUpTestCase(unittest.TestCase):
+    def test_concurrent(self):
+        tasks = [BringUpTask(str(i), [('open', sleeper(0.2))]) for i in range(4)]
+        st = time.time()
+        run_tasks(tasks, nthreads=4, poll=0.01)
+        self.assertLess(time.time() - st, 0.6)
+        self.assertTrue(all(t.state == DONE for t in tasks))
+        self.assertTrue(all(t.results['open'] for t in tasks))
+
+    def test_group(self):
+        log = []
+        tasks = [BringUpTask(n, [('open', sleeper(0.05, log, n))], group='/dev/ttyS0')
+                 for n in 'abc']
+        run_tasks(tasks, nthreads=4, poll=0.01)
+        self.assertEqual(log, [('start', 'a'), ('end', 'a'),
+                               ('start', 'b'), ('end', 'b'),
+                               ('start', 'c'), ('end', 'c')])
+
+    def test_depends(self):
+        log = []
+        a = BringUpTask('a', [('open', sleeper(0.1, log, 'a'))], depends=['b'])
+        b = BringUpTask('b', [('open', sleeper(0.1, log, 'b'))])
+        run_tasks([a, b], nthreads=4, poll=0.01)
+        self.assertEqual(log[0], ('start', 'b'))
+        self.assertEqual(log[1], ('end', 'b'))
+
+    def test_timeout(self):
+        a = BringUpTask('a', [('open', sleeper(1))], timeout=0.1)
+        b = BringUpTask('b', [('open', sleeper(0.01))], depends=['a'])
+        st = time.time()
+        run_tasks([a, b], poll=0.01)
+        self.assertLess(time.time() - st, 0.5)
+        self.assertEqual(a.state, TIMEOUT)
+        self.assertEqual(b.state, DONE)
+
+    def test_cycle(self):
+        a = BringUpTask('a', [('open', sleeper(0))], depends=['b'])
+        b = BringUpTask('b', [('open', sleeper(0))], depends=['a'])
+        run_tasks([a, b], poll=0.01)
+        self.assertEqual(a.state, BLOCKED)
+        self.assertEqual(b.state, BLOCKED)
+
+    def test_failed(self):
+        def fail(progress):
+            raise ValueError
+
+        a = BringUpTask('a', [('open', fail), ('initialize', sleeper(0))])
+        run_tasks([a], poll=0.01)
+        self.assertEqual(a.state, FAILED)
+        self.assertFalse('initialize' in a.results)
+
+    def test_progress(self):
+        def func(progress):
+            progress.change_message('homing')
+            return True
+
+        pd = Progress()
+        a = BringUpTask('a', [('initialize', func)])
+        run_tasks([a], progress=pd, poll=0.01)
+        self.assertEqual(pd.messages, ['homing'])
+
+    def test_dialog_in_calling_thread(self):
+        threads = []
+
+        def dialog(msg):
+            threads.append(current_thread())
+            time.sleep(0.2)
+            return msg == 'quit?'
+
+        def func(progress):
+            return open_dialog(dialog, 'quit?')
+
+        a = BringUpTask('a', [('open', func)], timeout=0.1)
+        run_tasks([a], poll=0.01)
+        self.assertEqual(threads, [current_thread()])
+        # time in the dialog isn't counted against the timeout
+        self.assertEqual(a.state, DONE)
+        self.assertTrue(a.results['open'])
+
+    def test_on_late(self):
+        late = []
+        evt = Event()
+
+        def on_late(task):
+            late.append(task.name)
+            evt.set()
+
+        a = BringUpTask('a', [('open', sleeper(0.2))], timeout=0.05)
+        run_tasks([a], poll=0.01, on_late=on_late)
+        self.assertEqual(a.state, TIMEOUT)
+        self.assertEqual(late, [])
+
+        evt.wait(1)
+        self.assertEqual(late, ['a'])
+        self.assertTrue(a.results['open'])
+
+    def test_timeline(self):
+        tasks = [BringUpTask('a', [('open', sleeper(0)), ('initialize', sleeper(0))])]
+        run_tasks(tasks, poll=0.01)
+        lines = format_timeline(tasks)
+        self.assertEqual(len(lines), 1)
+        self.assertTrue('open' in lines[0] and 'initialize' in lines[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String, ForeignKey
+from sqlalchemy.orm import sessionmaker
+
+from pychron.database.bulk_replicator import BulkReplicator, dependency_order
+
+__author__ = 'ross'
+
+
+def make_schema(meta):
+    Table('gen_LabTable', meta,
+          Column('id', Integer, primary_key=True),
+          Column('identifier', String(20)),
+          Column('selected_flux_id', Integer, ForeignKey('flux_HistoryTable.id')))
+    Table('flux_HistoryTable', meta,
+          Column('id', Integer, primary_key=True),
+          Column('lab_id', Integer, ForeignKey('gen_LabTable.id')))
+    Table('proc_TagTable', meta,
+          Column('name', String(40), primary_key=True))
+    Table('meas_AnalysisTable', meta,
+          Column('id', Integer, primary_key=True),
+          Column('uuid', String(40)),
+          Column('lab_id', Integer, ForeignKey('gen_LabTable.id')),
+          Column('tag', String(40), ForeignKey('proc_TagTable.name')))
+    Table('meas_IsotopeTable', meta,
+          Column('id', Integer, primary_key=True),
+          Column('analysis_id', Integer, ForeignKey('meas_AnalysisTable.id')))
+
+
+class BulkReplicatorTestCase(TestCase):
+    def setUp(self):
+        sessions = []
+        for _ in range(2):
+            engine = create_engine('sqlite://')
+            meta = MetaData()
+            make_schema(meta)
+            meta.create_all(engine)
+            sessions.append(sessionmaker(bind=engine)())
+
+        self.src, self.dest = sessions
+        self.meta = meta
+
+        src = self.src
+        src.execute("insert into proc_TagTable values ('ok')")
+        for i in range(1, 6):
+            src.execute("insert into gen_LabTable values ({}, 'L{}', {})".format(i, i, i))
+            src.execute("insert into flux_HistoryTable values ({}, {})".format(i, i))
+            src.execute("insert into meas_AnalysisTable values ({}, 'u{}', {}, 'ok')".format(i, i, i))
+            for j in range(3):
+                src.execute("insert into meas_IsotopeTable values ({}, {})".format(i * 10 + j, i))
+        src.commit()
+
+        self.dest.execute("insert into proc_TagTable values ('ok')")
+        self.dest.commit()
+
+    def _count(self, tn):
+        return self.dest.execute('select count(*) from {}'.format(tn)).scalar()
+
+    def test_replicate(self):
+        rep = BulkReplicator(self.src, self.dest)
+        n = rep.replicate(['u1', 'u2'])
+        self.dest.commit()
+
+        # 2 labs, 2 flux histories, 2 analyses, 6 isotopes. tag already exists
+        self.assertEqual(n, 12)
+        self.assertEqual(self._count('meas_IsotopeTable'), 6)
+        self.assertEqual(self._count('proc_TagTable'), 1)
+
+    def test_replicate_existing(self):
+        rep = BulkReplicator(self.src, self.dest)
+        rep.replicate(['u1', 'u2'])
+        self.dest.commit()
+
+        n = BulkReplicator(self.src, self.dest).replicate(['u2', 'u3'])
+        self.assertEqual(n, 6)
+
+    def test_dependency_order(self):
+        order = dependency_order(self.meta.tables.values())
+        self.assertLess(order.index('proc_TagTable'), order.index('meas_AnalysisTable'))
+        self.assertLess(order.index('meas_AnalysisTable'), order.index('meas_IsotopeTable'))
+        self.assertLess(order.index('gen_LabTable'), order.index('meas_AnalysisTable'))
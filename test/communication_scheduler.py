@@ -0,0 +1,122 @@
+from unittest import TestCase
+import threading
+import time
+
+from pychron.hardware.core.communicators.modbus_communicator import ModbusCommunicator
+from pychron.hardware.core.communicators.scheduler import CommunicationScheduler, PRIORITY_INTERLOCK, \
+    PRIORITY_STATUS
+
+__author__ = 'ross'
+
+
+class Bus(object):
+    def __init__(self):
+        self.calls = []
+        self.hold = threading.Event()
+
+    def ask(self, cmd, delay=0):
+        if cmd == 'hold':
+            self.hold.wait(1)
+        self.calls.append(cmd)
+        time.sleep(delay)
+        return '{}_response'.format(cmd)
+
+
+class CommunicationSchedulerTestCase(TestCase):
+    def setUp(self):
+        self.bus = Bus()
+        self.scheduler = CommunicationScheduler(name='test', collision_delay=0)
+
+    def _spawn(self, cmd, results, **kw):
+        def func():
+            results[cmd] = self.scheduler.schedule(self.bus.ask, args=(cmd,), **kw)
+
+        t = threading.Thread(target=func)
+        t.start()
+        return t
+
+    def test_schedule(self):
+        self.assertEqual(self.scheduler.schedule(self.bus.ask, args=('a',)), 'a_response')
+
+    def test_priority(self):
+        results = {}
+        ts = [self._spawn('hold', results)]
+        time.sleep(0.05)
+
+        ts.append(self._spawn('status', results, priority=PRIORITY_STATUS))
+        time.sleep(0.01)
+        ts.append(self._spawn('valve', results, priority=PRIORITY_INTERLOCK))
+        time.sleep(0.01)
+
+        self.bus.hold.set()
+        for t in ts:
+            t.join()
+
+        self.assertEqual(self.bus.calls, ['hold', 'valve', 'status'])
+
+    def test_coalesce(self):
+        results = {}
+        ts = [self._spawn('hold', results)]
+        time.sleep(0.05)
+
+        rs = []
+
+        def read():
+            rs.append(self.scheduler.schedule(self.bus.ask, args=('temp',), coalesce=True, device='watlow'))
+
+        ts.extend([threading.Thread(target=read) for _ in range(5)])
+        for t in ts[1:]:
+            t.start()
+        time.sleep(0.05)
+
+        self.bus.hold.set()
+        for t in ts:
+            t.join()
+
+        self.assertEqual(self.bus.calls.count('temp'), 1)
+        self.assertEqual(rs, ['temp_response'] * 5)
+
+        stats = self.scheduler.get_stats()['watlow']
+        self.assertEqual(stats['n'], 1)
+        self.assertEqual(stats['coalesced'], 4)
+        self.assertEqual(stats['depth'], 0)
+
+    def test_collision_delay(self):
+        self.scheduler.collision_delay = 50
+        st = time.time()
+        for i in range(3):
+            self.scheduler.schedule(self.bus.ask, args=(str(i),))
+        self.assertGreaterEqual(time.time() - st, 0.09)
+
+    def test_exception(self):
+        def func():
+            raise ValueError
+
+        self.assertRaises(ValueError, self.scheduler.schedule, func)
+
+
+class RecordingScheduler(object):
+    def __init__(self):
+        self.priorities = []
+
+    def schedule(self, func, args=None, kwargs=None, priority=None, **kw):
+        self.priorities.append(priority)
+
+
+class ModbusPriorityTestCase(TestCase):
+    def setUp(self):
+        self.scheduler = RecordingScheduler()
+        self.communicator = ModbusCommunicator(name='watlow')
+        self.communicator.scheduler = self.scheduler
+
+    def test_read_priority(self):
+        c = self.communicator
+        c.scheduler_priority = PRIORITY_STATUS
+        c.read_holding_register(100, 1, 'int')
+        self.assertEqual(self.scheduler.priorities, [PRIORITY_STATUS])
+
+    def test_write_priority(self):
+        c = self.communicator
+        c.scheduler_priority = PRIORITY_STATUS
+        c.set_single_register(100, 1, 'int')
+        self.assertEqual(self.scheduler.priorities, [PRIORITY_INTERLOCK])
@@ -0,0 +1,136 @@
+from unittest import TestCase
+import SocketServer
+import threading
+import time
+
+from pychron.hardware.core.communicators.connection_pool import ConnectionPool, LatencyHistogram, \
+    get_pool, close_pools
+
+__author__ = 'ross'
+
+
+class EchoHandler(SocketServer.BaseRequestHandler):
+    """
+        echo each \\n terminated line. 'close' closes the connection,
+        'two' sends two lines
+    """
+
+    def handle(self):
+        self.server.nconnections += 1
+        buf = ''
+        while 1:
+            data = self.request.recv(1024)
+            if not data:
+                break
+            buf += data
+            while '\n' in buf:
+                line, buf = buf.split('\n', 1)
+                if line == 'close':
+                    return
+                elif line == 'two':
+                    self.request.sendall('a\nb\n')
+                    continue
+                self.request.sendall('{}\n'.format(line))
+
+
+class EchoServer(SocketServer.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    nconnections = 0
+
+
+class ConnectionPoolTestCase(TestCase):
+    def setUp(self):
+        self.server = EchoServer(('127.0.0.1', 0), EchoHandler)
+        t = threading.Thread(target=self.server.serve_forever)
+        t.setDaemon(True)
+        t.start()
+
+        host, port = self.server.server_address
+        self.pool = ConnectionPool(host, port, terminator='\n')
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_reuse(self):
+        for i in range(10):
+            with self.pool.connection() as conn:
+                self.assertEqual(conn.ask('a{}\n'.format(i)), 'a{}\n'.format(i))
+
+        self.assertEqual(self.pool.nconnects, 1)
+        self.assertEqual(self.server.nconnections, 1)
+
+    def test_pipeline(self):
+        cmds = ['a{}\n'.format(i) for i in range(20)]
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.ask_many(cmds), cmds)
+
+    def test_reconnect(self):
+        with self.pool.connection() as conn:
+            conn.send('close\n')
+
+        # give the server time to close the socket
+        time.sleep(0.1)
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.ask('b\n'), 'b\n')
+
+        self.assertEqual(self.pool.nconnects, 2)
+
+    def test_stale_reply(self):
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.ask('two\n'), 'a\n')
+
+        # the unread 'b' is discarded when the connection is checked out
+        time.sleep(0.1)
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.ask('c\n'), 'c\n')
+
+        self.assertEqual(self.pool.nconnects, 1)
+
+    def test_no_terminator(self):
+        """
+            connections are not kept alive without a terminator
+        """
+        host, port = self.server.server_address
+        pool = ConnectionPool(host, port)
+        for i in range(2):
+            with pool.connection() as conn:
+                self.assertEqual(conn.ask('a\n'), 'a\n')
+
+        self.assertEqual(pool.nconnects, 2)
+
+    def test_backoff(self):
+        host, port = self.server.server_address
+        self.server.shutdown()
+        self.server.server_close()
+
+        pool = ConnectionPool(host, port, backoff=10)
+        with pool.connection() as conn:
+            self.assertIsNone(conn)
+        self.assertTrue(pool.backing_off)
+
+    def test_get_pool(self):
+        host, port = self.server.server_address
+        try:
+            p = get_pool(host, port, size=2, terminator='\n')
+            self.assertIs(get_pool(host, port, terminator='\n', size=2), p)
+
+            p2 = get_pool(host, port, size=2, terminator='\r')
+            self.assertIsNot(p2, p)
+            self.assertEqual(p2.terminator, '\r')
+        finally:
+            close_pools()
+
+
+class LatencyHistogramTestCase(TestCase):
+    def test_percentile(self):
+        h = LatencyHistogram('test')
+        for dt in [0.001] * 90 + [0.4] * 10:
+            h.record(dt)
+
+        self.assertEqual(h.n, 100)
+        self.assertEqual(h.percentile(50), 0.001)
+        self.assertEqual(h.percentile(95), 0.5)
+        self.assertAlmostEqual(h.max, 0.4)
@@ -0,0 +1,72 @@
+__author__ = 'ross'
+
+import unittest
+
+from numpy import arange, vstack, sin, array_equal
+
+from pychron.dashboard.time_series import ChunkBuffer, pack_chunk, unpack_chunk, \
+    read_range, downsample, get_row_fmt, get_ncolumns, get_chunk_size
+
+
+class TimeSeriesTestCase(unittest.TestCase):
+    def _chunks(self, n, chunk_size):
+        buf = ChunkBuffer(3, chunk_size)
+        chunks = []
+        for i in xrange(n):
+            c = buf.append((1e9 + i * 0.5, i, -i))
+            if c is not None:
+                chunks.append(c)
+        return buf, chunks
+
+    def test_row_fmt(self):
+        fmt = get_row_fmt(2)
+        self.assertEqual(get_ncolumns(fmt), 3)
+
+    def test_chunk_size(self):
+        self.assertEqual(get_chunk_size(3, 256), 256)
+        self.assertTrue(get_chunk_size(1000, 256) * 8 * 1000 <= 65535)
+
+    def test_append_full_chunks(self):
+        buf, chunks = self._chunks(25, 10)
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(buf.nchunks, 2)
+        self.assertEqual(len(buf), 5)
+        self.assertEqual(chunks[1][1, 0], 10)
+
+        c = buf.take()
+        self.assertEqual(c.shape, (3, 5))
+        self.assertEqual(buf.take(), None)
+
+    def test_pack_roundtrip(self):
+        _, chunks = self._chunks(10, 10)
+        c = chunks[0]
+        self.assertTrue(array_equal(unpack_chunk(pack_chunk(c), 3), c))
+
+    def test_timestamp_resolution(self):
+        _, chunks = self._chunks(10, 10)
+        c = unpack_chunk(pack_chunk(chunks[0]), 3)
+        self.assertEqual(c[0, 1] - c[0, 0], 0.5)
+
+    def test_read_range(self):
+        buf, chunks = self._chunks(25, 10)
+        chunks.append(buf.columns)
+        cols = read_range(chunks, 3, 1e9 + 2, 1e9 + 6)
+        self.assertEqual(list(cols[1]), range(4, 13))
+
+    def test_read_range_empty(self):
+        cols = read_range([], 3)
+        self.assertEqual(cols.shape, (3, 0))
+
+    def test_downsample(self):
+        x = arange(10000.)
+        cols = vstack((x, sin(x / 100.), x))
+        d = downsample(cols, 50)
+        self.assertTrue(d.shape[1] < 300)
+        self.assertEqual(d[1].max(), cols[1].max())
+        self.assertEqual(d[1].min(), cols[1].min())
+        self.assertEqual(d[0, 0], 0)
+        self.assertEqual(d[0, -1], 9999)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import time
+import unittest
+from threading import Event
+
+from pychron.experiment.automated_run.acquisition_scheduler import AcquisitionScheduler
+
+
+class AcquisitionSchedulerTestCase(unittest.TestCase):
+    def test_ncounts(self):
+        steps = []
+
+        def step(i):
+            steps.append(i)
+            return i < 10
+
+        stats = AcquisitionScheduler(0.01, step).run(Event())
+        self.assertEqual(steps, range(1, 11))
+        self.assertEqual(stats.n, 10)
+        self.assertEqual(stats.dropped, 0)
+        self.assertAlmostEqual(stats.mean_period, 0.01, 2)
+
+    def test_stop(self):
+        evt = Event()
+
+        def step(i):
+            if i == 3:
+                evt.set()
+            return True
+
+        stats = AcquisitionScheduler(0.01, step).run(evt)
+        self.assertEqual(stats.n, 3)
+
+    def test_overrun(self):
+        def step(i):
+            if i == 2:
+                time.sleep(0.035)
+            return i < 5
+
+        stats = AcquisitionScheduler(0.01, step).run(Event())
+        self.assertEqual(stats.overruns, 1)
+        self.assertGreaterEqual(stats.dropped, 2)
+        self.assertEqual(stats.n, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pychron.experiment.automated_run.persistence import AutomatedRunPersister
+from pychron.managers.data_managers.buffered_writer import H5BufferedWriter
+from pychron.managers.data_managers.h5_data_manager import H5DataManager
+
+__author__ = 'ross'
+
+
+class Det(object):
+    def __init__(self, name, isotope):
+        self.name = name
+        self.isotope = isotope
+
+
+def make_file(dm, path):
+    with dm.open_file(path, 'w'):
+        grp = dm.new_group('signal')
+        dm.new_table(dm.new_group('Ar40', grp), 'H1')
+        dm.new_table(dm.new_group('baseline'), 'H1')
+
+
+def read_rows(dm, path, grp):
+    with dm.open_file(path, 'r'):
+        tab = dm.get_table('H1', grp)
+        return [(r['time'], r['value']) for r in tab.iterrows()]
+
+
+class BufferedWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'run.hdf5')
+        self.dm = H5DataManager()
+        make_file(self.dm, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_flush_rows(self):
+        with self.dm.open_file(self.path):
+            writer = H5BufferedWriter(self.dm, flush_rows=3, flush_interval=1000)
+            for i in range(7):
+                writer.write('H1', '/signal/Ar40', i, i * 10)
+
+            self.assertEqual(writer.nflushes, 2)
+            self.assertEqual(len(self.dm.get_table('H1', '/signal/Ar40')), 6)
+            writer.close()
+
+        rows = read_rows(self.dm, self.path, '/signal/Ar40')
+        self.assertEqual(rows, [(i, i * 10) for i in range(7)])
+
+    def test_flush_interval(self):
+        with self.dm.open_file(self.path):
+            writer = H5BufferedWriter(self.dm, flush_rows=1000, flush_interval=0)
+            writer.write('H1', '/signal/Ar40', 0, 1)
+            self.assertEqual(writer.nflushes, 1)
+            writer.close()
+
+    def test_missing_table(self):
+        with self.dm.open_file(self.path):
+            writer = H5BufferedWriter(self.dm)
+            self.assertFalse(writer.write('H2', '/signal/Ar40', 0, 1))
+            self.assertEqual(writer.nrows, 0)
+            writer.close()
+
+    def test_nested_writer_ctx(self):
+        """
+            a baseline measured inside a peak hop's writer_ctx must not drop the
+            rows the outer writer buffers before or after it
+        """
+        p = AutomatedRunPersister(data_manager=self.dm)
+        p.data_flush_rows = 1000
+        p.data_flush_interval = 1000
+        p._current_data_frame = self.path
+
+        dets = [Det('H1', 'Ar40')]
+        with p.writer_ctx():
+            signal = p.get_data_writer('signal')
+            signal(dets, 1, ['H1'], [10])
+            signal(dets, 2, ['H1'], [20])
+
+            with p.writer_ctx():
+                baseline = p.get_data_writer('baseline')
+                baseline(dets, 3, ['H1'], [0.1])
+
+            signal(dets, 4, ['H1'], [40])
+
+        self.assertEqual(p._writer_depth, 0)
+        self.assertEqual(p._data_writers, [])
+
+        self.assertEqual(read_rows(self.dm, self.path, '/signal/Ar40'),
+                         [(1, 10), (2, 20), (4, 40)])
+        rows = read_rows(self.dm, self.path, '/baseline')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][0], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
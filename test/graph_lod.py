@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from numpy import arange, sin, linspace
+
+from pychron.graph.lod import RingBuffer, minmax_decimate
+
+__author__ = 'ross'
+
+
+class RingBufferTestCase(TestCase):
+    def test_append(self):
+        b = RingBuffer(5)
+        for i in range(3):
+            b.append(i, i * 2)
+
+        self.assertEqual(list(b.xs), [0, 1, 2])
+        self.assertEqual(list(b.ys), [0, 2, 4])
+
+    def test_wrap(self):
+        b = RingBuffer(5)
+        for i in range(12):
+            b.append(i, i)
+
+        self.assertEqual(len(b), 5)
+        self.assertEqual(list(b.xs), [7, 8, 9, 10, 11])
+        self.assertEqual(b.last, (11, 11))
+
+    def test_get_range(self):
+        b = RingBuffer(100, xs=arange(20), ys=arange(20))
+        xs, ys = b.get_range(5, 8)
+        self.assertEqual(list(xs), [4, 5, 6, 7, 8, 9])
+
+        xs, ys = b.get_range(5, 8, pad=0)
+        self.assertEqual(list(xs), [5, 6, 7, 8])
+
+    def test_get_range_not_monotonic(self):
+        b = RingBuffer(100, xs=[3, 1, 2, 5], ys=[0, 1, 2, 3])
+        self.assertFalse(b.monotonic)
+        xs, ys = b.get_range(2, 4)
+        self.assertEqual(list(xs), [3, 2])
+
+
+class MinMaxDecimateTestCase(TestCase):
+    def test_small(self):
+        x = arange(10)
+        xs, ys = minmax_decimate(x, x, 10)
+        self.assertEqual(len(xs), 10)
+
+    def test_envelope(self):
+        x = linspace(0, 100, 100003)
+        y = sin(x)
+        y[5001] = 10
+        y[70001] = -10
+
+        xs, ys = minmax_decimate(x, y, 500)
+        self.assertTrue(len(xs) <= 1004)
+        self.assertEqual(ys.max(), 10)
+        self.assertEqual(ys.min(), -10)
+        self.assertEqual(xs[0], x[0])
+        self.assertEqual(xs[-1], x[-1])
+        self.assertTrue((xs[1:] > xs[:-1]).all())
@@ -0,0 +1,51 @@
+import random
+from unittest import TestCase
+
+from numpy import array
+
+from pychron.core.geometry.grid_index import GridIndex
+
+__author__ = 'ross'
+
+
+def brute_nearest(xs, ys, x, y, tol):
+    holes = [(((xi - x) ** 2 + (yi - y) ** 2) ** 0.5, i) for i, (xi, yi) in enumerate(zip(xs, ys))
+             if abs(xi - x) < tol and abs(yi - y) < tol]
+    if holes:
+        return min(holes)[1]
+    return -1
+
+
+class GridIndexTestCase(TestCase):
+    def setUp(self):
+        random.seed(1)
+        self.xs = [(i % 15) * 2.0 + random.uniform(-0.3, 0.3) for i in range(225)]
+        self.ys = [(i / 15) * 2.0 + random.uniform(-0.3, 0.3) for i in range(225)]
+        self.index = GridIndex(self.xs, self.ys, 1.5)
+
+    def test_scalar(self):
+        i = self.index.nearest(self.xs[17], self.ys[17], 1.5)
+        self.assertEqual(i, 17)
+        self.assertEqual(self.index.nearest(-10, -10, 1.5), -1)
+
+    def test_batch(self):
+        qx = [random.uniform(-3, 33) for _ in range(500)]
+        qy = [random.uniform(-3, 33) for _ in range(500)]
+        for tol in (0.5, 1.5, 4):
+            idx = self.index.nearest(array(qx), array(qy), tol)
+            expected = [brute_nearest(self.xs, self.ys, x, y, tol) for x, y in zip(qx, qy)]
+            self.assertEqual(list(idx), expected)
+
+    def test_move(self):
+        self.index.move(3, 100, 100)
+        self.assertEqual(self.index.nearest(100.1, 100, 1.5), 3)
+        self.assertEqual(self.index.nearest(6, 0, 0.5), -1)
+
+        n = self.index.nrebuilds
+        self.index.move(3, 6.2, 0.1)
+        self.assertEqual(self.index.nearest(6, 0, 0.5), 3)
+        self.assertEqual(self.index.nrebuilds, n)
+
+    def test_empty(self):
+        index = GridIndex([], [], 1)
+        self.assertEqual(index.nearest(0, 0, 1), -1)
@@ -0,0 +1,65 @@
+__author__ = 'ross'
+
+import unittest
+
+from numpy import linspace, random, allclose, array, hstack
+
+from pychron.core.regression.interpolation_regressor import InterpolationRegressor
+
+KINDS = ('preceding', 'bracketing average', 'bracketing interpolate')
+
+
+class InterpolationRegressorTestCase(unittest.TestCase):
+    def setUp(self):
+        random.seed(1)
+        xs = linspace(0, 100, 25)
+        ys = random.normal(10, 1, 25)
+        es = random.uniform(0.1, 0.5, 25)
+        self.reg = InterpolationRegressor(xs=xs, ys=ys, yserr=es)
+
+        # include the reference points themselves and points outside the range
+        self.pxs = hstack((random.uniform(-10, 110, 500), xs, [-1, 0, 100, 101]))
+
+    def _compare(self, kind, attr):
+        reg = self.reg
+        reg.kind = kind
+        func = getattr(reg, '{}_predictors'.format(kind.replace(' ', '_')))
+
+        a = reg._predict(self.pxs, attr)
+        b = [func(xi, attr) for xi in self.pxs]
+
+        self.assertEqual([ai is None for ai in a], [bi is None for bi in b])
+        a = array([ai for ai in a if ai is not None])
+        b = array([bi for bi in b if bi is not None])
+        self.assertTrue(allclose(a, b))
+
+    def test_values(self):
+        for k in KINDS:
+            self._compare(k, 'value')
+
+    def test_errors(self):
+        for k in KINDS:
+            self._compare(k, 'error')
+
+    def test_scalar(self):
+        reg = self.reg
+        reg.kind = 'bracketing interpolate'
+        self.assertEqual(len(reg.predict(50.)), 1)
+
+    def test_unsorted(self):
+        reg = InterpolationRegressor(xs=[0, 10, 5], ys=[1, 2, 3], yserr=[1, 1, 1],
+                                     kind='preceding')
+        self.assertEqual(reg.predict([7]), [reg.preceding_predictors(7)])
+
+    def test_too_few_points(self):
+        reg = InterpolationRegressor(xs=[0], ys=[1], yserr=[1],
+                                     kind='bracketing interpolate')
+        self.assertEqual(reg.predict([0, 1]), [0, 0])
+
+    def test_empty(self):
+        reg = InterpolationRegressor(kind='preceding')
+        self.assertEqual(reg.predict([0, 1]), [None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+__author__ = 'ross'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.ext.declarative import declarative_base
+
+from pychron.database.core.database_adapter import DatabaseAdapter
+from pychron.database.core.lookup_cache import LookupCache
+
+Base = declarative_base()
+
+
+class gen_DetectorTable(Base):
+    __tablename__ = 'gen_DetectorTable'
+    id = Column(Integer, primary_key=True)
+    name = Column(String(40))
+
+
+class DetectorTable(object):
+    __tablename__ = 'gen_DetectorTable'
+
+
+class MassSpecTable(object):
+    __tablename__ = 'gen_MassSpectrometerTable'
+
+
+class LookupCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = LookupCache()
+
+    def test_miss(self):
+        self.assertEqual(self.cache.get(DetectorTable, 'H1'), None)
+
+    def test_hit(self):
+        self.cache.set(DetectorTable, 'H1', 3)
+        self.assertEqual(self.cache.get(DetectorTable, 'H1'), 3)
+        self.assertEqual(self.cache.get(MassSpecTable, 'H1'), None)
+
+    def test_set_none(self):
+        self.cache.set(DetectorTable, 'H1', None)
+        self.assertEqual(self.cache.get(DetectorTable, 'H1'), None)
+
+    def test_invalidate_name(self):
+        self.cache.set(DetectorTable, 'H1', 3)
+        self.cache.set(DetectorTable, 'AX', 4)
+        self.cache.invalidate(DetectorTable, 'H1')
+        self.assertEqual(self.cache.get(DetectorTable, 'H1'), None)
+        self.assertEqual(self.cache.get(DetectorTable, 'AX'), 4)
+
+    def test_invalidate_table(self):
+        self.cache.set(DetectorTable, 'H1', 3)
+        self.cache.set(MassSpecTable, 'jan', 1)
+        self.cache.invalidate(DetectorTable)
+        self.assertEqual(self.cache.get(DetectorTable, 'H1'), None)
+        self.assertEqual(self.cache.get(MassSpecTable, 'jan'), 1)
+
+    def test_stats(self):
+        self.cache.get(DetectorTable, 'H1')
+        self.cache.set(DetectorTable, 'H1', 3)
+        for i in range(3):
+            self.cache.get(DetectorTable, 'H1')
+
+        hits, misses, rate = self.cache.stats()['gen_DetectorTable']
+        self.assertEqual((hits, misses), (3, 1))
+        self.assertAlmostEqual(rate, 0.75)
+
+
+class RetrieveCachedTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        db = DatabaseAdapter(kind='sqlite', path=os.path.join(self.root, 'test.db'))
+        db.connect()
+        db.create_all(Base.metadata)
+        with db.session_ctx() as s:
+            s.add(gen_DetectorTable(name='H1'))
+
+        self.db = db
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _execute(self, sql):
+        with self.db.session_ctx() as s:
+            s.execute(sql)
+
+    def _get(self, name):
+        with self.db.session_ctx():
+            obj = self.db._retrieve_cached(gen_DetectorTable, name)
+            return obj and (obj.id, obj.name)
+
+    def test_cached(self):
+        self.assertEqual(self._get('H1'), (1, 'H1'))
+        self.assertEqual(self._get('H1'), (1, 'H1'))
+
+        hits, misses, rate = self.db.get_lookup_cache_stats()['gen_DetectorTable']
+        self.assertEqual((hits, misses), (1, 1))
+
+    def test_renamed(self):
+        self.assertEqual(self._get('H1'), (1, 'H1'))
+
+        self._execute("update gen_DetectorTable set name='AX' where id=1")
+        self._execute("insert into gen_DetectorTable (id, name) values (2, 'H1')")
+        self.assertEqual(self._get('H1'), (2, 'H1'))
+
+    def test_deleted(self):
+        self.assertEqual(self._get('H1'), (1, 'H1'))
+
+        self._execute('delete from gen_DetectorTable where id=1')
+        self.assertEqual(self._get('H1'), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from numpy import array, linspace, isnan
+
+from pychron.spectrometer.magnet_calibration import MagnetCalibration, FieldTable, mass_cal_func
+
+__author__ = 'ross'
+
+COEFFS = [1.2, 1.0, 0.05]
+MASSES = [35.96, 36.97, 38.96, 39.96]
+ISOS = ['Ar36', 'Ar37', 'Ar39', 'Ar40']
+MOLWEIGHTS = dict(zip(ISOS, MASSES))
+
+
+def quadratic(p, x):
+    return p[0] + p[1] * x + p[2] * x ** 2
+
+
+class MagnetCalibrationTestCase(TestCase):
+    def setUp(self):
+        dacs = mass_cal_func(COEFFS, array(MASSES))
+        self.cal = MagnetCalibration(ISOS, MASSES, dacs, coeffs=COEFFS)
+
+    def test_round_trip(self):
+        ms = linspace(1, 200, 50)
+        dacs = self.cal.get_dac(ms)
+        for a, b in zip(self.cal.get_mass(dacs), ms):
+            self.assertAlmostEqual(a, b, 8)
+
+    def test_scalar(self):
+        dac = self.cal.get_dac(39.962)
+        self.assertIsInstance(dac, float)
+        self.assertAlmostEqual(self.cal.get_mass(dac), 39.962, 8)
+
+    def test_below_offset(self):
+        self.assertTrue(isnan(self.cal.get_mass(0)))
+
+    def test_lookup_table(self):
+        p = [0.1, 0.05, 0.0002]
+        cal = MagnetCalibration(ISOS, MASSES, quadratic(p, array(MASSES)), func=quadratic, coeffs=p)
+        for m in (2, 39.962, 150):
+            self.assertAlmostEqual(cal.get_mass(cal.get_dac(m)), m, 3)
+
+    def test_shifted(self):
+        cal = self.cal.shifted(0.1)
+        self.assertAlmostEqual(cal.get_dac(39.96), self.cal.get_dac(39.96) + 0.1)
+        self.assertAlmostEqual(cal.dacs[0], self.cal.dacs[0] + 0.1)
+
+
+class FieldTableTestCase(TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w') as f:
+            f.write('iso,H1,AX\n')
+            for iso, m in zip(ISOS, MASSES):
+                d = mass_cal_func(COEFFS, m)
+                f.write('{},{},{}\n'.format(iso, d + 0.5, d))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_load(self):
+        t = FieldTable(self.path, MOLWEIGHTS)
+        self.assertEqual(sorted(t.calibrations.keys()), ['AX', 'H1'])
+        self.assertAlmostEqual(t['AX'].get_mass(t['AX'].get_dac(39.96)), 39.96, 4)
+        self.assertFalse(t.is_stale())
+
+    def test_shift_dump(self):
+        t = FieldTable(self.path, MOLWEIGHTS)
+        ax = t['AX'].dacs[3]
+        t.shift(0.2)
+        t.dump(t['AX'].isotopes)
+        self.assertFalse(t.is_stale())
+
+        t2 = FieldTable(self.path, MOLWEIGHTS)
+        self.assertAlmostEqual(t2['AX'].dacs[3], ax + 0.2)
+
+#============= EOF =============================================
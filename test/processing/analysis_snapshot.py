@@ -0,0 +1,70 @@
+from unittest import TestCase
+import cPickle
+
+from numpy import linspace
+
+from pychron.core.helpers.binpack import pack_signal
+from pychron.processing.analyses.analysis_snapshot import MeasurementSnapshot, AnalysisSnapshot, \
+    reduce_snapshot
+from pychron.processing.isotope import Isotope
+
+__author__ = 'ross'
+
+
+class AnalysisSnapshotTestCase(TestCase):
+    def setUp(self):
+        self.xs = linspace(1, 100, 50)
+        self.ys = 10 - 0.01 * self.xs + 0.001 * (self.xs % 3)
+
+    def _reduce(self, fit):
+        m = MeasurementSnapshot('Ar40', 'signal', pack_signal(self.xs, self.ys), fit, 'SEM',
+                                dict(filter_outliers=False, iterations=0, std_devs=0))
+        snap = AnalysisSnapshot('abc', [m])
+        #snapshots are sent to worker processes so must survive a pickle round trip
+        snap = cPickle.loads(cPickle.dumps(snap, cPickle.HIGHEST_PROTOCOL))
+        return reduce_snapshot(snap).measurements[0]
+
+    def _isotope(self, m, fit):
+        iso = Isotope(name='Ar40', xs=m.xs, ys=m.ys)
+        iso.fit = fit
+        return iso
+
+    def test_linear(self):
+        m = self._reduce('linear')
+        iso = self._isotope(m, 'linear')
+        self.assertIsNone(m.blob)
+        self.assertAlmostEqual(m.value, iso.value)
+        self.assertAlmostEqual(m.error, iso.error)
+
+    def test_average(self):
+        m = self._reduce('average')
+        iso = self._isotope(m, 'average')
+        self.assertAlmostEqual(m.value, iso.value)
+        self.assertAlmostEqual(m.error, iso.error)
+
+    def test_bad_blob(self):
+        m = MeasurementSnapshot('Ar40', 'signal', 'abc', 'linear', 'SEM', {})
+        snap = reduce_snapshot(AnalysisSnapshot('abc', [m]))
+        self.assertIsNotNone(snap.measurements[0].unpack_error)
+        self.assertIsNone(snap.measurements[0].value)
+
+    def test_fit_result(self):
+        """
+            the worker's fit is used until the fit changes
+        """
+        m = self._reduce('linear')
+        iso = self._isotope(m, 'linear')
+        iso.set_fit_result(1.5, 0.1)
+        self.assertEqual(iso.value, 1.5)
+        self.assertEqual(iso.error, 0.1)
+
+        iso.fit = 'parabolic'
+        self.assertNotEqual(iso.value, 1.5)
+
+    def test_fit_result_data_changed(self):
+        m = self._reduce('linear')
+        iso = self._isotope(m, 'linear')
+        iso.set_fit_result(1.5, 0.1)
+
+        iso.ys = m.ys * 2
+        self.assertAlmostEqual(iso.value, 2 * m.value)
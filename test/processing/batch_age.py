@@ -0,0 +1,97 @@
+from pychron.core.ui import set_qt
+
+set_qt()
+from unittest import TestCase
+import random
+
+from uncertainties import ufloat
+
+from pychron.processing.arar_age import ArArAge
+from pychron.processing.batch_age import pack_analyses, calculate_batch_ages
+
+__author__ = 'ross'
+
+
+def make_analysis(seed):
+    random.seed(seed)
+    a = ArArAge()
+    for k, v in (('Ar40', 100), ('Ar39', 10), ('Ar38', 0.5), ('Ar37', 2), ('Ar36', 0.1)):
+        v *= random.uniform(0.5, 1.5)
+        a.set_isotope(k, (v, v * random.uniform(0.001, 0.01)))
+        a.set_blank(k, (v * 0.01, v * 0.001))
+
+    a.j = ufloat(random.uniform(1e-4, 1e-3), 1e-6)
+    a.interference_corrections = dict(k4039=ufloat(0.01, 0.001),
+                                      k3839=ufloat(0.013, 0.0001),
+                                      k3739=ufloat(0.0001, 0.00001),
+                                      ca3937=ufloat(0.0007, 0.00001),
+                                      ca3837=ufloat(0.00003, 0.000001),
+                                      ca3637=ufloat(0.00026, 0.00001),
+                                      cl3638=ufloat(250, 10))
+    a.production_ratios = dict(Ca_K=0.5, Cl_K=0.2)
+    a.timestamp = 100 * 24 * 3600.
+    a.chron_segments = [(1, 0.5, 100)]
+    return a
+
+
+class BatchAgeTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.expected = []
+        for i in range(10):
+            a = make_analysis(i)
+            a.calculate_age(force=True)
+            cls.expected.append(a)
+
+        cls.analyses = [make_analysis(i) for i in range(10)]
+        batch = pack_analyses(cls.analyses)
+        cls.result = calculate_batch_ages(batch, cls.analyses[0].arar_constants)
+        cls.result.apply(cls.analyses)
+
+    def _compare(self, attr, places=7):
+        for e, a in zip(self.expected, self.analyses):
+            ev, av = getattr(e, attr), getattr(a, attr)
+            self.assertAlmostEqual(ev / av, 1, places=places)
+
+    def test_F(self):
+        self._compare('F')
+
+    def test_F_err(self):
+        self._compare('F_err')
+
+    def test_F_err_wo_irrad(self):
+        self._compare('F_err_wo_irrad')
+
+    def test_age(self):
+        self._compare('age')
+
+    def test_age_err(self):
+        self._compare('age_err')
+
+    def test_age_err_wo_j(self):
+        self._compare('age_err_wo_j')
+
+    def test_age_err_wo_irrad(self):
+        self._compare('age_err_wo_irrad')
+
+    def test_age_err_wo_j_irrad(self):
+        self._compare('age_err_wo_j_irrad')
+
+    def test_kca(self):
+        for e, a in zip(self.expected, self.analyses):
+            self.assertAlmostEqual(e.kca.nominal_value / a.kca.nominal_value, 1)
+            self.assertAlmostEqual(e.kca.std_dev / a.kca.std_dev, 1)
+
+    def test_kcl(self):
+        for e, a in zip(self.expected, self.analyses):
+            self.assertAlmostEqual(e.kcl.nominal_value / a.kcl.nominal_value, 1)
+
+    def test_rad40_percent(self):
+        for e, a in zip(self.expected, self.analyses):
+            self.assertAlmostEqual(e.rad40_percent.nominal_value, a.rad40_percent.nominal_value)
+
+    def test_error_components(self):
+        for e, a in zip(self.expected, self.analyses):
+            for k in ('Ar40', 'Ar39', 'Ar36'):
+                self.assertAlmostEqual(e.isotopes[k].age_error_component,
+                                       a.isotopes[k].age_error_component, places=5)
@@ -0,0 +1,45 @@
+from unittest import TestCase
+import struct
+
+from pychron.core.helpers.binpack import unpack_signal, pack_signal, unpack_signals
+
+__author__ = 'ross'
+
+
+class BinPackTestCase(TestCase):
+    def setUp(self):
+        self.xs = [0.5, 1.5, 2.25, 100.125]
+        self.ys = [1e-3, 2e-3, -3e-3, 4.5]
+        self.blob = ''.join([struct.pack('>ff', x, y) for x, y in zip(self.xs, self.ys)])
+
+    def test_pack(self):
+        self.assertEqual(pack_signal(self.xs, self.ys), self.blob)
+
+    def test_unpack(self):
+        xs, ys = unpack_signal(self.blob)
+        for a, b in zip(xs, self.xs):
+            self.assertAlmostEqual(a, b)
+        for a, b in zip(ys, self.ys):
+            self.assertAlmostEqual(a, b, 6)
+
+    def test_reverse_unpack(self):
+        ys, xs = unpack_signal(self.blob, reverse=True)
+        self.assertAlmostEqual(xs[0], self.ys[0])
+        self.assertAlmostEqual(ys[-1], self.xs[-1])
+
+    def test_little_endian(self):
+        blob = pack_signal(self.xs, self.ys, endianness='<')
+        self.assertEqual(blob, ''.join([struct.pack('<ff', x, y) for x, y in zip(self.xs, self.ys)]))
+
+    def test_bad_blob(self):
+        self.assertRaises(ValueError, unpack_signal, self.blob[:-1])
+        self.assertRaises(ValueError, unpack_signal, '')
+
+    def test_batch(self):
+        batch = unpack_signals([self.blob, self.blob[:-2], self.blob[:16]])
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.errors, [1])
+        self.assertEqual(list(batch.offsets), [0, 4, 4, 6])
+        xs, ys = batch.get(2)
+        self.assertEqual(len(xs), 2)
+        self.assertAlmostEqual(xs[1], self.xs[1])
@@ -0,0 +1,42 @@
+from unittest import TestCase
+import numpy as np
+
+from pychron.processing.argon_calculations import find_plateaus, find_plateaus_naive
+
+__author__ = 'ross'
+
+
+class PlateauTestCase(TestCase):
+    def test_simple(self):
+        ages = [1, 10, 10.1, 10.2, 9.9, 10, 20]
+        errors = [0.1] * 7
+        signals = [1, 10, 10, 10, 10, 10, 1]
+        self.assertEqual(find_plateaus(ages, errors, signals, overlap_sigma=2), (1, 5))
+
+    def test_exclude(self):
+        ages = [1, 10, 10.1, 50, 9.9, 10, 20]
+        errors = [0.1] * 7
+        signals = [1, 10, 10, 10, 10, 10, 1]
+        self.assertEqual(find_plateaus(ages, errors, signals, overlap_sigma=2, exclude=[3]), (1, 5))
+
+    def test_percent_released(self):
+        ages = [10, 10, 10, 20, 30, 40]
+        errors = [0.1] * 6
+        signals = [1, 1, 1, 10, 10, 10]
+        self.assertIsNone(find_plateaus(ages, errors, signals))
+
+    def test_equivalence(self):
+        rs = np.random.RandomState(0)
+        for _ in xrange(500):
+            n = rs.randint(1, 16)
+            ages = rs.normal(10, rs.uniform(0.1, 2), n)
+            errors = rs.uniform(0.05, 1, n)
+            signals = rs.uniform(0, 1, n)
+            exclude = list(rs.choice(n, rs.randint(0, max(1, n // 3)), replace=False)) if n > 2 else []
+            osigma = rs.choice([1, 2])
+
+            expected = find_plateaus_naive(ages, errors, signals, osigma, exclude)
+            if expected is not None:
+                expected = tuple(expected)
+
+            self.assertEqual(find_plateaus(ages, errors, signals, osigma, exclude), expected)
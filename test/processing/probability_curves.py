@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+from numpy import linspace, zeros, pi, exp, random, allclose
+
+from pychron.core.stats.probability_curves import CumulativeProbability, asymptotic_limits
+
+__author__ = 'ross'
+
+
+def naive(ages, errors, xmi, xma, n=500):
+    bins = linspace(xmi, xma, n)
+    probs = zeros(n)
+    for ai, ei in zip(ages, errors):
+        if abs(ai) < 1e-10 or abs(ei) < 1e-10:
+            continue
+        es2 = 2 * ei ** 2
+        probs += (es2 * pi) ** -0.5 * exp(-(ai - bins) ** 2 / es2)
+    return bins, probs
+
+
+class ProbabilityCurveTestCase(TestCase):
+    def setUp(self):
+        random.seed(1)
+        self.ages = random.normal(28, 0.5, 200)
+        self.errors = random.uniform(0.01, 0.2, 200)
+        self.ages[3] = 0
+        self.xmi, self.xma = 25, 31
+
+    def test_cumulative(self):
+        cp = CumulativeProbability(self.ages, self.errors, self.xmi, self.xma)
+        bins, probs = naive(self.ages, self.errors, self.xmi, self.xma)
+        self.assertTrue(allclose(cp.bins, bins))
+        self.assertTrue(allclose(cp.probs, probs))
+
+    def test_excluding(self):
+        cp = CumulativeProbability(self.ages, self.errors, self.xmi, self.xma)
+        exclude = [0, 5, 17, 199]
+        fas = [a for i, a in enumerate(self.ages) if i not in exclude]
+        fes = [e for i, e in enumerate(self.errors) if i not in exclude]
+        _, probs = naive(fas, fes, self.xmi, self.xma)
+        self.assertTrue(allclose(cp.excluding(exclude), probs))
+
+    def test_asymptotic_limits(self):
+        x1, x2 = asymptotic_limits(self.ages, self.errors, 27.9, 28.1, asymptotic_width=0.5)
+        bins, probs = naive(self.ages, self.errors, x1, x2)
+        tt = 0.1 * probs.max()
+        aw = int(0.5 * len(bins) / (x2 - x1))
+        self.assertLess(probs[:aw].mean(), tt)
+        self.assertLess(probs[-aw:].mean(), tt)
+
+    def test_asymptotic_limits_invalid(self):
+        """
+            zero or nan ages and errors are not drawn so they don't widen the limits
+        """
+        ages = [0, 28, 28.2, float('nan'), 40]
+        errors = [0.1, 0.1, 0.1, 0.1, 0]
+        x1, x2 = asymptotic_limits(ages, errors, 27.9, 28.1, asymptotic_width=0.5)
+        ex1, ex2 = asymptotic_limits(ages[1:3], errors[1:3], 27.9, 28.1, asymptotic_width=0.5)
+        self.assertEqual((x1, x2), (ex1, ex2))
+
+    def test_asymptotic_limits_none_valid(self):
+        self.assertEqual(asymptotic_limits([0, 1], [0.1, 0], 1, 2), (1, 2))
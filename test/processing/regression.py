@@ -25,6 +25,7 @@ import numpy as np
 from pychron.core.regression.mean_regressor import WeightedMeanRegressor
 from pychron.core.regression.ols_regressor import PolynomialRegressor
 from pychron.core.regression.wls_regressor import WeightedPolynomialRegressor
+from pychron.core.regression.online_regressor import OnlineRegressor
 # from pychron.core.regression.york_regressor import YorkRegressor
 
 class WeightedMeanRegressionTest(TestCase):
@@ -211,4 +212,44 @@ class OLSRegressionTest(TestCase):
 #        self.assertEqual(y, self.Yprederr_5_parabolic)
 # #        self.assertEqual(yal, self.Yprederr_5_parabolic)
 
+
+class OnlineRegressionTest(TestCase):
+    def setUp(self):
+        np.random.seed(1)
+        self.xs = np.linspace(1, 400, 300)
+        self.ys = 3e-3 - 2e-6 * self.xs + 1e-9 * self.xs ** 2 + np.random.normal(0, 1e-6, 300)
+
+        self.reg = OnlineRegressor()
+        for x, y in zip(self.xs, self.ys):
+            self.reg.add(x, y)
+
+    def _compare(self, fit, degree):
+        ols = PolynomialRegressor(xs=self.xs, ys=self.ys, fit=fit)
+        ols.calculate()
+        self.assertAlmostEqual(self.reg.predict(0, degree) / ols.predict(0), 1, 9)
+        for et in ('SEM', 'SD'):
+            e = ols.predict_error(0, error_calc=et)
+            self.assertAlmostEqual(self.reg.predict_error(0, degree, et) / e, 1, 7)
+
+    def testLinear(self):
+        self._compare('linear', 1)
+
+    def testParabolic(self):
+        self._compare('parabolic', 2)
+
+    def testCubic(self):
+        self._compare('cubic', 3)
+
+    def testAverage(self):
+        self.assertAlmostEqual(self.reg.predict(0, 0), self.ys.mean(), 12)
+        sem = self.ys.std(ddof=1) / len(self.ys) ** 0.5
+        self.assertAlmostEqual(self.reg.predict_error(0, 0) / sem, 1, 9)
+
+        sd = self.ys.std(ddof=1)
+        self.assertAlmostEqual(self.reg.predict_error(0, 0, 'SD') / sd, 1, 9)
+
+    def testNotEnoughPoints(self):
+        reg = OnlineRegressor([1, 2], [1, 2])
+        self.assertIsNone(reg.predict(0, 2))
+
 #============= EOF =============================================
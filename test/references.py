@@ -0,0 +1,81 @@
+__author__ = 'ross'
+
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from pychron.processing.references import merge_windows, assign_references
+
+
+class Ref(object):
+    def __init__(self, uuid, ts):
+        self.uuid = uuid
+        self.analysis_timestamp = ts
+
+
+def per_unknown(windows, refs, limit):
+    """
+        the old one query per unknown lookup
+    """
+    uuids = []
+    found = []
+    for lo, hi in windows:
+        rs = [r for r in refs if lo <= r.analysis_timestamp <= hi and r.uuid not in uuids]
+        rs = sorted(rs, key=lambda r: r.analysis_timestamp, reverse=True)[:limit]
+        uuids.extend(r.uuid for r in rs)
+        found.append(rs)
+    return found
+
+
+class ReferencesTestCase(unittest.TestCase):
+    def setUp(self):
+        random.seed(1)
+        self.t0 = t0 = datetime(2014, 2, 1)
+        # unique timestamps. the order of ties is up to the database
+        ms = random.sample(range(14 * 24 * 60), 400)
+        self.refs = sorted([Ref(i, t0 + timedelta(minutes=m)) for i, m in enumerate(ms)],
+                           key=lambda r: r.analysis_timestamp)
+
+    def _windows(self, n, delta=12):
+        dt = timedelta(hours=delta)
+        ws = []
+        for i in range(n):
+            post = self.t0 + timedelta(minutes=random.randint(0, 14 * 24 * 60))
+            ws.append((post - dt, post + dt))
+        return ws
+
+    def test_merge_windows(self):
+        ws = merge_windows([(5, 8), (1, 3), (2, 4), (8, 9), (11, 12)])
+        self.assertEqual(ws, [(1, 4), (5, 9), (11, 12)])
+
+    def test_merge_windows_contained(self):
+        ws = merge_windows([(1, 10), (2, 3)])
+        self.assertEqual(ws, [(1, 10)])
+
+    def test_equivalent(self):
+        ws = self._windows(300)
+        a = assign_references(ws, self.refs, 10)
+        b = per_unknown(ws, self.refs, 10)
+        self.assertEqual([[r.uuid for r in fi] for fi in a],
+                         [[r.uuid for r in fi] for fi in b])
+
+    def test_small_limit(self):
+        ws = self._windows(50)
+        a = assign_references(ws, self.refs, 2)
+        b = per_unknown(ws, self.refs, 2)
+        self.assertEqual([[r.uuid for r in fi] for fi in a],
+                         [[r.uuid for r in fi] for fi in b])
+
+    def test_taken(self):
+        ws = self._windows(1)
+        a = assign_references(ws, self.refs, 10)[0]
+        b = assign_references(ws, self.refs, 10, taken=set([a[0].uuid]))[0]
+        self.assertFalse(a[0] in b)
+
+    def test_empty(self):
+        ws = self._windows(3)
+        self.assertEqual(assign_references(ws, [], 10), [[], [], []])
+
+
+if __name__ == '__main__':
+    unittest.main()
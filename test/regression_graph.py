@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+from numpy import linspace
+
+from pychron.graph.regression_graph import RegressionGraph
+
+__author__ = 'ross'
+
+
+class RegressionGraphRefitTestCase(TestCase):
+    """
+        RegressionGraph only refits a series when its data, fit, filtering or
+        selections changed since its last fit
+    """
+
+    def setUp(self):
+        g = RegressionGraph()
+        xs = linspace(0, 10, 20)
+        for i in range(2):
+            g.new_plot()
+            g.new_series(xs, 2 * xs + i, fit='linear', plotid=i)
+
+        g.refresh()
+        self.graph = g
+
+    def _scatter(self, plotid):
+        return self.graph.plots[plotid].plots['data0'][0]
+
+    def _refits(self, func):
+        g = self.graph
+        n = g.refit_count
+        func()
+        g.refresh()
+        return g.refit_count - n
+
+    def test_unchanged(self):
+        g = self.graph
+        g.refresh()
+        self.assertEqual(g.last_refit_count, 0)
+
+    def test_selection(self):
+        def select():
+            self._scatter(0).index.metadata['selections'] = [3]
+
+        self.assertEqual(self._refits(select), 1)
+        self.assertEqual(self._scatter(0).fit_key[-1], [3])
+
+        self.graph.refresh()
+        self.assertEqual(self.graph.last_refit_count, 0)
+
+    def test_set_fit(self):
+        g = self.graph
+        self.assertEqual(self._refits(lambda: g.set_fit('parabolic', plotid=1)), 1)
+        self.assertEqual(self._scatter(1).fit, 'parabolic')
+
+        g.refresh()
+        self.assertEqual(g.last_refit_count, 0)
+
+    def test_set_fit_unchanged(self):
+        g = self.graph
+        self.assertEqual(self._refits(lambda: g.set_fit('linear', plotid=1)), 0)
+
+    def test_set_filter_outliers(self):
+        g = self.graph
+        g.set_filter_outliers(True, plotid=0)
+        self.assertTrue(self._scatter(0).regression_dirty)
+
+        g.refresh()
+        self.assertEqual(g.last_refit_count, 1)
+        self.assertFalse(self._scatter(0).regression_dirty)
+
+    def test_data_changed(self):
+        scatter = self._scatter(1)
+        version = scatter.fit_key[0]
+
+        ys = scatter.value.get_data()
+        scatter.value.set_data(ys * 2)
+        self.assertNotEqual(self.graph._data_version(scatter), version)
+
+        self.graph.refresh()
+        self.assertEqual(self.graph.last_refit_count, 1)
@@ -0,0 +1,116 @@
+#===============================================================================
+# Copyright 2014 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#===============================================================================
+
+#============= enthought library imports =======================
+#============= standard library imports ========================
+import unittest
+
+from numpy import array, arange
+#============= local library imports  ==========================
+from pychron.core.helpers.sample_buffer import SampleBuffer
+from pychron.processing.isotope import Isotope
+
+
+class SampleBufferTest(unittest.TestCase):
+    def test_growth(self):
+        buf = SampleBuffer(size=4)
+        for i in range(10):
+            buf.append(i, i * 2)
+
+        self.assertEqual(len(buf), 10)
+        self.assertEqual(buf.capacity, 16)
+        self.assertEqual(list(buf.xs), range(10))
+        self.assertEqual(list(buf.ys), range(0, 20, 2))
+
+    def test_extend_growth(self):
+        buf = SampleBuffer(size=2, xs=[0, 1], ys=[0, 1])
+        buf.extend(arange(2, 7), arange(2, 7))
+
+        self.assertEqual(buf.capacity, 8)
+        self.assertEqual(list(buf.xs), range(7))
+
+    def test_views_not_modified(self):
+        buf = SampleBuffer(size=2)
+        buf.append(0, 0)
+        xs = buf.xs
+
+        # grows and writes past the view
+        buf.append(1, 1)
+        buf.append(2, 2)
+        self.assertEqual(list(xs), [0])
+
+        buf.clear()
+        buf.append(5, 5)
+        self.assertEqual(list(xs), [0])
+
+
+class IsotopeBufferTest(unittest.TestCase):
+    def setUp(self):
+        self.iso = Isotope(name='Ar40')
+
+    def test_flush_data(self):
+        iso = self.iso
+        iso.append_data(0, 1)
+        iso.append_data(1, 2, notify=False)
+        iso.append_data(2, 3, notify=False)
+
+        # buffered points are not visible until flushed
+        self.assertEqual(list(iso.xs), [0])
+
+        iso.flush_data()
+        self.assertEqual(list(iso.xs), [0, 1, 2])
+        self.assertEqual(list(iso.ys), [1, 2, 3])
+
+    def test_notify(self):
+        iso = self.iso
+        for i in range(3):
+            iso.append_data(i, i, notify=False)
+        iso.append_data(3, 3)
+
+        self.assertEqual(list(iso.xs), [0, 1, 2, 3])
+
+    def test_reseed(self):
+        iso = self.iso
+        iso.append_data(0, 1)
+        iso.append_data(1, 2)
+
+        # xs, ys replaced, e.g. by a truncation or reloading the data
+        iso.xs = array([10., 11.])
+        iso.ys = array([5., 6.])
+
+        iso.append_data(12, 7)
+        self.assertEqual(list(iso.xs), [10, 11, 12])
+        self.assertEqual(list(iso.ys), [5, 6, 7])
+
+    def test_reseed_pending(self):
+        """
+            points buffered before xs/ys are replaced are dropped with the old data
+        """
+        iso = self.iso
+        iso.append_data(0, 1)
+        iso.append_data(1, 2, notify=False)
+
+        iso.xs = array([10.])
+        iso.ys = array([5.])
+
+        iso.append_data(11, 6)
+        self.assertEqual(list(iso.xs), [10, 11])
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+#============= EOF =============================================
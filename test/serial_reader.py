@@ -0,0 +1,113 @@
+import os
+import sys
+import time
+from threading import Thread
+from unittest import TestCase, skipIf
+
+from pychron.hardware.core.communicators.serial_reader import split_frame, BackgroundReader, wait_readable
+
+__author__ = 'ross'
+
+
+class SplitFrameTestCase(TestCase):
+    def test_incomplete(self):
+        self.assertEqual(split_frame('1.23', ('\r',)), (None, '1.23'))
+
+    def test_frame(self):
+        self.assertEqual(split_frame('1.23\r4.5', ('\r',)), ('1.23\r', '4.5'))
+
+    def test_crlf(self):
+        self.assertEqual(split_frame('1.23\r\n4.5\r\n', ('\n', '\r')), ('1.23\r\n', '4.5\r\n'))
+
+    def test_leading_whitespace(self):
+        self.assertEqual(split_frame('\r\n', ('\n', '\r')), (None, '\r\n'))
+        self.assertEqual(split_frame('\n1\n', ('\n',)), ('\n1\n', ''))
+
+    def test_multichar_terminator(self):
+        self.assertEqual(split_frame('abc\x101def', ('\x101',)), ('abc\x101', 'def'))
+
+
+@skipIf(sys.platform == 'win32', 'requires a pseudo terminal')
+class BackgroundReaderTestCase(TestCase):
+    def setUp(self):
+        import serial
+
+        self.master, slave = os.openpty()
+        self.handle = serial.Serial(os.ttyname(slave), timeout=0)
+        os.close(slave)
+
+    def tearDown(self):
+        self.handle.close()
+        os.close(self.master)
+
+    def test_wait_readable(self):
+        self.assertFalse(wait_readable(self.handle, 0.01))
+        os.write(self.master, '1\n')
+        self.assertTrue(wait_readable(self.handle, 1))
+
+    def test_reader(self):
+        reader = BackgroundReader(self.handle)
+        reader.start()
+        try:
+            os.write(self.master, '1.23\n')
+            self.assertTrue(reader.wait(1))
+            r = ''
+            while not r.endswith('\n'):
+                r += reader.read()
+                reader.wait(0.1)
+            self.assertEqual(r, '1.23\n')
+        finally:
+            reader.stop()
+
+
+@skipIf(sys.platform == 'win32', 'requires a pseudo terminal')
+class SerialCommunicatorTestCase(TestCase):
+    """
+        a fake device on the master side of a pty answers each command
+    """
+
+    def setUp(self):
+        import serial
+        from pychron.hardware.core.communicators.serial_communicator import SerialCommunicator
+
+        self.master, slave = os.openpty()
+        self.comm = SerialCommunicator()
+        self.comm.handle = serial.Serial(os.ttyname(slave), timeout=0)
+        os.close(slave)
+
+    def tearDown(self):
+        self.comm.close()
+        os.close(self.master)
+
+    def _reply(self, *parts):
+        def func():
+            os.read(self.master, 1024)
+            for p in parts:
+                os.write(self.master, p)
+                time.sleep(0.005)
+
+        t = Thread(target=func)
+        t.start()
+        return t
+
+    def test_multiline(self):
+        t = self._reply('OK\r\n', 'VAL\r\n')
+        r = self.comm.ask('X\r', verbose=False)
+        t.join()
+        self.assertEqual(r, 'OK\r\nVAL')
+
+    def test_background_reader(self):
+        self.comm._start_reader()
+        t = self._reply('OK\r\n', 'VAL\r\n')
+        r = self.comm.ask('X\r', verbose=False)
+        t.join()
+        self.assertEqual(r, 'OK\r\nVAL')
+
+    def test_stale_input(self):
+        os.write(self.master, 'STALE\r\n')
+        time.sleep(0.01)
+
+        t = self._reply('1.23\r\n')
+        r = self.comm.ask('X\r', verbose=False)
+        t.join()
+        self.assertEqual(r, '1.23')
@@ -0,0 +1,53 @@
+import time
+from threading import Lock
+from unittest import TestCase
+
+from pychron.core.helpers.thread_pool import first_accepted
+
+__author__ = 'ross'
+
+
+class FirstAcceptedTestCase(TestCase):
+    def test_order(self):
+        # later items finish first but results are checked in order
+        func = lambda i: time.sleep(0.05 - i * 0.005) or i
+        checked = []
+
+        def accept(r):
+            checked.append(r)
+            return r >= 3
+
+        r = first_accepted(func, [(i,) for i in range(10)], accept, nthreads=4)
+        self.assertEqual(r, 3)
+        self.assertEqual(checked, [0, 1, 2, 3])
+
+    def test_none_accepted(self):
+        r = first_accepted(lambda i: i, [(i,) for i in range(5)], lambda r: False, nthreads=3)
+        self.assertIsNone(r)
+
+    def test_sequential(self):
+        r = first_accepted(lambda i: i * 2, [(i,) for i in range(5)], lambda r: r == 4, nthreads=1)
+        self.assertEqual(r, 4)
+
+    def test_stops_early(self):
+        lock = Lock()
+        evaluated = []
+
+        def func(i):
+            with lock:
+                evaluated.append(i)
+            time.sleep(0.01)
+            return i
+
+        first_accepted(func, [(i,) for i in range(50)], lambda r: r == 0, nthreads=4)
+        time.sleep(0.05)
+        self.assertTrue(len(evaluated) <= 5)
+
+    def test_exception(self):
+        def func(i):
+            if i == 1:
+                raise ValueError(i)
+            return i
+
+        self.assertRaises(ValueError, first_accepted, func, [(i,) for i in range(4)],
+                          lambda r: False, nthreads=2)